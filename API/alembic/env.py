@@ -20,9 +20,13 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from app.core.config import settings
 from app.db.database import Base
 from app.models import *  # Importar todos los modelos
 
+# La URL de la base de datos viene de Settings (DATABASE_URL), igual que en la API
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -0,0 +1,39 @@
+"""add_citas_keyset_index
+
+Revision ID: 3f1c2a7d9e10
+Revises: 6ae95c36c6ab
+Create Date: 2026-10-17 10:12:41.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a7d9e10'
+down_revision: Union[str, None] = '6ae95c36c6ab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índice compuesto para la paginación por cursor de GET /citas/
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    existing_indexes = [index['name'] for index in inspector.get_indexes('citas')]
+
+    if 'ix_citas_fecha_solicitud_id_cita' not in existing_indexes:
+        op.create_index(
+            'ix_citas_fecha_solicitud_id_cita',
+            'citas',
+            ['fecha_solicitud', 'id_cita'],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_citas_fecha_solicitud_id_cita', table_name='citas')
@@ -0,0 +1,42 @@
+"""add_citas_calendario_indexes
+
+Revision ID: 5d9a7c3e1f42
+Revises: c27d5e9a4b18
+Create Date: 2026-10-17 13:05:12.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9a7c3e1f42'
+down_revision: Union[str, None] = 'c27d5e9a4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índices para los rangos de fecha_confirmada de GET /citas/calendario
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    existing_indexes = [index['name'] for index in inspector.get_indexes('citas')]
+
+    if 'ix_citas_fecha_confirmada' not in existing_indexes:
+        op.create_index('ix_citas_fecha_confirmada', 'citas', ['fecha_confirmada'], unique=False)
+    if 'ix_citas_personal_fecha_confirmada' not in existing_indexes:
+        op.create_index(
+            'ix_citas_personal_fecha_confirmada',
+            'citas',
+            ['id_personal', 'fecha_confirmada'],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_citas_personal_fecha_confirmada', table_name='citas')
+    op.drop_index('ix_citas_fecha_confirmada', table_name='citas')
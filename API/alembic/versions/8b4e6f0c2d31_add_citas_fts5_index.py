@@ -0,0 +1,32 @@
+"""add_citas_fts5_index
+
+Revision ID: 8b4e6f0c2d31
+Revises: 3f1c2a7d9e10
+Create Date: 2026-10-17 11:02:15.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.fts import crear_fts_citas, eliminar_fts_citas
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6f0c2d31'
+down_revision: Union[str, None] = '3f1c2a7d9e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tabla virtual FTS5 + triggers de sincronización; se reconstruye con las citas existentes.
+    # Si SQLite no tiene FTS5 la búsqueda sigue funcionando con LIKE.
+    crear_fts_citas(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    eliminar_fts_citas(connection)
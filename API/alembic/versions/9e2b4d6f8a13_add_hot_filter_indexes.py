@@ -0,0 +1,63 @@
+"""add_hot_filter_indexes
+
+Revision ID: 9e2b4d6f8a13
+Revises: 5d9a7c3e1f42
+Create Date: 2026-10-17 14:02:37.219504
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b4d6f8a13'
+down_revision: Union[str, None] = '5d9a7c3e1f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas) — índices de las columnas de filtro más usadas por las rutas
+INDICES = [
+    ('ix_citas_alumno_fecha_solicitud', 'citas', ['id_alumno', 'fecha_solicitud']),
+    ('ix_citas_estado_fecha_solicitud', 'citas', ['estado', 'fecha_solicitud']),
+    ('ix_personas_rol', 'personas', ['rol']),
+    ('ix_respuestas_cuestionario_cuestionario_usuario', 'respuestas_cuestionario', ['cuestionario_id', 'usuario_id']),
+    ('ix_respuestas_cuestionario_usuario', 'respuestas_cuestionario', ['usuario_id']),
+    ('ix_notificaciones_registro_destinatario_procesada', 'notificaciones_registro', ['usuario_destinatario_id', 'procesada']),
+    ('ix_notificaciones_registro_solicitante', 'notificaciones_registro', ['usuario_solicitante_id']),
+    ('ix_preguntas_cuestionario_orden', 'preguntas', ['cuestionario_id', 'orden']),
+    ('ix_respuestas_pregunta_respuesta_cuestionario', 'respuestas_pregunta', ['respuesta_cuestionario_id']),
+    ('ix_asignaciones_cuestionario_tipo_usuario', 'asignaciones_cuestionario', ['tipo_usuario', 'cuestionario_id']),
+    ('ix_asignaciones_cuestionario_cuestionario', 'asignaciones_cuestionario', ['cuestionario_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    tablas = set(inspector.get_table_names())
+
+    for nombre, tabla, columnas in INDICES:
+        if tabla not in tablas:
+            continue
+        existing_indexes = [index['name'] for index in inspector.get_indexes(tabla)]
+        if nombre not in existing_indexes:
+            op.create_index(nombre, tabla, columnas, unique=False)
+
+    # Actualizar estadísticas para que el planificador elija los índices nuevos
+    if connection.dialect.name == 'sqlite':
+        op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    tablas = set(inspector.get_table_names())
+
+    for nombre, tabla, _ in reversed(INDICES):
+        if tabla in tablas and nombre in [index['name'] for index in inspector.get_indexes(tabla)]:
+            op.drop_index(nombre, table_name=tabla)
@@ -0,0 +1,55 @@
+"""add_personas_directorio_indexes
+
+Revision ID: a4c8e2f6b190
+Revises: 9e2b4d6f8a13
+Create Date: 2026-10-17 16:41:08.532117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e2f6b190'
+down_revision: Union[str, None] = '9e2b4d6f8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas) — filtros del directorio de personas (GET /personas/)
+INDICES = [
+    ('ix_personas_semestre', 'personas', ['semestre']),
+    ('ix_personas_cohorte', 'personas', ['cohorte_ano', 'cohorte_periodo']),
+    ('ix_persona_programa_programa', 'persona_programa', ['programa_id', 'persona_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    tablas = set(inspector.get_table_names())
+
+    for nombre, tabla, columnas in INDICES:
+        if tabla not in tablas:
+            continue
+        existing_indexes = [index['name'] for index in inspector.get_indexes(tabla)]
+        if nombre not in existing_indexes:
+            op.create_index(nombre, tabla, columnas, unique=False)
+
+    # Actualizar estadísticas para que el planificador elija los índices nuevos
+    if connection.dialect.name == 'sqlite':
+        op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    tablas = set(inspector.get_table_names())
+
+    for nombre, tabla, _ in reversed(INDICES):
+        if tabla in tablas and nombre in [index['name'] for index in inspector.get_indexes(tabla)]:
+            op.drop_index(nombre, table_name=tabla)
@@ -0,0 +1,48 @@
+"""add_importaciones_personas
+
+Revision ID: a9c3e5f7b182
+Revises: f3a8d2c6b715
+Create Date: 2026-10-17 22:04:31.619827
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e5f7b182'
+down_revision: Union[str, None] = 'f3a8d2c6b715'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Estado de las importaciones masivas, compartido por todos los workers
+    if 'importaciones_personas' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'importaciones_personas',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('estado', sa.String(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('procesadas', sa.Integer(), nullable=False),
+        sa.Column('exitosas', sa.Integer(), nullable=False),
+        sa.Column('fallidas', sa.Integer(), nullable=False),
+        sa.Column('errores', sa.JSON(), nullable=False),
+        sa.Column('creada_en', sa.DateTime(), nullable=False),
+        sa.Column('terminada_en', sa.DateTime(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_importaciones_personas_terminada_en', 'importaciones_personas', ['terminada_en'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_importaciones_personas_terminada_en', table_name='importaciones_personas')
+    op.drop_table('importaciones_personas')
@@ -0,0 +1,70 @@
+"""limit_fts_update_triggers
+
+Revision ID: b5d1f8e3c274
+Revises: a9c3e5f7b182
+Create Date: 2026-10-17 23:41:08.275310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.db.fts import (
+    CITAS_FTS_COLUMNS, CITAS_FTS_DDL, CITAS_FTS_TABLE,
+    PERSONAS_FTS_COLUMNS, PERSONAS_FTS_DDL, PERSONAS_FTS_TABLE,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f8e3c274'
+down_revision: Union[str, None] = 'a9c3e5f7b182'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabla FTS, tabla base, rowid, columnas, DDL actual)
+_INDICES = (
+    (CITAS_FTS_TABLE, "citas", "id_cita", CITAS_FTS_COLUMNS, CITAS_FTS_DDL),
+    (PERSONAS_FTS_TABLE, "personas", "id", PERSONAS_FTS_COLUMNS, PERSONAS_FTS_DDL),
+)
+
+
+def _existe(connection, nombre: str) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :nombre"), {"nombre": nombre}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # El trigger de UPDATE solo reindexa cuando cambia una columna indexada
+    # (antes se disparaba con cualquier cambio de estado, fecha o contraseña)
+    connection = op.get_bind()
+    if connection.dialect.name != "sqlite":
+        return
+    for tabla_fts, _, _, _, ddl in _INDICES:
+        if _existe(connection, tabla_fts):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {tabla_fts}_au"))
+            connection.execute(text(ddl[-1]))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    if connection.dialect.name != "sqlite":
+        return
+    for tabla_fts, tabla, rowid, columnas, _ in _INDICES:
+        if not _existe(connection, tabla_fts):
+            continue
+        lista = ", ".join(columnas)
+        nuevos = ", ".join(f"new.{c}" for c in columnas)
+        viejos = ", ".join(f"old.{c}" for c in columnas)
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {tabla_fts}_au"))
+        connection.execute(text(f"""
+    CREATE TRIGGER {tabla_fts}_au AFTER UPDATE ON {tabla} BEGIN
+        INSERT INTO {tabla_fts}({tabla_fts}, rowid, {lista})
+        VALUES ('delete', old.{rowid}, {viejos});
+        INSERT INTO {tabla_fts}(rowid, {lista})
+        VALUES (new.{rowid}, {nuevos});
+    END
+    """))
@@ -0,0 +1,43 @@
+"""add_disponibilidad_personal
+
+Revision ID: c27d5e9a4b18
+Revises: 8b4e6f0c2d31
+Create Date: 2026-10-17 12:20:48.377650
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d5e9a4b18'
+down_revision: Union[str, None] = '8b4e6f0c2d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('disponibilidad_personal',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('id_personal', sa.Integer(), nullable=False),
+    sa.Column('dia_semana', sa.Integer(), nullable=False),
+    sa.Column('hora_inicio', sa.Time(), nullable=False),
+    sa.Column('hora_fin', sa.Time(), nullable=False),
+    sa.Column('ubicacion', sa.String(length=200), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['id_personal'], ['personas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_disponibilidad_personal_id'), 'disponibilidad_personal', ['id'], unique=False)
+    op.create_index('ix_disponibilidad_personal_personal_dia', 'disponibilidad_personal', ['id_personal', 'dia_semana'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_disponibilidad_personal_personal_dia', table_name='disponibilidad_personal')
+    op.drop_index(op.f('ix_disponibilidad_personal_id'), table_name='disponibilidad_personal')
+    op.drop_table('disponibilidad_personal')
@@ -0,0 +1,37 @@
+"""add_parametros_sistema
+
+Revision ID: c8e2a4f6d319
+Revises: b5d1f8e3c274
+Create Date: 2026-10-18 00:12:47.530961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2a4f6d319'
+down_revision: Union[str, None] = 'b5d1f8e3c274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Parámetros calculados una vez y compartidos por los workers (costo de bcrypt)
+    if 'parametros_sistema' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'parametros_sistema',
+        sa.Column('clave', sa.String(length=64), nullable=False),
+        sa.Column('valor', sa.String(), nullable=False),
+        sa.Column('actualizado_en', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('clave')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('parametros_sistema')
@@ -0,0 +1,56 @@
+"""add_personas_busqueda_indexes
+
+Revision ID: d7f3a9c5e2b4
+Revises: a4c8e2f6b190
+Create Date: 2026-10-17 18:12:44.086215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.fts import crear_fts_personas, eliminar_fts_personas, identificador_normalizado
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3a9c5e2b4'
+down_revision: Union[str, None] = 'a4c8e2f6b190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, columna) — índices de expresión para buscar celular y matrícula por prefijo
+INDICES = [
+    ('ix_personas_celular_normalizado', 'celular'),
+    ('ix_personas_matricula_normalizada', 'matricula'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    personas = sa.table('personas', sa.column('celular'), sa.column('matricula'))
+
+    # El inspector no refleja índices de expresión: IF NOT EXISTS los hace idempotentes
+    for nombre, columna in INDICES:
+        op.create_index(
+            nombre, 'personas', [identificador_normalizado(personas.c[columna])],
+            unique=False, if_not_exists=True
+        )
+
+    # Tabla virtual FTS5 + triggers de sincronización; se reconstruye con las personas existentes.
+    # Si SQLite no tiene FTS5 la búsqueda sigue funcionando con LIKE.
+    crear_fts_personas(connection)
+
+    if connection.dialect.name == 'sqlite':
+        op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    eliminar_fts_personas(connection)
+
+    for nombre, _ in reversed(INDICES):
+        op.drop_index(nombre, table_name='personas', if_exists=True)
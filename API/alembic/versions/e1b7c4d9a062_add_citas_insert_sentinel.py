@@ -0,0 +1,31 @@
+"""add_citas_insert_sentinel
+
+Revision ID: e1b7c4d9a062
+Revises: d7f3a9c5e2b4
+Create Date: 2026-10-17 20:41:09.512734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7c4d9a062'
+down_revision: Union[str, None] = 'd7f3a9c5e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Columna centinela de insertmanyvalues (ver Cita._sentinel)
+    columnas = [c['name'] for c in sa.inspect(op.get_bind()).get_columns('citas')]
+    if '_sentinel' not in columnas:
+        op.add_column('citas', sa.Column('_sentinel', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('citas', '_sentinel')
@@ -0,0 +1,31 @@
+"""add_personas_insert_sentinel
+
+Revision ID: f3a8d2c6b715
+Revises: e1b7c4d9a062
+Create Date: 2026-10-17 21:26:47.308152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d2c6b715'
+down_revision: Union[str, None] = 'e1b7c4d9a062'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Columna centinela de insertmanyvalues (ver Persona._sentinel)
+    columnas = [c['name'] for c in sa.inspect(op.get_bind()).get_columns('personas')]
+    if '_sentinel' not in columnas:
+        op.add_column('personas', sa.Column('_sentinel', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('personas', '_sentinel')
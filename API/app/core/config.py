@@ -1,5 +1,5 @@
 import secrets
-from typing import List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any
 
 from pydantic import AnyHttpUrl, field_validator, ConfigDict
 from pydantic_settings import BaseSettings
@@ -24,6 +24,103 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "SSP API"
 
+    # Base de datos: URL de SQLAlchemy y tamaño del pool de conexiones
+    DATABASE_URL: str = "sqlite:///./ssp.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = False
+    # Réplica de solo lectura para get_read_db; sin ella se usa DATABASE_URL
+    # con un pool propio de conexiones de solo lectura
+    DATABASE_READ_URL: Optional[str] = None
+
+    # Arranque (lifespan): verificar la revisión de Alembic, crear el esquema
+    # si la base está vacía, detener el arranque si la revisión no es la
+    # última (MIGRACIONES_ESTRICTAS=false solo lo advierte en el log) y
+    # precargar cachés antes de aceptar peticiones
+    VERIFICAR_ESQUEMA_AL_INICIAR: bool = True
+    CREAR_ESQUEMA_SI_VACIA: bool = True
+    MIGRACIONES_ESTRICTAS: bool = True
+    CALENTAR_CACHES_AL_INICIAR: bool = True
+
+    # PRAGMA aplicados a cada conexión SQLite (ver app/db/database.py)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
+    # Costo de bcrypt (cada punto duplica el tiempo de verificación). Con
+    # BCRYPT_OBJETIVO_MS y sin BCRYPT_ROUNDS en el entorno, el primer worker
+    # que arranca lo calibra para tardar a lo más ese tiempo (sin bajar del
+    # costo de los hashes guardados) y lo guarda en parametros_sistema para
+    # los demás; los hashes con otro costo se recalculan en el siguiente login
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_ROUNDS_MIN: int = 10
+    BCRYPT_ROUNDS_MAX: int = 16
+    BCRYPT_OBJETIVO_MS: Optional[float] = None
+
+    # Hash de contraseñas (ver app/core/hashing.py): executor dedicado
+    # ("proceso" o "hilo"), workers, operaciones simultáneas en el executor
+    # y segundos de espera por un lugar antes de responder 503. HASH_NICE
+    # baja la prioridad de los workers en procesos frente a las peticiones
+    HASH_EXECUTOR: str = "proceso"
+    HASH_WORKERS: int = 2
+    HASH_NICE: int = 10
+    HASH_MAX_CONCURRENCIA: int = 4
+    HASH_TIMEOUT_COLA: float = 5.0
+
+    # Importación masiva de personas (POST /personas/bulk-import): filas por
+    # INSERT y commit, workers para hashear contraseñas (None: uno por
+    # núcleo), filas máximas por importación y segundos que se conserva el
+    # estado de una importación terminada
+    IMPORTACION_LOTE: int = 500
+    IMPORTACION_HASH_WORKERS: Optional[int] = None
+    IMPORTACION_MAX_FILAS: int = 20000
+    IMPORTACION_ESTADO_TTL: int = 3600
+
+    # Control de admisión por clase de ruta (app/middleware/admision.py):
+    # peticiones en curso y en cola por clase, segundos máximos en la cola y
+    # Retry-After de las respuestas 503. La suma de los límites no debería
+    # superar los 40 hilos del threadpool de AnyIO
+    ADMISION_HABILITADA: bool = True
+    ADMISION_LIMITES: Dict[str, int] = {"criticas": 8, "pesadas": 2, "general": 30}
+    ADMISION_COLAS: Dict[str, int] = {"criticas": 64, "pesadas": 4, "general": 100}
+    ADMISION_ESPERA_MAXIMA: float = 10.0
+    ADMISION_RETRY_AFTER: int = 2
+
+    # Rate limiting (app/middleware/rate_limit_backends.py): "memoria" (por
+    # worker), "sqlite" (compartido entre los workers de un equipo) o "redis"
+    RATE_LIMIT_BACKEND: str = "memoria"
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limit.db"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Caché de principales autenticados (get_current_user): segundos que un
+    # worker puede tardar en ver cambios hechos por otro y tamaño máximo
+    PRINCIPALES_CACHE_TTL: int = 30
+    PRINCIPALES_CACHE_MAX: int = 1024
+
+    # Segundos que se reutiliza el resultado de /citas/estadisticas
+    ESTADISTICAS_CITAS_CACHE_TTL: int = 15
+
+    # Agenda de citas: duración de cada cita y segundos antes de reconstruir
+    # el índice de intervalos en memoria (lo sincroniza entre workers)
+    DURACION_CITA_MINUTOS: int = 60
+    AGENDA_INDICE_TTL: int = 300
+
+    # Validación de correo/matrícula disponibles (formularios de registro):
+    # segundos antes de reconstruir los filtros de Bloom desde la base de
+    # datos (recoge altas de otros workers) y su tasa de falsos positivos
+    # (cada positivo cuesta una consulta puntual)
+    DISPONIBILIDAD_INDICE_TTL: int = 300
+    DISPONIBILIDAD_FALSOS_POSITIVOS: float = 0.01
+
+    # Server-Sent Events de /citas/stream: segundos entre mensajes keep-alive
+    # y eventos pendientes por conexión antes de descartar los más antiguos
+    SSE_KEEPALIVE_SEGUNDOS: float = 15
+    SSE_MAX_EVENTOS_PENDIENTES: int = 100
+
     model_config = ConfigDict(case_sensitive=True)
 
 
@@ -0,0 +1,162 @@
+"""
+Hash y verificación de contraseñas fuera del threadpool de peticiones.
+
+bcrypt consume ~100-300 ms de CPU por operación. Ejecutado dentro de un
+handler síncrono ocupa un hilo del threadpool compartido y, con ráfagas de
+logins (cambio de clase), deja sin hilos al resto de los endpoints.
+
+Las operaciones se envían a un executor dedicado (HASH_EXECUTOR: "proceso"
+usa un ProcessPoolExecutor y escapa del GIL; "hilo" un ThreadPoolExecutor)
+con HASH_WORKERS workers. A lo más HASH_MAX_CONCURRENCIA operaciones están
+en el executor a la vez; las demás esperan un lugar hasta HASH_TIMEOUT_COLA
+segundos y después fallan con HashingSaturado (503 con Retry-After, ver
+app/main.py) en lugar de acumular una cola sin límite.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Callable, Optional, TypeVar
+
+import anyio.from_thread
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class HashingSaturado(Exception):
+    """No hubo lugar en el executor de hash dentro de HASH_TIMEOUT_COLA."""
+
+
+_executor: Optional[Executor] = None
+_executor_tipo: Optional[str] = None
+_lock = threading.Lock()
+# Un semáforo por event loop (asyncio.Semaphore queda ligado a su loop)
+_semaforos: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _ping() -> bool:
+    return True
+
+
+def _iniciar_worker(prioridad: int) -> None:
+    # Con pocos núcleos los workers compiten por CPU con el proceso que
+    # atiende peticiones: se les baja la prioridad (nice)
+    if prioridad and hasattr(os, "nice"):
+        os.nice(prioridad)
+
+
+def _obtener_executor() -> Executor:
+    global _executor, _executor_tipo
+    with _lock:
+        if _executor is None or _executor_tipo != settings.HASH_EXECUTOR:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            if settings.HASH_EXECUTOR == "proceso":
+                # spawn: hacer fork de un proceso con hilos (uvicorn) no es seguro
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.HASH_WORKERS,
+                    mp_context=get_context("spawn"),
+                    initializer=_iniciar_worker,
+                    initargs=(settings.HASH_NICE,),
+                )
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.HASH_WORKERS, thread_name_prefix="hash"
+                )
+            _executor_tipo = settings.HASH_EXECUTOR
+        return _executor
+
+
+def _descartar_executor(executor: Executor) -> None:
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _semaforo() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaforo = _semaforos.get(loop)
+    if semaforo is None:
+        semaforo = _semaforos[loop] = asyncio.Semaphore(settings.HASH_MAX_CONCURRENCIA)
+    return semaforo
+
+
+async def _ejecutar(funcion: Callable[..., T], *args) -> T:
+    semaforo = _semaforo()
+    try:
+        await asyncio.wait_for(semaforo.acquire(), timeout=settings.HASH_TIMEOUT_COLA)
+    except asyncio.TimeoutError:
+        raise HashingSaturado() from None
+    try:
+        loop = asyncio.get_running_loop()
+        executor = _obtener_executor()
+        try:
+            return await loop.run_in_executor(executor, funcion, *args)
+        except BrokenProcessPool:
+            # Un worker terminó de forma abrupta: se reemplaza el pool una vez
+            _descartar_executor(executor)
+            return await loop.run_in_executor(_obtener_executor(), funcion, *args)
+    finally:
+        semaforo.release()
+
+
+async def verificar_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password en el executor de hash."""
+    return await _ejecutar(verify_password, plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    """get_password_hash en el executor de hash, con el costo actual (BCRYPT_ROUNDS)."""
+    return await _ejecutar(get_password_hash, password, settings.BCRYPT_ROUNDS)
+
+
+def hash_password_sync(password: str) -> str:
+    """
+    hash_password para handlers síncronos (def).
+
+    El hilo del threadpool espera el resultado sin ocupar el GIL y la
+    operación respeta el mismo límite de concurrencia que las rutas async.
+    Solo puede llamarse desde un hilo de trabajo de AnyIO.
+    """
+    return anyio.from_thread.run(hash_password, password)
+
+
+def crear_executor_lote(workers: Optional[int] = None) -> Executor:
+    """
+    Executor propio para hashear muchas contraseñas (importaciones masivas).
+
+    Es independiente del executor de logins para que una importación no
+    ocupe sus lugares; usa el mismo tipo (HASH_EXECUTOR) y prioridad
+    (HASH_NICE). Quien lo crea debe cerrarlo con shutdown().
+    """
+    workers = workers or os.cpu_count() or 1
+    if settings.HASH_EXECUTOR == "proceso":
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_iniciar_worker,
+            initargs=(settings.HASH_NICE,),
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash-lote")
+
+
+async def iniciar_executor() -> None:
+    """Crear el executor y sus workers (calentamiento del arranque)."""
+    await asyncio.get_running_loop().run_in_executor(_obtener_executor(), _ping)
+
+
+def cerrar_executor() -> None:
+    """Detener los workers del executor de hash (apagado de la API)."""
+    global _executor, _executor_tipo
+    with _lock:
+        executor, _executor, _executor_tipo = _executor, None, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
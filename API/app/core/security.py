@@ -1,5 +1,7 @@
+import statistics
+import time
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 from jose import jwt
 import bcrypt
@@ -44,7 +46,56 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_password_bytes)
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    # rounds explícito: los workers en procesos no ven cambios en settings
+    # hechos en el proceso principal (calibración al arrancar, pruebas)
     password_bytes = _normalize_password(password)
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS))
     return hashed.decode("utf-8")
+
+
+def bcrypt_rounds(hashed_password: str) -> Optional[int]:
+    """Costo de un hash bcrypt ($2b$<costo>$...), o None si no es bcrypt."""
+    partes = hashed_password.split("$") if isinstance(hashed_password, str) else []
+    if len(partes) != 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True si el hash no usa el costo configurado (BCRYPT_ROUNDS)."""
+    return bcrypt_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+def medir_verificacion_ms(rounds: int, repeticiones: int = 3) -> float:
+    """Mediana en ms de verificar una contraseña con costo `rounds` en este equipo."""
+    hashed = bcrypt.hashpw(b"calibracion", bcrypt.gensalt(rounds=rounds))
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        bcrypt.checkpw(b"calibracion", hashed)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def calibrar_bcrypt_rounds(
+    objetivo_ms: float,
+    minimo: Optional[int] = None,
+    maximo: Optional[int] = None,
+    repeticiones: int = 3,
+) -> int:
+    """
+    Mayor costo de bcrypt cuya verificación tarda a lo más `objetivo_ms` en
+    este equipo, acotado a [BCRYPT_ROUNDS_MIN, BCRYPT_ROUNDS_MAX].
+
+    Cada punto de costo duplica el tiempo, así que se mide desde el mínimo
+    y se detiene en el primer costo que excede el objetivo.
+    """
+    minimo = minimo or settings.BCRYPT_ROUNDS_MIN
+    maximo = maximo or settings.BCRYPT_ROUNDS_MAX
+    elegido = minimo
+    for rounds in range(minimo, maximo + 1):
+        if medir_verificacion_ms(rounds, repeticiones) > objetivo_ms:
+            break
+        elegido = rounds
+    return elegido
@@ -1,14 +1,158 @@
-from sqlalchemy import create_engine
+from typing import Any
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./ssp.db"
+from app.core.config import settings
+
+# Compatibilidad: antes la URL estaba fija en este módulo
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+
+def _es_sqlite_en_memoria(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def _configurar_pragmas_sqlite(engine: Engine, en_memoria: bool) -> None:
+    """
+    Aplicar los PRAGMA de SQLite en cada conexión nueva.
+
+    WAL permite lectores concurrentes con un escritor y, junto con
+    busy_timeout, evita los errores "database is locked" cuando varios
+    workers escriben a la vez. synchronous=NORMAL es seguro con WAL (solo se
+    pueden perder las últimas transacciones ante un corte de energía).
+    """
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not en_memoria:
+                cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            # Valor negativo: tamaño en KiB en lugar de número de páginas
+            cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(url: str = None, **kwargs: Any) -> Engine:
+    """
+    Crear el motor de base de datos a partir de la configuración.
+
+    Para SQLite aplica los PRAGMA de producción en cada conexión (ver
+    _configurar_pragmas_sqlite). El tamaño del pool se toma de Settings
+    (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT) salvo en bases en
+    memoria, que usan el pool por defecto de SQLAlchemy. Los argumentos
+    adicionales se pasan a create_engine.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+    opciones: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    es_sqlite = url.get_backend_name() == "sqlite"
+    en_memoria = es_sqlite and _es_sqlite_en_memoria(url)
+
+    if es_sqlite:
+        opciones["connect_args"] = {
+            "check_same_thread": False,
+            # Espera del driver (segundos) antes de reportar la base bloqueada
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    if not en_memoria:
+        opciones.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    opciones.update(kwargs)
+
+    engine = create_engine(url, **opciones)
+    if es_sqlite:
+        _configurar_pragmas_sqlite(engine, en_memoria)
+    return engine
+
+
+def _solo_lectura_sqlite(engine: Engine) -> None:
+    """Marcar cada conexión SQLite como de solo lectura (PRAGMA query_only)."""
+    @event.listens_for(engine, "connect")
+    def _query_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def create_read_db_engine(url: str = None, **kwargs: Any) -> Engine:
+    """
+    Crear el motor de solo lectura usado por get_read_db.
+
+    Se conecta a DATABASE_READ_URL (réplica) si está configurada y, si no,
+    a DATABASE_URL con un pool propio, de modo que las lecturas no compiten
+    por conexiones con las escrituras. En SQLite cada conexión lleva
+    PRAGMA query_only (cualquier escritura falla) y se usa AUTOCOMMIT: las
+    lecturas no abren ni cierran transacciones.
+    """
+    url = make_url(url or settings.DATABASE_READ_URL or settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        kwargs.setdefault("isolation_level", "AUTOCOMMIT")
+    engine = create_db_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite":
+        _solo_lectura_sqlite(engine)
+    return engine
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+def create_async_db_engine(url: str = None, **kwargs: Any) -> AsyncEngine:
+    """
+    Crear el motor asíncrono (AsyncSession) sobre la misma base de datos.
+
+    Las URL sqlite:// se traducen al driver aiosqlite; los PRAGMA y el
+    tamaño del pool son los mismos que en create_db_engine. Una base SQLite
+    en memoria no se comparte entre ambos motores.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+    es_sqlite = url.get_backend_name() == "sqlite"
+    if es_sqlite and url.get_driver_name() != "aiosqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    en_memoria = es_sqlite and _es_sqlite_en_memoria(url)
+    opciones: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if es_sqlite:
+        opciones["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if not en_memoria:
+        opciones.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    opciones.update(kwargs)
+
+    async_engine = create_async_engine(url, **opciones)
+    if es_sqlite:
+        _configurar_pragmas_sqlite(async_engine.sync_engine, en_memoria)
+    return async_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Lecturas (listados, búsquedas y estadísticas). Una base SQLite en memoria
+# no se puede abrir desde otro pool: en ese caso se comparte el motor principal
+if settings.DATABASE_READ_URL or not _es_sqlite_en_memoria(engine.url):
+    read_engine = create_read_db_engine()
+else:
+    read_engine = engine
+SessionLocalRO = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
+
+# Sesiones asíncronas para los endpoints de lectura más concurridos: no
+# ocupan un hilo del threadpool mientras esperan a la base de datos
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Función para obtener una sesión de base de datos
@@ -18,3 +162,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Función para obtener una sesión de solo lectura (rutas GET sin escrituras)
+def get_read_db():
+    db = SessionLocalRO()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Función para obtener una sesión asíncrona de base de datos
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,218 @@
+"""
+Índices de texto completo (SQLite FTS5).
+
+Las tablas virtuales usan contenido externo (content=...) y se mantienen
+sincronizadas con triggers, por lo que cualquier INSERT/UPDATE/DELETE sobre la
+tabla base (ORM o SQL directo) actualiza el índice. El trigger de UPDATE solo
+se dispara cuando cambia alguna columna indexada. El tokenizador
+unicode61 con remove_diacritics permite buscar sin acentos ("psicologica"
+encuentra "psicológica").
+
+Si el SQLite instalado no tiene FTS5 las búsquedas usan LIKE como respaldo.
+
+Celulares y matrículas no se buscan por palabras sino por prefijo sobre
+índices de expresión que ignoran separadores (identificador_normalizado).
+"""
+import logging
+import re
+import weakref
+from typing import Optional
+
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CITAS_FTS_TABLE = "citas_fts"
+
+# Columnas de `citas` incluidas en el índice de texto completo
+CITAS_FTS_COLUMNS = (
+    "motivo",
+    "observaciones_alumno",
+    "observaciones_personal",
+    "estatus_canalizacion_externa",
+)
+
+PERSONAS_FTS_TABLE = "personas_fts"
+
+# Columnas de `personas` incluidas en el índice de texto completo
+PERSONAS_FTS_COLUMNS = (
+    "correo_institucional",
+    "matricula",
+    "lugar_origen",
+    "colonia_residencia_actual",
+)
+
+# Separadores que se ignoran al buscar celulares y matrículas ("686 123-45-67")
+SEPARADORES_IDENTIFICADOR = (" ", "-", "(", ")", ".", "+", "/")
+
+
+def _ddl_fts(tabla_fts: str, tabla: str, rowid: str, columnas, prefijos: str = "") -> tuple:
+    """Tabla virtual FTS5 de contenido externo y sus triggers de sincronización."""
+    lista = ", ".join(columnas)
+    nuevos = ", ".join(f"new.{c}" for c in columnas)
+    viejos = ", ".join(f"old.{c}" for c in columnas)
+    # Índices de prefijos: las búsquedas "palabra"* no recorren todo el vocabulario
+    opcion_prefijos = f"prefix='{prefijos}',\n        " if prefijos else ""
+
+    return (
+        f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {tabla_fts} USING fts5(
+        {lista},
+        content='{tabla}',
+        content_rowid='{rowid}',
+        {opcion_prefijos}tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {tabla_fts}_ai AFTER INSERT ON {tabla} BEGIN
+        INSERT INTO {tabla_fts}(rowid, {lista})
+        VALUES (new.{rowid}, {nuevos});
+    END
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {tabla_fts}_ad AFTER DELETE ON {tabla} BEGIN
+        INSERT INTO {tabla_fts}({tabla_fts}, rowid, {lista})
+        VALUES ('delete', old.{rowid}, {viejos});
+    END
+    """,
+        # Solo los cambios de las columnas indexadas reindexan la fila
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {tabla_fts}_au AFTER UPDATE OF {lista} ON {tabla} BEGIN
+        INSERT INTO {tabla_fts}({tabla_fts}, rowid, {lista})
+        VALUES ('delete', old.{rowid}, {viejos});
+        INSERT INTO {tabla_fts}(rowid, {lista})
+        VALUES (new.{rowid}, {nuevos});
+    END
+    """,
+    )
+
+
+CITAS_FTS_DDL = _ddl_fts(CITAS_FTS_TABLE, "citas", "id_cita", CITAS_FTS_COLUMNS)
+
+PERSONAS_FTS_DDL = _ddl_fts(
+    PERSONAS_FTS_TABLE, "personas", "id", PERSONAS_FTS_COLUMNS, prefijos="2 3 4"
+)
+
+# Disponibilidad de cada índice por motor (se consulta sqlite_master una sola vez)
+_disponibilidad: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _tabla_existe(connection, nombre: str) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :nombre"),
+        {"nombre": nombre}
+    ).first() is not None
+
+
+def _crear_fts(connection, tabla_fts: str, ddl: tuple, descripcion: str) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+
+    existia = _tabla_existe(connection, tabla_fts)
+    try:
+        for sentencia in ddl:
+            connection.execute(text(sentencia))
+        if not existia:
+            connection.execute(
+                text(f"INSERT INTO {tabla_fts}({tabla_fts}) VALUES ('rebuild')")
+            )
+    except OperationalError as e:
+        logger.warning(f"FTS5 no disponible, la búsqueda de {descripcion} usará LIKE: {e}")
+        return False
+
+    _disponibilidad.clear()
+    return True
+
+
+def _eliminar_fts(connection, tabla_fts: str) -> None:
+    if connection.dialect.name == "sqlite":
+        # Los triggers pertenecen a la tabla base, no a la tabla virtual
+        for sufijo in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {tabla_fts}_{sufijo}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {tabla_fts}"))
+        _disponibilidad.clear()
+
+
+def _fts_disponible(db: Session, tabla_fts: str) -> bool:
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+
+    tablas = _disponibilidad.setdefault(bind, {})
+    if tabla_fts not in tablas:
+        tablas[tabla_fts] = _tabla_existe(db, tabla_fts)
+    return tablas[tabla_fts]
+
+
+def crear_fts_citas(connection) -> bool:
+    """
+    Crear el índice FTS5 de citas y sus triggers si no existen.
+
+    Cuando el índice se crea sobre una tabla con datos, se reconstruye a partir
+    del contenido actual.
+
+    Returns:
+        True si el índice quedó disponible, False si FTS5 no está soportado
+    """
+    return _crear_fts(connection, CITAS_FTS_TABLE, CITAS_FTS_DDL, "citas")
+
+
+def eliminar_fts_citas(connection) -> None:
+    """Eliminar el índice FTS5 de citas y sus triggers de sincronización."""
+    _eliminar_fts(connection, CITAS_FTS_TABLE)
+
+
+def fts_citas_disponible(db: Session) -> bool:
+    """Indicar si la base de datos de la sesión tiene el índice FTS5 de citas."""
+    return _fts_disponible(db, CITAS_FTS_TABLE)
+
+
+def crear_fts_personas(connection) -> bool:
+    """Crear el índice FTS5 de personas y sus triggers (ver crear_fts_citas)."""
+    return _crear_fts(connection, PERSONAS_FTS_TABLE, PERSONAS_FTS_DDL, "personas")
+
+
+def eliminar_fts_personas(connection) -> None:
+    """Eliminar el índice FTS5 de personas y sus triggers de sincronización."""
+    _eliminar_fts(connection, PERSONAS_FTS_TABLE)
+
+
+def fts_personas_disponible(db: Session) -> bool:
+    """Indicar si la base de datos de la sesión tiene el índice FTS5 de personas."""
+    return _fts_disponible(db, PERSONAS_FTS_TABLE)
+
+
+def identificador_normalizado(columna):
+    """
+    Expresión SQL de `columna` sin separadores y en mayúsculas.
+
+    Los índices de expresión de celular y matrícula usan exactamente esta
+    expresión; las consultas deben repetirla (literales incluidos, no
+    parámetros) para que SQLite los aproveche.
+    """
+    expresion = columna
+    for separador in SEPARADORES_IDENTIFICADOR:
+        expresion = func.replace(expresion, literal_column(f"'{separador}'"), literal_column("''"))
+    return func.upper(expresion)
+
+
+def normalizar_identificador(texto: str) -> str:
+    """Equivalente en Python de identificador_normalizado."""
+    for separador in SEPARADORES_IDENTIFICADOR:
+        texto = texto.replace(separador, "")
+    return texto.upper()
+
+
+def expresion_fts(q: str) -> Optional[str]:
+    """
+    Convertir el texto del usuario en una expresión MATCH segura.
+
+    Cada palabra se cita (para neutralizar la sintaxis de FTS5) y se busca como
+    prefijo; todas las palabras deben aparecer.
+    """
+    palabras = re.findall(r"\w+", q or "", flags=re.UNICODE)
+    if not palabras:
+        return None
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
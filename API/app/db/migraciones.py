@@ -0,0 +1,79 @@
+"""
+Verificación del esquema de la base de datos al iniciar la API.
+
+El esquema lo administra Alembic (alembic upgrade head). Al arrancar solo
+se compara la revisión de la base (tabla alembic_version) con la última
+revisión del repositorio, en lugar de ejecutar create_all en cada import.
+
+Una base vacía se crea con create_all y se marca en la última revisión
+(las migraciones iniciales asumen tablas existentes).
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.database import Base
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+
+@lru_cache(maxsize=1)
+def _scripts() -> ScriptDirectory:
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI))
+
+
+def revision_head() -> Optional[str]:
+    """Última revisión de las migraciones del repositorio."""
+    return _scripts().get_current_head()
+
+
+def revision_actual(engine: Engine) -> Optional[str]:
+    """Revisión registrada en la base de datos (None si no tiene alembic_version)."""
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def preparar_esquema(engine: Engine) -> bool:
+    """
+    Verificar que la base de datos esté en la última revisión de Alembic.
+
+    - Base vacía y CREAR_ESQUEMA_SI_VACIA: se crean las tablas y se marca
+      la última revisión.
+    - Revisión distinta de la última: se lanza RuntimeError para no arrancar
+      con un esquema desactualizado (las rutas dependen de columnas, índices
+      y tablas FTS de las migraciones). Con MIGRACIONES_ESTRICTAS=false solo
+      se registra una advertencia.
+
+    Devuelve True si el esquema se creó en esta llamada.
+    """
+    head = revision_head()
+    actual = revision_actual(engine)
+    if actual == head:
+        return False
+
+    if actual is None and settings.CREAR_ESQUEMA_SI_VACIA and not inspect(engine).get_table_names():
+        import app.models  # noqa: F401  Registrar todos los modelos
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            MigrationContext.configure(conn).stamp(_scripts(), head)
+        logger.info("Base de datos vacía: esquema creado en la revisión %s", head)
+        return True
+
+    mensaje = (
+        f"La base de datos está en la revisión {actual or '(sin revisión)'} y la "
+        f"última es {head}; ejecute 'alembic upgrade head'"
+    )
+    if settings.MIGRACIONES_ESTRICTAS:
+        raise RuntimeError(mensaje)
+    logger.warning(mensaje)
+    return False
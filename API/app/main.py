@@ -1,25 +1,54 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+import math
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.exc import OperationalError
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.db.database import engine, Base
+from app.core.hashing import HashingSaturado, cerrar_executor
+from app.db.database import async_engine
+from app.middleware.admision import AdmisionMiddleware, admision_global
+from app.services.arranque import arrancar
+from app.services.importacion import cerrar_importaciones
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.routes import auth_router, persona_router, grupo_router, personal_router, contacto_emergencia_router, programa_educativo_router, unidad_router, cuestionario_router, cuestionario_psicopedagogico_router, citas_router
 from app.routes import cuestionarios_admin, cuestionarios_usuario
 # cohorte_router comentado temporalmente debido a simplificación del sistema
 from app.routes.catalogos import router as catalogos_router
 
-# Crear tablas en la base de datos
-try:
-    Base.metadata.create_all(bind=engine)
-except OperationalError:
-    print("Error al crear las tablas. Asegúrate de que la base de datos esté disponible.")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # El esquema se verifica al arrancar (revisión de Alembic), no al importar
+    app.state.arranque = await arrancar()
+    yield
+    cerrar_importaciones()
+    cerrar_executor()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
+@app.exception_handler(HashingSaturado)
+async def hashing_saturado_handler(request: Request, exc: HashingSaturado):
+    # Ráfaga de logins/registros mayor que la capacidad del executor de hash
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Servicio saturado, intente de nuevo en unos segundos"},
+        headers={"Retry-After": str(math.ceil(settings.HASH_TIMEOUT_COLA))},
+    )
+
+
+# Control de admisión; se agrega antes de CORS para que las respuestas 503
+# también lleven los encabezados CORS
+app.add_middleware(AdmisionMiddleware, admision=admision_global)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +56,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Incluir rutas
@@ -49,3 +79,9 @@ app.include_router(catalogos_router, prefix=settings.API_V1_STR)
 @app.get("/")
 def root():
     return {"message": "Bienvenido a la API del Sistema de Seguimiento Psicopedagógico"}
+
+
+@app.get("/estado/admision")
+def estado_admision():
+    """Peticiones en curso, profundidad de cola y rechazos por clase de ruta."""
+    return admision_global.estado()
@@ -0,0 +1,176 @@
+"""
+Control de admisión (load shedding) por clase de ruta.
+
+Sin este control, con sobrecarga las peticiones se acumulan sin límite en
+el threadpool de AnyIO hasta que los clientes expiran, y una exportación
+pesada de un administrador compite con los logins y las respuestas de
+cuestionarios por los mismos hilos.
+
+Cada petición HTTP se clasifica (REGLAS) en una clase con su propio límite
+de peticiones en curso (ADMISION_LIMITES) y una cola acotada
+(ADMISION_COLAS). Con la cola llena, o tras ADMISION_ESPERA_MAXIMA
+segundos en ella, se responde 503 con Retry-After de inmediato. Que la suma
+de los límites no supere los hilos del threadpool (40) mantiene vacía la
+cola invisible de AnyIO.
+
+Las rutas sin clase (streams SSE, documentación, estado) no se controlan.
+Admision.estado() expone peticiones en curso, profundidad de cola y
+conteos de rechazos (GET /estado/admision).
+"""
+import asyncio
+import logging
+import re
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (método o None para cualquiera, expresión sobre la ruta, clase); gana la
+# primera que coincide. Clase None: sin control de admisión
+REGLAS: List[Tuple[Optional[str], str, Optional[str]]] = [
+    (None, r"/stream$", None),
+    (None, r"^/(docs|redoc|estado/)|/openapi\.json$", None),
+    ("POST", r"/auth/login$", "criticas"),
+    ("POST", r"/personas/registro-alumno/?$", "criticas"),
+    ("POST", r"/cuestionarios-usuario/\d+/responder$", "criticas"),
+    ("POST", r"/cuestionario-psicopedagogico/completar$", "criticas"),
+    ("GET", r"/bulk-import/[^/]+$", "general"),  # consulta de progreso
+    (None, r"/bulk-", "pesadas"),
+    ("GET", r"/export$|/estadisticas$|/respuestas/todas$|/reportes$", "pesadas"),
+    (None, r"", "general"),
+]
+
+
+class ClaseAdmision:
+    """Peticiones en curso y cola de espera de una clase de rutas."""
+
+    def __init__(self, nombre: str, limite: int, cola: int):
+        self.nombre = nombre
+        self.limite = limite
+        self.cola = cola
+        self.en_curso = 0
+        self.admitidas = 0
+        self.rechazadas = 0  # cola llena
+        self.expiradas = 0   # esperaron más de ADMISION_ESPERA_MAXIMA
+        self._espera: Deque[asyncio.Future] = deque()
+
+    async def entrar(self, espera_maxima: float) -> bool:
+        """Ocupar un lugar; False si la petición debe rechazarse."""
+        if self.en_curso < self.limite and not self._espera:
+            self.en_curso += 1
+            self.admitidas += 1
+            return True
+        if len(self._espera) >= self.cola:
+            self.rechazadas += 1
+            return False
+
+        turno = asyncio.get_running_loop().create_future()
+        self._espera.append(turno)
+        try:
+            # salir() transfiere su lugar resolviendo el turno
+            await asyncio.wait_for(turno, espera_maxima)
+        except asyncio.TimeoutError:
+            if turno in self._espera:
+                self._espera.remove(turno)
+            elif turno.done() and not turno.cancelled():
+                # salir() transfirió su lugar justo al vencer el plazo
+                # (posible desde Python 3.12): la petición queda admitida
+                self.admitidas += 1
+                return True
+            self.expiradas += 1
+            return False
+        except asyncio.CancelledError:
+            # Cliente desconectado: devolver el lugar si ya se había recibido
+            if turno in self._espera:
+                self._espera.remove(turno)
+            elif turno.done() and not turno.cancelled():
+                self.salir()
+            raise
+        self.admitidas += 1
+        return True
+
+    def salir(self) -> None:
+        """Liberar un lugar (se transfiere al primero en la cola si lo hay)."""
+        while self._espera:
+            turno = self._espera.popleft()
+            if not turno.done():
+                turno.set_result(None)
+                return
+        self.en_curso -= 1
+
+    def estado(self) -> Dict[str, int]:
+        return {
+            "limite": self.limite,
+            "en_curso": self.en_curso,
+            "en_cola": len(self._espera),
+            "cola_maxima": self.cola,
+            "admitidas": self.admitidas,
+            "rechazadas": self.rechazadas,
+            "expiradas": self.expiradas,
+        }
+
+
+class Admision:
+    """Clasificación de rutas y estado de cada clase."""
+
+    def __init__(
+        self,
+        limites: Optional[Dict[str, int]] = None,
+        colas: Optional[Dict[str, int]] = None,
+        reglas: List[Tuple[Optional[str], str, Optional[str]]] = REGLAS,
+    ):
+        limites = limites if limites is not None else settings.ADMISION_LIMITES
+        colas = colas if colas is not None else settings.ADMISION_COLAS
+        self._reglas = [(metodo, re.compile(patron), clase) for metodo, patron, clase in reglas]
+        self.clases = {
+            nombre: ClaseAdmision(nombre, limite, colas.get(nombre, 0))
+            for nombre, limite in limites.items()
+        }
+
+    def clasificar(self, metodo: str, ruta: str) -> Optional[ClaseAdmision]:
+        for metodo_regla, patron, clase in self._reglas:
+            if (metodo_regla is None or metodo_regla == metodo) and patron.search(ruta):
+                return self.clases.get(clase) if clase else None
+        return None
+
+    def estado(self) -> Dict[str, Dict[str, int]]:
+        return {nombre: clase.estado() for nombre, clase in self.clases.items()}
+
+
+class AdmisionMiddleware:
+    """Middleware ASGI que aplica el control de admisión a las peticiones HTTP."""
+
+    def __init__(self, app: ASGIApp, admision: Optional[Admision] = None):
+        self.app = app
+        self.admision = admision if admision is not None else admision_global
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        clase = None
+        if scope["type"] == "http" and settings.ADMISION_HABILITADA:
+            clase = self.admision.clasificar(scope["method"], scope["path"])
+        if clase is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await clase.entrar(settings.ADMISION_ESPERA_MAXIMA):
+            logger.debug("Admisión: petición rechazada (%s %s, clase %s)", scope["method"], scope["path"], clase.nombre)
+            respuesta = JSONResponse(
+                status_code=503,
+                content={"detail": "Servicio saturado, intente de nuevo en unos segundos"},
+                headers={"Retry-After": str(settings.ADMISION_RETRY_AFTER)},
+            )
+            await respuesta(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            clase.salir()
+
+
+# Estado compartido por la aplicación (ver GET /estado/admision en app/main.py)
+admision_global = Admision()
@@ -1,95 +1,79 @@
 """
 Rate limiting middleware para endpoints sensibles.
+
+Ventana deslizante exacta por IP y endpoint. El almacenamiento lo hace un
+backend intercambiable (ver rate_limit_backends.py): en memoria del
+proceso, SQLite compartido entre los workers de un equipo o Redis.
 """
-from typing import Dict
-from datetime import datetime, timedelta
-from fastapi import HTTPException, Request
 import logging
+import math
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from app.middleware.rate_limit_backends import BackendRateLimit, crear_backend
 
 # Logger para rate limiting
 rate_limit_logger = logging.getLogger("rate_limit")
 
-# Almacén en memoria para rate limiting (en producción usar Redis)
-rate_limit_store: Dict[str, Dict[str, any]] = {}
 
 class RateLimiter:
-    def __init__(self, max_requests: int = 5, window_minutes: int = 15):
+    def __init__(
+        self,
+        max_requests: int = 5,
+        window_minutes: float = 15,
+        backend: Optional[BackendRateLimit] = None
+    ):
         """
-        Rate limiter simple.
-        
+        Rate limiter de ventana deslizante por IP y endpoint.
+
         Args:
             max_requests: Máximo número de requests permitidos
             window_minutes: Ventana de tiempo en minutos
+            backend: Almacenamiento de las solicitudes (por defecto el de RATE_LIMIT_BACKEND)
         """
         self.max_requests = max_requests
         self.window_minutes = window_minutes
-    
+        self.window_seconds = window_minutes * 60
+        self.backend = backend if backend is not None else crear_backend()
+
     def check_rate_limit(self, request: Request, endpoint: str = "default") -> bool:
         """
         Verifica si la IP ha excedido el rate limit.
-        
+
         Args:
             request: Request de FastAPI
             endpoint: Nombre del endpoint para tracking separado
-            
+
         Returns:
-            True si está dentro del límite, False si excede
-            
+            True si está dentro del límite
+
         Raises:
-            HTTPException: Si excede el rate limit
+            HTTPException: 429 con Retry-After si excede el límite
         """
-        client_ip = request.client.host
-        key = f"{client_ip}:{endpoint}"
-        now = datetime.now()
-        
-        # Limpiar entradas expiradas
-        self._cleanup_expired_entries(now)
-        
-        # Obtener o crear entrada para esta IP
-        if key not in rate_limit_store:
-            rate_limit_store[key] = {
-                'requests': [],
-                'first_request': now
-            }
-        
-        entry = rate_limit_store[key]
-        window_start = now - timedelta(minutes=self.window_minutes)
-        
-        # Filtrar requests dentro de la ventana de tiempo
-        entry['requests'] = [req_time for req_time in entry['requests'] if req_time > window_start]
-        
-        # Verificar si excede el límite
-        if len(entry['requests']) >= self.max_requests:
+        client_ip = request.client.host if request.client else "desconocido"
+        espera = self.registrar(f"{client_ip}:{endpoint}")
+        if espera:
             rate_limit_logger.warning(
-                f"RATE LIMIT EXCEEDED: IP {client_ip} excedió {self.max_requests} "
-                f"requests en {self.window_minutes} minutos para endpoint {endpoint}"
+                "RATE LIMIT EXCEEDED: IP %s excedió %d requests en %s minutos para endpoint %s",
+                client_ip, self.max_requests, self.window_minutes, endpoint
             )
             raise HTTPException(
                 status_code=429,
-                detail=f"Demasiadas solicitudes. Máximo {self.max_requests} por {self.window_minutes} minutos."
+                detail=f"Demasiadas solicitudes. Máximo {self.max_requests} por {self.window_minutes} minutos.",
+                headers={"Retry-After": str(math.ceil(espera))}
             )
-        
-        # Agregar esta request
-        entry['requests'].append(now)
-        
-        rate_limit_logger.info(
-            f"RATE LIMIT OK: IP {client_ip} - {len(entry['requests'])}/{self.max_requests} "
-            f"requests en ventana de {self.window_minutes} minutos"
-        )
-        
         return True
-    
-    def _cleanup_expired_entries(self, now: datetime):
-        """Limpia entradas expiradas del store."""
-        cutoff = now - timedelta(minutes=self.window_minutes * 2)  # Doble ventana para seguridad
-        
-        expired_keys = []
-        for key, entry in rate_limit_store.items():
-            if entry.get('first_request', now) < cutoff and not entry.get('requests'):
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del rate_limit_store[key]
+
+    def registrar(self, key: str) -> float:
+        """
+        Registrar una solicitud para `key`.
+
+        Devuelve 0 si se aceptó o los segundos que faltan para que se libere
+        un lugar en la ventana si excede el límite (no se registra).
+        """
+        return self.backend.registrar(key, self.max_requests, self.window_seconds)
+
 
 # Instancia global para registro
 registro_rate_limiter = RateLimiter(max_requests=3, window_minutes=15)
@@ -0,0 +1,202 @@
+"""
+Backends de almacenamiento para RateLimiter.
+
+Todos implementan la misma ventana deslizante exacta: una solicitud se
+acepta si la clave tiene menos de `max_requests` solicitudes aceptadas en
+los últimos `window_seconds`. `registrar` decide y registra en una sola
+operación atómica y devuelve 0 o los segundos hasta que se libere un lugar.
+
+- BackendMemoria: deques por clave en el proceso. Con N workers de uvicorn
+  cada uno lleva su propia cuenta (el límite efectivo se multiplica por N).
+- BackendSqlite: tabla en un archivo SQLite compartido por los procesos de
+  un mismo equipo; la atomicidad la da BEGIN IMMEDIATE.
+- BackendRedis: un sorted set por clave en Redis (o un servidor compatible),
+  con transacciones optimistas (WATCH/MULTI/EXEC); sirve entre equipos.
+
+RATE_LIMIT_BACKEND elige el backend de los limitadores globales.
+"""
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Optional
+
+from app.core.config import settings
+
+# Claves (o filas) vencidas retiradas como máximo en cada llamada
+BARRIDO_MAXIMO = 16
+
+
+class BackendRateLimit(ABC):
+    """Interfaz de los backends de RateLimiter."""
+
+    @abstractmethod
+    def registrar(self, key: str, max_requests: int, window_seconds: float) -> float:
+        """
+        Registrar una solicitud para `key` si cabe en la ventana.
+
+        Devuelve 0 si se aceptó o los segundos que faltan para que se libere
+        un lugar si excede el límite (en ese caso no se registra).
+        """
+
+
+class BackendMemoria(BackendRateLimit):
+    """
+    Deque de tamaño fijo por clave con los instantes de sus últimas
+    solicitudes aceptadas: costo O(1) por solicitud.
+
+    Las claves se mantienen en orden de su última solicitud aceptada, así
+    que las inactivas quedan al frente: cada llamada retira a lo más
+    BARRIDO_MAXIMO de ellas (barrido amortizado). Un lock protege el almacén
+    porque los handlers síncronos corren en varios hilos.
+    """
+
+    def __init__(self, reloj: Callable[[], float] = time.monotonic):
+        self._reloj = reloj
+        self._store: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def registrar(self, key: str, max_requests: int, window_seconds: float) -> float:
+        now = self._reloj()
+        window_start = now - window_seconds
+        with self._lock:
+            self._barrer(window_start)
+            requests = self._store.get(key)
+            if requests is None:
+                requests = self._store[key] = deque(maxlen=max_requests)
+            elif len(requests) == max_requests and requests[0] > window_start:
+                return requests[0] - window_start
+            else:
+                # Orden del almacén = instante de la última solicitud aceptada
+                self._store.move_to_end(key)
+            requests.append(now)
+            return 0.0
+
+    def _barrer(self, window_start: float) -> None:
+        for _ in range(BARRIDO_MAXIMO):
+            if not self._store:
+                return
+            key, requests = next(iter(self._store.items()))
+            if requests and requests[-1] > window_start:
+                # La clave menos reciente sigue activa: las demás también
+                return
+            del self._store[key]
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class BackendSqlite(BackendRateLimit):
+    """
+    Una fila por solicitud aceptada con su instante de expiración.
+
+    BEGIN IMMEDIATE toma el lock de escritura antes de contar, así que la
+    cuenta y la inserción son atómicas entre conexiones y procesos. Cada
+    llamada borra a lo más BARRIDO_MAXIMO filas vencidas de cualquier clave.
+    Usa time.time(): el reloj debe ser común a todos los procesos.
+    """
+
+    def __init__(self, ruta: str, reloj: Callable[[], float] = time.time):
+        self.ruta = ruta
+        self._reloj = reloj
+        # sqlite3 no comparte conexiones entre hilos: una por hilo
+        self._local = threading.local()
+
+    def _conexion(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit (clave TEXT NOT NULL, expira REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_clave ON rate_limit (clave, expira)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_expira ON rate_limit (expira)")
+            self._local.conn = conn
+        return conn
+
+    def registrar(self, key: str, max_requests: int, window_seconds: float) -> float:
+        conn = self._conexion()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Reloj leído con el lock tomado: los instantes quedan en orden
+            now = self._reloj()
+            conn.execute(
+                "DELETE FROM rate_limit WHERE rowid IN "
+                "(SELECT rowid FROM rate_limit WHERE expira <= ? ORDER BY expira LIMIT ?)",
+                (now, BARRIDO_MAXIMO),
+            )
+            cuenta, primera = conn.execute(
+                "SELECT COUNT(*), MIN(expira) FROM rate_limit WHERE clave = ? AND expira > ?",
+                (key, now),
+            ).fetchone()
+            if cuenta >= max_requests:
+                conn.execute("COMMIT")
+                return primera - now
+            conn.execute("INSERT INTO rate_limit (clave, expira) VALUES (?, ?)", (key, now + window_seconds))
+            conn.execute("COMMIT")
+            return 0.0
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class BackendRedis(BackendRateLimit):
+    """
+    Sorted set por clave (miembro único por solicitud, score = instante).
+
+    La cuenta se lee con WATCH y el registro se hace en MULTI/EXEC: si otra
+    solicitud modificó la clave entre ambos pasos EXEC falla y se reintenta,
+    de modo que nunca se aceptan más de `max_requests`. Las claves expiran
+    solas en Redis (PEXPIRE) al terminar su ventana.
+    """
+
+    def __init__(self, cliente=None, url: Optional[str] = None, prefijo: str = "rate_limit:",
+                 reloj: Callable[[], float] = time.time):
+        if cliente is None:
+            # Dependencia opcional: solo se importa si se usa este backend
+            import redis
+            cliente = redis.Redis.from_url(url or settings.RATE_LIMIT_REDIS_URL)
+        self._cliente = cliente
+        self.prefijo = prefijo
+        self._reloj = reloj
+
+    def registrar(self, key: str, max_requests: int, window_seconds: float) -> float:
+        from redis.exceptions import WatchError
+
+        clave = f"{self.prefijo}{key}"
+        while True:
+            with self._cliente.pipeline() as pipe:
+                try:
+                    pipe.watch(clave)
+                    now = self._reloj()
+                    window_start = now - window_seconds
+                    vigentes = pipe.zrangebyscore(
+                        clave, f"({window_start}", "+inf", start=0, num=max_requests, withscores=True
+                    )
+                    if len(vigentes) >= max_requests:
+                        pipe.unwatch()
+                        return vigentes[0][1] - window_start
+                    pipe.multi()
+                    pipe.zremrangebyscore(clave, "-inf", window_start)
+                    pipe.zadd(clave, {f"{now}:{uuid.uuid4().hex}": now})
+                    pipe.pexpire(clave, int(window_seconds * 1000) + 1)
+                    pipe.execute()
+                    return 0.0
+                except WatchError:
+                    continue
+
+
+def crear_backend(nombre: Optional[str] = None) -> BackendRateLimit:
+    """Backend configurado en RATE_LIMIT_BACKEND ("memoria", "sqlite" o "redis")."""
+    nombre = nombre or settings.RATE_LIMIT_BACKEND
+    if nombre == "memoria":
+        return BackendMemoria()
+    if nombre == "sqlite":
+        return BackendSqlite(settings.RATE_LIMIT_SQLITE_PATH)
+    if nombre == "redis":
+        return BackendRedis()
+    raise ValueError(f"RATE_LIMIT_BACKEND desconocido: {nombre}")
@@ -18,8 +18,11 @@ from app.models.cuestionario_admin import (
 )
 from app.models.cohorte import Cohorte
 from app.models.cita import Cita
+from app.models.disponibilidad import DisponibilidadPersonal
 from app.models.religion import Religion
 from app.models.grupo_etnico import GrupoEtnico
 from app.models.discapacidad import Discapacidad
 from app.models.departamento import Departamento
 from app.models.notificacion import NotificacionRegistro
+from app.models.importacion import ImportacionPersonas
+from app.models.parametro import ParametroSistema
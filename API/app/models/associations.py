@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.db.database import Base
 
 # Tabla de asociación para la relación many-to-many entre Persona y Grupo
@@ -14,5 +14,7 @@ persona_programa = Table(
     'persona_programa',
     Base.metadata,
     Column('persona_id', Integer, ForeignKey('personas.id'), primary_key=True),
-    Column('programa_id', Integer, ForeignKey('programa_educativo.id'), primary_key=True)
+    Column('programa_id', Integer, ForeignKey('programa_educativo.id'), primary_key=True),
+    # La llave primaria empieza por persona_id: filtrar por programa necesita su propio índice
+    Index('ix_persona_programa_programa', 'programa_id', 'persona_id')
 )
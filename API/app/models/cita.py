@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum, Index, event, insert_sentinel
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.db.database import Base
+from app.db.fts import crear_fts_citas, eliminar_fts_citas
 
 class EstadoCita(str, enum.Enum):
     """
@@ -82,11 +83,40 @@ class Cita(Base):
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
     fecha_actualizacion = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Centinela de cliente: SQLite no garantiza el orden de RETURNING en un
+    # INSERT multi-fila; con esta columna insertmanyvalues puede devolver los
+    # id_cita en el orden de los parámetros (sort_by_parameter_order) sin
+    # caer a un INSERT por fila. No se incluye en los SELECT.
+    _sentinel = insert_sentinel("_sentinel")
+
     # Relaciones
     alumno = relationship("Persona", foreign_keys=[id_alumno], back_populates="citas_como_alumno")
     personal_asignado = relationship("Persona", foreign_keys=[id_personal], back_populates="citas_como_personal")
     grupo = relationship("Grupo", back_populates="citas")
     cuestionario = relationship("Cuestionario", back_populates="citas")
 
+    # Índices para la paginación por cursor de GET /citas/ (orden fecha_solicitud, id_cita)
+    # y para los rangos de fecha_confirmada del calendario (general y por personal).
+    # Se verifican con scripts/tests/test_query_plans.py
+    __table_args__ = (
+        Index("ix_citas_fecha_solicitud_id_cita", "fecha_solicitud", "id_cita"),
+        Index("ix_citas_fecha_confirmada", "fecha_confirmada"),
+        Index("ix_citas_personal_fecha_confirmada", "id_personal", "fecha_confirmada"),
+        # Filtros frecuentes: citas de un alumno y solicitudes por estado
+        Index("ix_citas_alumno_fecha_solicitud", "id_alumno", "fecha_solicitud"),
+        Index("ix_citas_estado_fecha_solicitud", "estado", "fecha_solicitud"),
+    )
+
     def __repr__(self):
         return f"<Cita(id={self.id_cita}, alumno_id={self.id_alumno}, estado={self.estado}, tipo={self.tipo_cita})>"
+
+
+# Índice de texto completo (FTS5) creado y eliminado junto con la tabla
+@event.listens_for(Cita.__table__, "after_create")
+def _crear_fts_citas(target, connection, **kw):
+    crear_fts_citas(connection)
+
+
+@event.listens_for(Cita.__table__, "before_drop")
+def _eliminar_fts_citas(target, connection, **kw):
+    eliminar_fts_citas(connection)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
@@ -87,6 +87,11 @@ class Pregunta(Base):
     cuestionario = relationship("CuestionarioAdmin", back_populates="preguntas")
     respuestas = relationship("RespuestaPregunta", back_populates="pregunta", cascade="all, delete-orphan")
 
+    # Preguntas de un cuestionario en orden (relationship order_by=Pregunta.orden)
+    __table_args__ = (
+        Index("ix_preguntas_cuestionario_orden", "cuestionario_id", "orden"),
+    )
+
 
 class AsignacionCuestionario(Base):
     """Modelo para asignaciones de cuestionarios a tipos de usuario"""
@@ -102,6 +107,9 @@ class AsignacionCuestionario(Base):
 
     # Índice único para evitar duplicados
     __table_args__ = (
+        # Cuestionarios asignados a un tipo de usuario y joins por cuestionario
+        Index("ix_asignaciones_cuestionario_tipo_usuario", "tipo_usuario", "cuestionario_id"),
+        Index("ix_asignaciones_cuestionario_cuestionario", "cuestionario_id"),
         {"sqlite_autoincrement": True},
     )
 
@@ -128,6 +136,9 @@ class RespuestaCuestionario(Base):
 
     # Índice único para evitar respuestas duplicadas del mismo usuario al mismo cuestionario
     __table_args__ = (
+        # Respuesta de un usuario a un cuestionario y listados por usuario
+        Index("ix_respuestas_cuestionario_cuestionario_usuario", "cuestionario_id", "usuario_id"),
+        Index("ix_respuestas_cuestionario_usuario", "usuario_id"),
         {"sqlite_autoincrement": True},
     )
 
@@ -150,5 +161,7 @@ class RespuestaPregunta(Base):
 
     # Índice único para evitar respuestas duplicadas a la misma pregunta
     __table_args__ = (
+        # Respuestas de preguntas de una respuesta de cuestionario (carga y borrado)
+        Index("ix_respuestas_pregunta_respuesta_cuestionario", "respuesta_cuestionario_id"),
         {"sqlite_autoincrement": True},
     )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Time, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class DisponibilidadPersonal(Base):
+    """
+    Ventana semanal de atención de un miembro del personal.
+
+    Ejemplo: lunes (dia_semana=0) de 09:00 a 13:00 en "Cubículo 3".
+    A partir de estas ventanas se generan los espacios disponibles para citas.
+    """
+    __tablename__ = "disponibilidad_personal"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_personal = Column(Integer, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False)
+    dia_semana = Column(Integer, nullable=False)  # 0 = lunes ... 6 = domingo
+    hora_inicio = Column(Time, nullable=False)
+    hora_fin = Column(Time, nullable=False)
+    ubicacion = Column(String(200), nullable=True)
+    activo = Column(Boolean, default=True, nullable=False)
+    fecha_creacion = Column(DateTime, server_default=func.now())
+
+    personal = relationship("Persona")
+
+    __table_args__ = (
+        Index("ix_disponibilidad_personal_personal_dia", "id_personal", "dia_semana"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<DisponibilidadPersonal(id={self.id}, personal={self.id_personal}, "
+            f"dia={self.dia_semana}, {self.hora_inicio}-{self.hora_fin})>"
+        )
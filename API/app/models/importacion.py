@@ -0,0 +1,30 @@
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+
+from app.db.database import Base
+
+
+class ImportacionPersonas(Base):
+    """
+    Estado y progreso de una importación masiva de personas
+    (POST /personas/bulk-import).
+
+    El worker que ejecuta la importación actualiza la fila con cada lote;
+    cualquier worker responde GET /personas/bulk-import/{id} leyéndola.
+    """
+    __tablename__ = "importaciones_personas"
+
+    id = Column(String(32), primary_key=True)
+    estado = Column(String, nullable=False, default="pendiente")  # pendiente, en_proceso, completada, fallida
+    total = Column(Integer, nullable=False)
+    procesadas = Column(Integer, nullable=False, default=0)
+    exitosas = Column(Integer, nullable=False, default=0)
+    fallidas = Column(Integer, nullable=False, default=0)
+    errores = Column(JSON, nullable=False, default=list)  # [{"indice": int, "error": str}]
+    creada_en = Column(DateTime, nullable=False)
+    terminada_en = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # Depuración de importaciones terminadas hace más de IMPORTACION_ESTADO_TTL
+        Index("ix_importaciones_personas_terminada_en", "terminada_en"),
+    )
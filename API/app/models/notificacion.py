@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -39,6 +39,12 @@ class NotificacionRegistro(Base):
     usuario_solicitante = relationship("Persona", foreign_keys=[usuario_solicitante_id], back_populates="notificaciones_enviadas")
     usuario_destinatario = relationship("Persona", foreign_keys=[usuario_destinatario_id], back_populates="notificaciones_recibidas")
 
+    # Bandeja del administrador: notificaciones por destinatario y estado
+    __table_args__ = (
+        Index("ix_notificaciones_registro_destinatario_procesada", "usuario_destinatario_id", "procesada"),
+        Index("ix_notificaciones_registro_solicitante", "usuario_solicitante_id"),
+    )
+
     def __repr__(self):
         return f"<NotificacionRegistro(id={self.id}, tipo='{self.tipo_notificacion}', leida={self.leida}, procesada={self.procesada})>"
 
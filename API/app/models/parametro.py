@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.db.database import Base
+
+
+class ParametroSistema(Base):
+    """
+    Valores de configuración calculados una vez y compartidos por todos los
+    workers, p. ej. el costo de bcrypt calibrado al arrancar (bcrypt_rounds).
+    """
+    __tablename__ = "parametros_sistema"
+
+    clave = Column(String(64), primary_key=True)
+    valor = Column(String, nullable=False)
+    actualizado_en = Column(DateTime, nullable=False)
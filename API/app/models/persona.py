@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, event, insert_sentinel
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.fts import crear_fts_personas, eliminar_fts_personas, identificador_normalizado
 from app.models.associations import persona_grupo, persona_programa
 
 class Persona(Base):
@@ -26,7 +27,7 @@ class Persona(Base):
     semestre = Column(Integer, nullable=True)
     numero_hijos = Column(Integer, default=0)
     grupo_etnico = Column(String, nullable=True)
-    rol = Column(String, nullable=False, default="alumno")  # SEGURIDAD: admin, coordinador, personal, docente, alumno
+    rol = Column(String, nullable=False, default="alumno", index=True)  # SEGURIDAD: admin, coordinador, personal, docente, alumno
     is_active = Column(Boolean, default=True)
     hashed_password = Column(String, nullable=False)
     fecha_creacion = Column(DateTime, server_default=func.now())
@@ -35,6 +36,20 @@ class Persona(Base):
     cohorte_ano = Column(Integer, nullable=True)  # Año de cohorte (ej: 2024, 2025)
     cohorte_periodo = Column(Integer, nullable=True, default=1)  # Período de cohorte (1 o 2)
 
+    # Centinela de cliente para los INSERT multi-fila con RETURNING ordenado
+    # de la importación masiva (ver Cita._sentinel). No se incluye en los SELECT
+    _sentinel = insert_sentinel("_sentinel")
+
+    __table_args__ = (
+        # Filtros del directorio de personas; en SQLite cada índice incluye el
+        # id (rowid), así que también sirve para la paginación por cursor
+        Index("ix_personas_semestre", "semestre"),
+        Index("ix_personas_cohorte", "cohorte_ano", "cohorte_periodo"),
+        # Búsqueda por prefijo de celular y matrícula sin importar separadores
+        Index("ix_personas_celular_normalizado", identificador_normalizado(celular)),
+        Index("ix_personas_matricula_normalizada", identificador_normalizado(matricula)),
+    )
+
     # Relaciones
     # Nota: cohorte_id ahora es string, no hay relación directa con tabla cohorte
     grupos = relationship("Grupo", secondary=persona_grupo, back_populates="personas")
@@ -54,3 +69,14 @@ class Persona(Base):
     # Relaciones de citas (sistema unificado)
     citas_como_alumno = relationship("Cita", foreign_keys="Cita.id_alumno", back_populates="alumno")
     citas_como_personal = relationship("Cita", foreign_keys="Cita.id_personal", back_populates="personal_asignado")
+
+
+# Índice de texto completo (FTS5) creado y eliminado junto con la tabla
+@event.listens_for(Persona.__table__, "after_create")
+def _crear_fts_personas(target, connection, **kw):
+    crear_fts_personas(connection)
+
+
+@event.listens_for(Persona.__table__, "before_drop")
+def _eliminar_fts_personas(target, connection, **kw):
+    eliminar_fts_personas(connection)
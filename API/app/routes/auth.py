@@ -3,33 +3,40 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
-from app.db.database import get_db
+from app.core.hashing import HashingSaturado, hash_password, verificar_password
+from app.core.security import create_access_token, needs_rehash
+from app.db.database import get_async_db
 from app.models.persona import Persona
 from app.schemas.token import Token
 from app.schemas.persona import PersonaOut
-from app.utils.deps import get_current_active_user
+from app.utils.deps import get_current_persona_async
 
 router = APIRouter(prefix="/auth", tags=["autenticación"])
 
 
 @router.post("/login", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     Obtiene un token de acceso JWT utilizando el flujo OAuth2 password.
     """
     # Buscar usuario por correo institucional
-    user = db.query(Persona).filter(Persona.correo_institucional == form_data.username).first()
+    user = await db.scalar(select(Persona).where(Persona.correo_institucional == form_data.username))
     if not user:
         # Si no se encuentra por correo, intentar por matrícula
-        user = db.query(Persona).filter(Persona.matricula == form_data.username).first()
+        user = await db.scalar(select(Persona).where(Persona.matricula == form_data.username))
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Terminar la transacción antes de bcrypt: la conexión vuelve al pool en
+    # lugar de quedar retenida mientras se espera el executor de hash
+    await db.commit()
+
+    # bcrypt corre en el executor de hash, no en el event loop ni en el threadpool
+    if not user or not await verificar_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Correo/matrícula o contraseña incorrectos",
@@ -40,6 +47,15 @@ def login_access_token(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario inactivo"
         )
 
+    # Hash con un costo distinto de BCRYPT_ROUNDS: recalcularlo ahora que se
+    # conoce la contraseña. Si el executor está saturado se deja para otro login
+    if needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await hash_password(form_data.password)
+            await db.commit()
+        except HashingSaturado:
+            pass
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
@@ -50,8 +66,13 @@ def login_access_token(
 
 
 @router.get("/test-token", response_model=PersonaOut)
-def test_token(current_user: Persona = Depends(get_current_active_user)) -> Any:
+async def test_token(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Persona = Depends(get_current_persona_async)
+) -> Any:
     """
     Prueba el token JWT y devuelve información del usuario actual.
     """
+    # Con AsyncSession las relaciones no se cargan de forma perezosa
+    await db.refresh(current_user, attribute_names=["programas", "grupos"])
     return PersonaOut.from_orm_with_relations(current_user)
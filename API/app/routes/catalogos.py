@@ -1,14 +1,15 @@
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db, get_read_db
 from app.models.religion import Religion
 from app.models.grupo_etnico import GrupoEtnico
 from app.models.discapacidad import Discapacidad
-from app.models.persona import Persona
+from app.services.principales import Principal
 from app.schemas.catalogos import (
     ReligionCreate, ReligionUpdate, ReligionOut, ReligionBulkDelete,
     GrupoEtnicoCreate, GrupoEtnicoUpdate, GrupoEtnicoOut, GrupoEtnicoBulkDelete,
@@ -16,7 +17,7 @@ from app.schemas.catalogos import (
     ElementosPendientes, ElementoPersonalizado
 )
 from app.utils.deps import (
-    get_current_active_user,
+    get_current_active_user_async,
     check_admin_role,
     check_coordinador_role,
     check_admin_or_coordinador_role,
@@ -33,7 +34,7 @@ def create_religion(
     *,
     db: Session = Depends(get_db),
     religion_in: ReligionCreate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Crear una nueva religión (administradores y coordinadores).
@@ -51,32 +52,32 @@ def create_religion(
 
 
 @router.get("/religiones/", response_model=List[ReligionOut])
-def read_religiones(
-    db: Session = Depends(get_db),
+async def read_religiones(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
     activo: Optional[bool] = None,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user_async)
 ) -> Any:
     """
     Obtener lista de religiones.
     """
-    query = db.query(Religion)
+    query = select(Religion)
     if activo is not None:
-        query = query.filter(Religion.activo == activo)
+        query = query.where(Religion.activo == activo)
     
-    religiones = query.offset(skip).limit(limit).all()
+    religiones = (await db.scalars(query.offset(skip).limit(limit))).all()
     return religiones
 
 
 @router.get("/religiones/activas/", response_model=List[ReligionOut])
-def read_religiones_activas(
-    db: Session = Depends(get_db)
+async def read_religiones_activas(
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Obtener solo religiones activas (sin autenticación para formularios públicos).
     """
-    religiones = db.query(Religion).filter(Religion.activo == True).all()
+    religiones = (await db.scalars(select(Religion).where(Religion.activo == True))).all()
     return religiones
 
 
@@ -86,7 +87,7 @@ def update_religion(
     db: Session = Depends(get_db),
     religion_id: int,
     religion_in: ReligionUpdate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Actualizar una religión (administradores y coordinadores).
@@ -115,7 +116,7 @@ def delete_religion(
     *,
     db: Session = Depends(get_db),
     religion_id: int,
-    current_user: Persona = Depends(check_deletion_permission)
+    current_user: Principal = Depends(check_deletion_permission)
 ) -> Any:
     """
     Eliminar una religión (solo administradores - coordinadores NO pueden eliminar).
@@ -136,7 +137,7 @@ def create_grupo_etnico(
     *,
     db: Session = Depends(get_db),
     grupo_etnico_in: GrupoEtnicoCreate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Crear un nuevo grupo étnico (administradores y coordinadores).
@@ -154,32 +155,32 @@ def create_grupo_etnico(
 
 
 @router.get("/grupos-etnicos/", response_model=List[GrupoEtnicoOut])
-def read_grupos_etnicos(
-    db: Session = Depends(get_db),
+async def read_grupos_etnicos(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
     activo: Optional[bool] = None,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user_async)
 ) -> Any:
     """
     Obtener lista de grupos étnicos.
     """
-    query = db.query(GrupoEtnico)
+    query = select(GrupoEtnico)
     if activo is not None:
-        query = query.filter(GrupoEtnico.activo == activo)
+        query = query.where(GrupoEtnico.activo == activo)
     
-    grupos = query.offset(skip).limit(limit).all()
+    grupos = (await db.scalars(query.offset(skip).limit(limit))).all()
     return grupos
 
 
 @router.get("/grupos-etnicos/activos/", response_model=List[GrupoEtnicoOut])
-def read_grupos_etnicos_activos(
-    db: Session = Depends(get_db)
+async def read_grupos_etnicos_activos(
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Obtener solo grupos étnicos activos (sin autenticación para formularios públicos).
     """
-    grupos = db.query(GrupoEtnico).filter(GrupoEtnico.activo == True).all()
+    grupos = (await db.scalars(select(GrupoEtnico).where(GrupoEtnico.activo == True))).all()
     return grupos
 
 
@@ -189,7 +190,7 @@ def update_grupo_etnico(
     db: Session = Depends(get_db),
     grupo_id: int,
     grupo_etnico_in: GrupoEtnicoUpdate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Actualizar un grupo étnico (administradores y coordinadores).
@@ -218,7 +219,7 @@ def delete_grupo_etnico(
     *,
     db: Session = Depends(get_db),
     grupo_id: int,
-    current_user: Persona = Depends(check_deletion_permission)
+    current_user: Principal = Depends(check_deletion_permission)
 ) -> Any:
     """
     Eliminar un grupo étnico (solo administradores - coordinadores NO pueden eliminar).
@@ -239,7 +240,7 @@ def create_discapacidad(
     *,
     db: Session = Depends(get_db),
     discapacidad_in: DiscapacidadCreate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Crear una nueva discapacidad (administradores y coordinadores).
@@ -257,32 +258,32 @@ def create_discapacidad(
 
 
 @router.get("/discapacidades/", response_model=List[DiscapacidadOut])
-def read_discapacidades(
-    db: Session = Depends(get_db),
+async def read_discapacidades(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
     activo: Optional[bool] = None,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user_async)
 ) -> Any:
     """
     Obtener lista de discapacidades.
     """
-    query = db.query(Discapacidad)
+    query = select(Discapacidad)
     if activo is not None:
-        query = query.filter(Discapacidad.activo == activo)
+        query = query.where(Discapacidad.activo == activo)
     
-    discapacidades = query.offset(skip).limit(limit).all()
+    discapacidades = (await db.scalars(query.offset(skip).limit(limit))).all()
     return discapacidades
 
 
 @router.get("/discapacidades/activas/", response_model=List[DiscapacidadOut])
-def read_discapacidades_activas(
-    db: Session = Depends(get_db)
+async def read_discapacidades_activas(
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Obtener solo discapacidades activas (sin autenticación para formularios públicos).
     """
-    discapacidades = db.query(Discapacidad).filter(Discapacidad.activo == True).all()
+    discapacidades = (await db.scalars(select(Discapacidad).where(Discapacidad.activo == True))).all()
     return discapacidades
 
 
@@ -292,7 +293,7 @@ def update_discapacidad(
     db: Session = Depends(get_db),
     discapacidad_id: int,
     discapacidad_in: DiscapacidadUpdate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Actualizar una discapacidad (administradores y coordinadores).
@@ -321,7 +322,7 @@ def delete_discapacidad(
     *,
     db: Session = Depends(get_db),
     discapacidad_id: int,
-    current_user: Persona = Depends(check_deletion_permission)
+    current_user: Principal = Depends(check_deletion_permission)
 ) -> Any:
     """
     Eliminar una discapacidad (solo administradores - coordinadores NO pueden eliminar).
@@ -339,8 +340,8 @@ def delete_discapacidad(
 
 @router.get("/pendientes/", response_model=ElementosPendientes)
 def get_elementos_pendientes(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Obtener todos los elementos pendientes de activación (administradores y coordinadores).
@@ -455,7 +456,7 @@ def activar_elementos_multiples(
     *,
     db: Session = Depends(get_db),
     elementos: dict,  # {"religiones": [1,2], "grupos_etnicos": [3,4], "discapacidades": [5,6]}
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Activar múltiples elementos de diferentes catálogos (administradores y coordinadores).
@@ -504,7 +505,7 @@ def bulk_delete_religiones(
     *,
     db: Session = Depends(get_db),
     bulk_delete: ReligionBulkDelete,
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     Eliminar múltiples religiones en una sola operación (solo administradores).
@@ -526,7 +527,7 @@ def bulk_delete_grupos_etnicos(
     *,
     db: Session = Depends(get_db),
     bulk_delete: GrupoEtnicoBulkDelete,
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     Eliminar múltiples grupos étnicos en una sola operación (solo administradores).
@@ -548,7 +549,7 @@ def bulk_delete_discapacidades(
     *,
     db: Session = Depends(get_db),
     bulk_delete: DiscapacidadBulkDelete,
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     Eliminar múltiples discapacidades en una sola operación (solo administradores).
@@ -1,31 +1,299 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, load_only
+from pydantic import ValidationError
+from sqlalchemy import Float, Integer, or_, and_, delete, func, insert, select, text, tuple_, update
+from typing import Dict, Iterable, List, Optional, Any, Union
 from datetime import datetime, timedelta, date
-
-from app.db.database import get_db
+import asyncio
+import csv
+import io
+import json
+
+from app.core.config import settings
+from app.db.database import get_async_db, get_db, get_read_db
+from app.db.fts import expresion_fts, fts_citas_disponible
 from app.models.persona import Persona
 from app.models.cita import Cita, EstadoCita, TipoCita
 from app.schemas.cita import (
     CitaCreate, CitaUpdate, CitaOut, SolicitudCitaOut,
     NotificacionCita, EstadisticasCitas, CitaBulkDelete,
-    CitaBulkCreate, CitaBulkUpdate
+    CitaBulkCreate, CitaBulkUpdate, ResultadoItemLote, ResultadoLoteCitas,
+    CalendarioCitas, CitaCalendario, DiaCalendario
+)
+from app.schemas.disponibilidad import (
+    DisponibilidadCreate, DisponibilidadOut, EspacioDisponible, CitaReprogramar
 )
+from app.models.disponibilidad import DisponibilidadPersonal
+from app.services.agenda import agenda, bloquear_escritura
+from app.services.eventos import canal_citas, mensaje_notificacion, publicar_cambios_lote
+from app.services.principales import Principal
 from app.utils.deps import (
     get_current_active_user,
+    get_current_active_user_async,
+    get_current_active_user_stream,
     check_admin_role,
     check_administrative_access,
     check_deletion_permission
 )
+from app.utils.cache import TTLCache
+from app.utils.etag import respuesta_con_etag
+from app.utils.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter()
 
+# Resultados recientes de /estadisticas por combinación de filtros
+_estadisticas_cache = TTLCache(max_entries=64, ttl_seconds=settings.ESTADISTICAS_CITAS_CACHE_TTL)
+
+# Máximo de ids por consulta IN (SQLite limita el número de parámetros)
+_TAMANO_LOTE_IN = 500
+
+
+def _consultas_personas(citas: Iterable[Cita]) -> List[Any]:
+    """
+    Consultas IN (una por cada lote de 500 ids) de los alumnos y el personal
+    referenciados por un conjunto de citas.
+    """
+    ids = set()
+    for cita in citas:
+        if cita.id_alumno:
+            ids.add(cita.id_alumno)
+        if cita.id_personal:
+            ids.add(cita.id_personal)
+
+    return [
+        select(Persona).options(
+            load_only(
+                Persona.id,
+                Persona.correo_institucional,
+                Persona.celular,
+                Persona.matricula,
+                Persona.semestre
+            )
+        ).where(Persona.id.in_(lote))
+        for lote in _lotes(sorted(ids))
+    ]
+
+
+def _cargar_personas(db: Session, citas: Iterable[Cita]) -> Dict[int, Persona]:
+    """
+    Cargar en bloque los alumnos y el personal referenciados por un conjunto de citas.
+
+    Sustituye las consultas por fila (N+1) por una única consulta IN
+    (una por cada lote de 500 ids) y devuelve un diccionario id -> Persona.
+    """
+    personas: Dict[int, Persona] = {}
+    for consulta in _consultas_personas(citas):
+        for persona in db.scalars(consulta):
+            personas[persona.id] = persona
+    return personas
+
+
+async def _cargar_personas_async(db: AsyncSession, citas: Iterable[Cita]) -> Dict[int, Persona]:
+    """Variante de _cargar_personas para AsyncSession."""
+    personas: Dict[int, Persona] = {}
+    for consulta in _consultas_personas(citas):
+        for persona in await db.scalars(consulta):
+            personas[persona.id] = persona
+    return personas
+
+
+def _nombre_persona(persona: Optional[Persona]) -> Optional[str]:
+    """Nombre para mostrar de una persona (parte local del correo institucional)."""
+    if not persona:
+        return None
+    return persona.correo_institucional.split('@')[0]
+
+
+def _cita_to_out(cita: Cita, personas: Dict[int, Persona]) -> CitaOut:
+    """Construir CitaOut a partir de una cita y el mapa de personas precargado."""
+    alumno = personas.get(cita.id_alumno)
+    personal = personas.get(cita.id_personal) if cita.id_personal else None
+
+    return CitaOut(
+        id_cita=cita.id_cita,
+        id_alumno=cita.id_alumno,
+        id_personal=cita.id_personal,
+        id_grupo=cita.id_grupo,
+        id_cuestionario=cita.id_cuestionario,
+        tipo_cita=cita.tipo_cita,
+        motivo=cita.motivo,
+        estado=cita.estado,
+        fecha_solicitud=cita.fecha_solicitud,
+        fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
+        fecha_confirmada=cita.fecha_confirmada,
+        fecha_completada=cita.fecha_completada,
+        observaciones_alumno=cita.observaciones_alumno,
+        observaciones_personal=cita.observaciones_personal,
+        ubicacion=cita.ubicacion,
+        motivo_psicologico=cita.motivo_psicologico,
+        motivo_academico=cita.motivo_academico,
+        salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
+        requiere_seguimiento=cita.requiere_seguimiento,
+        requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
+        estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
+        fecha_proxima_sesion=cita.fecha_proxima_sesion,
+        ultima_fecha_contacto=cita.ultima_fecha_contacto,
+        fecha_creacion=cita.fecha_creacion,
+        fecha_actualizacion=cita.fecha_actualizacion,
+        alumno_nombre=_nombre_persona(alumno) or "Desconocido",
+        alumno_email=alumno.correo_institucional if alumno else "",
+        alumno_celular=alumno.celular if alumno else None,
+        alumno_matricula=alumno.matricula if alumno else None,
+        personal_nombre=_nombre_persona(personal),
+        personal_email=personal.correo_institucional if personal else None
+    )
+
+
+def _citas_to_out(db: Session, citas: List[Cita]) -> List[CitaOut]:
+    """Construir la respuesta de una lista de citas con una sola carga de personas."""
+    personas = _cargar_personas(db, citas)
+    return [_cita_to_out(cita, personas) for cita in citas]
+
+
+async def _citas_to_out_async(db: AsyncSession, citas: List[Cita]) -> List[CitaOut]:
+    """Variante de _citas_to_out para AsyncSession."""
+    personas = await _cargar_personas_async(db, citas)
+    return [_cita_to_out(cita, personas) for cita in citas]
+
+
+def _lotes(valores: List[Any]) -> Iterable[List[Any]]:
+    """Dividir una lista en lotes aptos para una consulta IN."""
+    for inicio in range(0, len(valores), _TAMANO_LOTE_IN):
+        yield valores[inicio:inicio + _TAMANO_LOTE_IN]
+
+
+def _ids_existentes(db: Session, columna, ids: Iterable[int]) -> set:
+    """Subconjunto de `ids` que existe en la columna indicada (una consulta por lote)."""
+    ids = sorted({i for i in ids if i is not None})
+    existentes = set()
+    for lote in _lotes(ids):
+        existentes.update(db.execute(select(columna).where(columna.in_(lote))).scalars())
+    return existentes
+
+
+def _estados_anteriores(db: Session, ids: Iterable[int]) -> Dict[int, tuple]:
+    """`{id_cita: (estado, fecha_confirmada)}` de las citas existentes en `ids`."""
+    ids = sorted({i for i in ids if i is not None})
+    anteriores = {}
+    for lote in _lotes(ids):
+        filas = db.execute(
+            select(Cita.id_cita, Cita.estado, Cita.fecha_confirmada)
+            .where(Cita.id_cita.in_(lote))
+        )
+        anteriores.update((id_cita, (estado, fecha)) for id_cita, estado, fecha in filas)
+    return anteriores
+
+
+def _cargar_citas(db: Session, ids: List[int]) -> List[Cita]:
+    """Cargar citas por id conservando el orden de `ids`."""
+    por_id = {}
+    for lote in _lotes(ids):
+        for cita in db.query(Cita).filter(Cita.id_cita.in_(lote)).all():
+            por_id[cita.id_cita] = cita
+    return [por_id[i] for i in ids if i in por_id]
+
+
+def _verificar_empalme(db: Session, cita: Cita) -> None:
+    """
+    Rechazar con 409 una cita confirmada que se empalma con otra del mismo
+    personal o en la misma ubicación.
+
+    Se decide siempre contra la base de datos (el índice en memoria puede
+    estar desactualizado respecto de otros workers): se toma el bloqueo de
+    escritura, que se mantiene hasta el commit del llamador, así que dos
+    confirmaciones concurrentes no pasan ambas.
+    """
+    if cita.estado != EstadoCita.CONFIRMADA or not cita.fecha_confirmada:
+        return
+
+    bloquear_escritura(db)
+    conflicto = agenda.buscar_empalme_bd(
+        db, cita.fecha_confirmada, cita.id_personal, cita.ubicacion, excluir=cita.id_cita
+    )
+    if conflicto is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"El horario se empalma con la cita {conflicto}"
+        )
+
+
+# Columnas que cambian el horario ocupado por una cita
+_CAMPOS_AGENDA = {"estado", "fecha_confirmada", "id_personal", "ubicacion"}
+
+
+def _empalmes_lote(db: Session, ids: List[int]) -> Dict[int, int]:
+    """`{id_cita: id_en_conflicto}` de las citas `ids` ya actualizadas en la transacción."""
+    conflictos = {}
+    for lote in _lotes(ids):
+        filas = db.execute(
+            select(Cita.id_cita, Cita.fecha_confirmada, Cita.id_personal, Cita.ubicacion)
+            .where(
+                Cita.id_cita.in_(lote),
+                Cita.estado == EstadoCita.CONFIRMADA,
+                Cita.fecha_confirmada.isnot(None)
+            )
+        )
+        for id_cita, inicio, id_personal, ubicacion in filas:
+            conflicto = agenda.buscar_empalme_bd(db, inicio, id_personal, ubicacion, excluir=id_cita)
+            if conflicto is not None:
+                conflictos[id_cita] = conflicto
+    return conflictos
+
+
+def _actualizar_sin_empalmes(db: Session, parametros: List[dict]) -> Dict[int, int]:
+    """
+    Aplicar el UPDATE masivo rechazando las citas que quedarían empalmadas.
+
+    El UPDATE se ejecuta en un SAVEPOINT dentro de la transacción de
+    escritura y las citas que cambian de horario se verifican contra la base
+    de datos. Si hay empalmes se deshace el SAVEPOINT, se descartan las citas
+    en conflicto (entre dos del mismo lote, la que aparece después) y se
+    repite con las demás. Devuelve `{id_cita: id_en_conflicto}` rechazadas.
+    """
+    rechazados: Dict[int, int] = {}
+    if parametros:
+        bloquear_escritura(db)
+    while parametros:
+        punto = db.begin_nested()
+        # UPDATE por clave primaria: SQLAlchemy agrupa por conjunto de columnas
+        db.execute(update(Cita), parametros)
+        verificar = list(dict.fromkeys(
+            p["id_cita"] for p in parametros if _CAMPOS_AGENDA & p.keys()
+        ))
+        conflictos = _empalmes_lote(db, verificar)
+        if not conflictos:
+            punto.commit()
+            break
+        punto.rollback()
+
+        posicion = {id_cita: i for i, id_cita in enumerate(verificar)}
+        for id_cita, conflicto in conflictos.items():
+            if posicion.get(conflicto, -1) < posicion[id_cita]:
+                rechazados[id_cita] = conflicto
+        parametros = [p for p in parametros if p["id_cita"] not in rechazados]
+    return rechazados
+
+
+def _resultado_lote(
+    db: Session,
+    resultados: List[ResultadoItemLote],
+    citas: Optional[List[Cita]] = None
+) -> ResultadoLoteCitas:
+    exitosos = sum(1 for r in resultados if r.exito)
+    return ResultadoLoteCitas(
+        exitosos=exitosos,
+        fallidos=len(resultados) - exitosos,
+        resultados=resultados,
+        citas=_citas_to_out(db, citas) if citas else []
+    )
+
 @router.post("/solicitar", response_model=CitaOut)
 def solicitar_cita(
     cita_data: CitaCreate,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Solicitar una cita (solo para alumnos).
@@ -52,32 +320,12 @@ def solicitar_cita(
     db.refresh(nueva_cita)
 
     # Preparar respuesta
-    return CitaOut(
-        id_cita=nueva_cita.id_cita,
-        id_alumno=nueva_cita.id_alumno,
-        id_personal=nueva_cita.id_personal,
-        tipo_cita=nueva_cita.tipo_cita,
-        motivo=nueva_cita.motivo,
-        estado=nueva_cita.estado,
-        fecha_solicitud=nueva_cita.fecha_solicitud,
-        fecha_propuesta_alumno=nueva_cita.fecha_propuesta_alumno,
-        fecha_confirmada=nueva_cita.fecha_confirmada,
-        fecha_completada=nueva_cita.fecha_completada,
-        observaciones_alumno=nueva_cita.observaciones_alumno,
-        observaciones_personal=nueva_cita.observaciones_personal,
-        ubicacion=nueva_cita.ubicacion,
-        fecha_creacion=nueva_cita.fecha_creacion,
-        fecha_actualizacion=nueva_cita.fecha_actualizacion,
-        alumno_nombre=current_user.correo_institucional.split('@')[0],
-        alumno_email=current_user.correo_institucional,
-        alumno_celular=current_user.celular,
-        alumno_matricula=current_user.matricula
-    )
+    return _citas_to_out(db, [nueva_cita])[0]
 
 @router.get("/mis-citas", response_model=List[CitaOut])
 def get_mis_citas(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Obtener las citas del alumno actual.
@@ -90,48 +338,13 @@ def get_mis_citas(
 
     citas = db.query(Cita).filter(Cita.id_alumno == current_user.id).all()
 
-    resultado = []
-    for cita in citas:
-        personal_nombre = None
-        personal_email = None
-
-        if cita.id_personal:
-            personal = db.query(Persona).filter(Persona.id == cita.id_personal).first()
-            if personal:
-                personal_nombre = personal.correo_institucional.split('@')[0]
-                personal_email = personal.correo_institucional
-
-        resultado.append(CitaOut(
-            id_cita=cita.id_cita,
-            id_alumno=cita.id_alumno,
-            id_personal=cita.id_personal,
-            tipo_cita=cita.tipo_cita,
-            motivo=cita.motivo,
-            estado=cita.estado,
-            fecha_solicitud=cita.fecha_solicitud,
-            fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-            fecha_confirmada=cita.fecha_confirmada,
-            fecha_completada=cita.fecha_completada,
-            observaciones_alumno=cita.observaciones_alumno,
-            observaciones_personal=cita.observaciones_personal,
-            ubicacion=cita.ubicacion,
-            fecha_creacion=cita.fecha_creacion,
-            fecha_actualizacion=cita.fecha_actualizacion,
-            alumno_nombre=current_user.correo_institucional.split('@')[0],
-            alumno_email=current_user.correo_institucional,
-            alumno_celular=current_user.celular,
-            alumno_matricula=current_user.matricula,
-            personal_nombre=personal_nombre,
-            personal_email=personal_email
-        ))
-
-    return resultado
+    return _citas_to_out(db, citas)
 
 @router.get("/solicitudes", response_model=List[SolicitudCitaOut])
 def get_solicitudes_citas(
     estado: Optional[EstadoCita] = None,
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Obtener solicitudes de citas (solo para admin y coordinador).
@@ -148,10 +361,11 @@ def get_solicitudes_citas(
         query = query.filter(Cita.estado == estado)
 
     citas = query.all()
+    personas = _cargar_personas(db, citas)
 
     resultado = []
     for cita in citas:
-        alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
+        alumno = personas.get(cita.id_alumno)
 
         resultado.append(SolicitudCitaOut(
             id_cita=cita.id_cita,
@@ -176,7 +390,7 @@ def confirmar_cita(
     cita_id: int,
     cita_update: CitaUpdate,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Confirmar o actualizar una cita (solo para admin y coordinador).
@@ -212,41 +426,17 @@ def confirmar_cita(
     if cita_update.estado == EstadoCita.CONFIRMADA and not cita.fecha_confirmada:
         cita.fecha_confirmada = datetime.utcnow()
 
+    _verificar_empalme(db, cita)
+
     db.commit()
     db.refresh(cita)
 
-    # Obtener información del alumno y personal
-    alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-    personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
-
-    return CitaOut(
-        id_cita=cita.id_cita,
-        id_alumno=cita.id_alumno,
-        id_personal=cita.id_personal,
-        tipo_cita=cita.tipo_cita,
-        motivo=cita.motivo,
-        estado=cita.estado,
-        fecha_solicitud=cita.fecha_solicitud,
-        fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-        fecha_confirmada=cita.fecha_confirmada,
-        fecha_completada=cita.fecha_completada,
-        observaciones_alumno=cita.observaciones_alumno,
-        observaciones_personal=cita.observaciones_personal,
-        ubicacion=cita.ubicacion,
-        fecha_creacion=cita.fecha_creacion,
-        fecha_actualizacion=cita.fecha_actualizacion,
-        alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-        alumno_email=alumno.correo_institucional if alumno else "",
-        alumno_celular=alumno.celular if alumno else None,
-        alumno_matricula=alumno.matricula if alumno else None,
-        personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-        personal_email=personal.correo_institucional if personal else None
-    )
+    return _citas_to_out(db, [cita])[0]
 
 @router.get("/notificaciones", response_model=List[NotificacionCita])
 def get_notificaciones_citas(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Obtener notificaciones de citas para el alumno.
@@ -266,25 +456,16 @@ def get_notificaciones_citas(
         Cita.fecha_actualizacion >= fecha_limite
     ).all()
 
+    personas = _cargar_personas(db, citas)
+
     notificaciones = []
     for cita in citas:
-        personal = None
-        if cita.id_personal:
-            personal = db.query(Persona).filter(Persona.id == cita.id_personal).first()
-
-        if cita.estado == EstadoCita.CONFIRMADA:
-            mensaje = f"Tu cita de tipo '{cita.tipo_cita.value}' ha sido confirmada"
-            if cita.fecha_confirmada:
-                mensaje += f" para el {cita.fecha_confirmada.strftime('%d/%m/%Y a las %H:%M')}"
-        elif cita.estado == EstadoCita.CANCELADA:
-            mensaje = f"Tu cita de tipo '{cita.tipo_cita.value}' ha sido cancelada"
-        else:
-            continue
+        personal = personas.get(cita.id_personal) if cita.id_personal else None
 
         notificaciones.append(NotificacionCita(
             id_cita=cita.id_cita,
             tipo_notificacion=f"cita_{cita.estado.value}",
-            mensaje=mensaje,
+            mensaje=mensaje_notificacion(cita),
             fecha_cita=cita.fecha_confirmada,
             ubicacion=cita.ubicacion,
             personal_nombre=personal.correo_institucional.split('@')[0] if personal else None
@@ -292,13 +473,65 @@ def get_notificaciones_citas(
 
     return notificaciones
 
+
+@router.get("/stream")
+async def stream_citas(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user_stream)
+):
+    """
+    Notificaciones de citas en tiempo real (Server-Sent Events).
+
+    Envía un evento `cita` cada vez que una cita del usuario (como alumno o
+    como personal asignado) se confirma, se cancela, se completa o se
+    reprograma. Sustituye el sondeo periódico de /notificaciones. Como
+    EventSource no envía cabeceras, el token se puede pasar en `?token=`.
+    """
+    suscripcion = canal_citas.suscribir(current_user.id)
+    # La conexión puede durar horas: se libera la sesión de inmediato
+    db.close()
+
+    async def eventos():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    evento = await asyncio.wait_for(
+                        suscripcion.cola.get(), timeout=settings.SSE_KEEPALIVE_SEGUNDOS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                datos = json.dumps(evento, ensure_ascii=False)
+                yield f"id: {evento['id_evento']}\nevent: cita\ndata: {datos}\n\n"
+        finally:
+            canal_citas.cancelar(suscripcion)
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/estadisticas", response_model=EstadisticasCitas)
 def get_estadisticas_citas(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    id_personal: Optional[int] = None,
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Obtener estadísticas de citas (solo para admin y coordinador).
+
+    Se calculan con una sola consulta GROUP BY estado, tipo_cita y el
+    resultado se reutiliza durante ESTADISTICAS_CITAS_CACHE_TTL segundos.
+
+    Filtros opcionales:
+    - fecha_desde / fecha_hasta: Rango sobre la fecha de solicitud
+    - id_personal: ID del personal asignado
     """
     if current_user.rol not in ["admin", "coordinador"]:
         raise HTTPException(
@@ -306,204 +539,684 @@ def get_estadisticas_citas(
             detail="No tienes permisos para ver estadísticas"
         )
 
-    total = db.query(Cita).count()
-    pendientes = db.query(Cita).filter(Cita.estado == EstadoCita.PENDIENTE).count()
-    confirmadas = db.query(Cita).filter(Cita.estado == EstadoCita.CONFIRMADA).count()
-    canceladas = db.query(Cita).filter(Cita.estado == EstadoCita.CANCELADA).count()
-    completadas = db.query(Cita).filter(Cita.estado == EstadoCita.COMPLETADA).count()
+    clave = (fecha_desde, fecha_hasta, id_personal)
+    return _estadisticas_cache.get_or_set(
+        clave,
+        lambda: _calcular_estadisticas(db, fecha_desde, fecha_hasta, id_personal)
+    )
+
+
+def _calcular_estadisticas(
+    db: Session,
+    fecha_desde: Optional[date],
+    fecha_hasta: Optional[date],
+    id_personal: Optional[int]
+) -> EstadisticasCitas:
+    """Calcular la matriz estado x tipo de cita en un solo recorrido de la tabla."""
+    query = db.query(Cita.estado, Cita.tipo_cita, func.count(Cita.id_cita))
+
+    if fecha_desde:
+        query = query.filter(Cita.fecha_solicitud >= fecha_desde)
+    if fecha_hasta:
+        query = query.filter(Cita.fecha_solicitud <= fecha_hasta)
+    if id_personal:
+        query = query.filter(Cita.id_personal == id_personal)
+
+    matriz = {estado.value: {tipo.value: 0 for tipo in TipoCita} for estado in EstadoCita}
+    for estado, tipo, count in query.group_by(Cita.estado, Cita.tipo_cita).all():
+        matriz[estado.value][tipo.value] = count
 
-    # Estadísticas por tipo
-    por_tipo = {}
-    for tipo in TipoCita:
-        count = db.query(Cita).filter(Cita.tipo_cita == tipo).count()
-        por_tipo[tipo.value] = count
+    por_estado = {estado: sum(tipos.values()) for estado, tipos in matriz.items()}
+    por_tipo = {
+        tipo.value: sum(tipos[tipo.value] for tipos in matriz.values())
+        for tipo in TipoCita
+    }
 
     return EstadisticasCitas(
-        total_solicitudes=total,
-        pendientes=pendientes,
-        confirmadas=confirmadas,
-        canceladas=canceladas,
-        completadas=completadas,
-        por_tipo=por_tipo
+        total_solicitudes=sum(por_estado.values()),
+        pendientes=por_estado[EstadoCita.PENDIENTE.value],
+        confirmadas=por_estado[EstadoCita.CONFIRMADA.value],
+        canceladas=por_estado[EstadoCita.CANCELADA.value],
+        completadas=por_estado[EstadoCita.COMPLETADA.value],
+        por_tipo=por_tipo,
+        matriz=matriz
     )
 
 
-@router.post("/bulk-delete", response_model=List[int])
+@router.post("/bulk-delete", response_model=Union[List[int], ResultadoLoteCitas])
 def bulk_delete_citas(
     *,
     db: Session = Depends(get_db),
     bulk_delete: CitaBulkDelete,
-    current_user: Persona = Depends(check_admin_role)
-) -> List[int]:
+    detalle: bool = False,
+    current_user: Principal = Depends(check_admin_role)
+) -> Any:
     """
     Eliminar múltiples citas en una sola operación (solo administradores).
-    """
-    deleted_ids = []
 
-    for cita_id in bulk_delete.ids:
-        cita = db.query(Cita).filter(Cita.id_cita == cita_id).first()
-        if cita:
-            db.delete(cita)
-            deleted_ids.append(cita_id)
+    Se resuelve con una consulta de existencia y un DELETE ... WHERE id_cita IN
+    por cada lote de 500 ids. Devuelve los ids eliminados o, con detalle=true,
+    el resultado de cada elemento.
+    """
+    existentes = _ids_existentes(db, Cita.id_cita, bulk_delete.ids)
+
+    # dict conserva el orden de la respuesta con búsquedas O(1)
+    deleted_ids: Dict[int, None] = {}
+    resultados = []
+    for indice, cita_id in enumerate(bulk_delete.ids):
+        if cita_id in existentes and cita_id not in deleted_ids:
+            deleted_ids[cita_id] = None
+            resultados.append(ResultadoItemLote(indice=indice, id_cita=cita_id, exito=True))
+        else:
+            resultados.append(ResultadoItemLote(
+                indice=indice, id_cita=cita_id, exito=False, error="Cita no encontrada"
+            ))
 
+    for lote in _lotes(list(deleted_ids)):
+        db.execute(
+            delete(Cita).where(Cita.id_cita.in_(lote)).execution_options(synchronize_session=False)
+        )
     db.commit()
-    return deleted_ids
 
+    if detalle:
+        return _resultado_lote(db, resultados)
+    return list(deleted_ids)
 
-# ============================================================================
-# ENDPOINTS CRUD COMPLETOS (fusión con funcionalidad de atenciones)
-# ============================================================================
 
-@router.get("/", response_model=List[CitaOut])
-def get_citas(
+@router.post("/bulk-create", response_model=Union[List[CitaOut], ResultadoLoteCitas])
+def bulk_create_citas(
+    *,
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
-    estado: Optional[EstadoCita] = None,
-    tipo_cita: Optional[TipoCita] = None,
-    id_alumno: Optional[int] = None,
-    id_personal: Optional[int] = None,
-    id_grupo: Optional[int] = None,
-    fecha_desde: Optional[date] = None,
-    fecha_hasta: Optional[date] = None,
-    current_user: Persona = Depends(get_current_active_user)
+    bulk_citas: CitaBulkCreate,
+    detalle: bool = False,
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
-    Recuperar citas con filtros opcionales.
+    Crear múltiples citas en una sola operación (solo administradores).
 
-    Filtros disponibles:
-    - estado: Estado de la cita (pendiente, confirmada, cancelada, completada)
-    - tipo_cita: Tipo de cita (psicologica, academica, general)
-    - id_alumno: ID del alumno
-    - id_personal: ID del personal asignado
-    - id_grupo: ID del grupo
-    - fecha_desde: Fecha de inicio del rango
-    - fecha_hasta: Fecha de fin del rango
+    Las referencias a alumnos y personal se validan con una consulta por lote
+    y las citas válidas se insertan con un único INSERT ... RETURNING
+    multi-fila. Con detalle=true se devuelve el resultado de cada elemento.
+    Las citas se crean pendientes, por lo que no ocupan horario (no hay
+    empalmes que verificar) ni generan eventos en /citas/stream.
     """
-    query = db.query(Cita)
-
-    # Aplicar filtros
-    if estado:
-        query = query.filter(Cita.estado == estado)
-    if tipo_cita:
-        query = query.filter(Cita.tipo_cita == tipo_cita)
-    if id_alumno:
-        query = query.filter(Cita.id_alumno == id_alumno)
-    if id_personal:
-        query = query.filter(Cita.id_personal == id_personal)
-    if id_grupo:
-        query = query.filter(Cita.id_grupo == id_grupo)
-    if fecha_desde:
-        query = query.filter(Cita.fecha_solicitud >= fecha_desde)
-    if fecha_hasta:
-        query = query.filter(Cita.fecha_solicitud <= fecha_hasta)
+    personas_existentes = _ids_existentes(
+        db,
+        Persona.id,
+        [c.id_alumno for c in bulk_citas.items] + [c.id_personal for c in bulk_citas.items]
+    )
 
-    # Ordenar por fecha de solicitud descendente
-    query = query.order_by(Cita.fecha_solicitud.desc())
+    filas = []
+    indices_validos = []
+    resultados: Dict[int, ResultadoItemLote] = {}
+    for indice, cita_data in enumerate(bulk_citas.items):
+        error = None
+        if not cita_data.id_alumno:
+            error = "id_alumno es obligatorio"
+        elif cita_data.id_alumno not in personas_existentes:
+            error = "Alumno no encontrado"
+        elif cita_data.id_personal and cita_data.id_personal not in personas_existentes:
+            error = "Personal no encontrado"
+
+        if error:
+            resultados[indice] = ResultadoItemLote(indice=indice, exito=False, error=error)
+            continue
 
-    citas = query.offset(skip).limit(limit).all()
+        filas.append(dict(
+            id_alumno=cita_data.id_alumno,
+            id_personal=cita_data.id_personal,
+            id_grupo=cita_data.id_grupo,
+            id_cuestionario=cita_data.id_cuestionario,
+            tipo_cita=cita_data.tipo_cita,
+            motivo=cita_data.motivo,
+            fecha_propuesta_alumno=cita_data.fecha_propuesta_alumno,
+            observaciones_alumno=cita_data.observaciones_alumno,
+            estado=EstadoCita.PENDIENTE
+        ))
+        indices_validos.append(indice)
+
+    nuevos_ids = []
+    if filas:
+        # INSERT multi-fila (insertmanyvalues); sort_by_parameter_order
+        # devuelve los id_cita en el mismo orden que `filas`.
+        nuevos_ids = list(db.execute(
+            insert(Cita.__table__).returning(
+                Cita.__table__.c.id_cita, sort_by_parameter_order=True
+            ),
+            filas
+        ).scalars())
+    db.commit()
 
-    # Construir respuesta con información de alumno y personal
-    resultado = []
-    for cita in citas:
-        alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-        personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
+    for indice, cita_id in zip(indices_validos, nuevos_ids):
+        resultados[indice] = ResultadoItemLote(indice=indice, id_cita=cita_id, exito=True)
 
-        resultado.append(CitaOut(
-            id_cita=cita.id_cita,
-            id_alumno=cita.id_alumno,
-            id_personal=cita.id_personal,
-            id_grupo=cita.id_grupo,
-            id_cuestionario=cita.id_cuestionario,
-            tipo_cita=cita.tipo_cita,
-            motivo=cita.motivo,
-            estado=cita.estado,
-            fecha_solicitud=cita.fecha_solicitud,
-            fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-            fecha_confirmada=cita.fecha_confirmada,
-            fecha_completada=cita.fecha_completada,
-            observaciones_alumno=cita.observaciones_alumno,
-            observaciones_personal=cita.observaciones_personal,
-            ubicacion=cita.ubicacion,
-            motivo_psicologico=cita.motivo_psicologico,
-            motivo_academico=cita.motivo_academico,
-            salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-            requiere_seguimiento=cita.requiere_seguimiento,
-            requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-            estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-            fecha_proxima_sesion=cita.fecha_proxima_sesion,
-            ultima_fecha_contacto=cita.ultima_fecha_contacto,
-            fecha_creacion=cita.fecha_creacion,
-            fecha_actualizacion=cita.fecha_actualizacion,
-            alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-            alumno_email=alumno.correo_institucional if alumno else "",
-            alumno_celular=alumno.celular if alumno else None,
-            alumno_matricula=alumno.matricula if alumno else None,
-            personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-            personal_email=personal.correo_institucional if personal else None
-        ))
+    # Una sola lectura (por lote) en lugar de refrescar cada objeto
+    created_citas = _cargar_citas(db, nuevos_ids)
 
-    return resultado
+    if detalle:
+        return _resultado_lote(db, [resultados[i] for i in sorted(resultados)], created_citas)
+    return _citas_to_out(db, created_citas)
 
 
-@router.get("/{cita_id}", response_model=CitaOut)
-def get_cita_by_id(
-    cita_id: int,
+@router.put("/bulk-update", response_model=Union[List[CitaOut], ResultadoLoteCitas])
+def bulk_update_citas(
+    *,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    bulk_update: CitaBulkUpdate,
+    detalle: bool = False,
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
-    Obtener una cita específica por ID.
+    Actualizar múltiples citas en una sola operación (solo administradores).
+
+    Cada elemento se valida con CitaUpdate; la existencia de las citas se
+    comprueba con una consulta por lote y los cambios se aplican con UPDATE
+    por clave primaria agrupados en executemany según los campos modificados.
+    Con detalle=true se devuelve el resultado de cada elemento. Las citas
+    confirmadas que quedarían empalmadas se rechazan igual que en los
+    endpoints individuales y los cambios de estado se publican en
+    /citas/stream.
     """
-    cita = db.query(Cita).filter(Cita.id_cita == cita_id).first()
-    if not cita:
-        raise HTTPException(status_code=404, detail="Cita no encontrada")
+    columnas = set(Cita.__table__.columns.keys()) - {"id_cita", "_sentinel"}
+    campos_validados = set(CitaUpdate.model_fields)
 
-    alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-    personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
+    # Estado previo de cada cita: comprueba la existencia y permite detectar
+    # los cambios a notificar (el UPDATE masivo no pasa por el flush)
+    anteriores = _estados_anteriores(
+        db, [item.get("id_cita") for item in bulk_update.items]
+    )
+    existentes = anteriores.keys()
+
+    parametros = []
+    # dict conserva el orden de la respuesta con búsquedas O(1)
+    updated_ids: Dict[int, None] = {}
+    resultados = []
+    for indice, item in enumerate(bulk_update.items):
+        cita_id = item.get("id_cita")
+        if cita_id is None:
+            resultados.append(ResultadoItemLote(
+                indice=indice, exito=False, error="id_cita es obligatorio"
+            ))
+            continue
+        if cita_id not in existentes:
+            resultados.append(ResultadoItemLote(
+                indice=indice, id_cita=cita_id, exito=False, error="Cita no encontrada"
+            ))
+            continue
 
-    return CitaOut(
-        id_cita=cita.id_cita,
-        id_alumno=cita.id_alumno,
-        id_personal=cita.id_personal,
-        id_grupo=cita.id_grupo,
-        id_cuestionario=cita.id_cuestionario,
-        tipo_cita=cita.tipo_cita,
-        motivo=cita.motivo,
-        estado=cita.estado,
-        fecha_solicitud=cita.fecha_solicitud,
-        fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-        fecha_confirmada=cita.fecha_confirmada,
-        fecha_completada=cita.fecha_completada,
-        observaciones_alumno=cita.observaciones_alumno,
-        observaciones_personal=cita.observaciones_personal,
-        ubicacion=cita.ubicacion,
-        motivo_psicologico=cita.motivo_psicologico,
-        motivo_academico=cita.motivo_academico,
-        salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-        requiere_seguimiento=cita.requiere_seguimiento,
-        requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-        estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-        fecha_proxima_sesion=cita.fecha_proxima_sesion,
-        ultima_fecha_contacto=cita.ultima_fecha_contacto,
-        fecha_creacion=cita.fecha_creacion,
-        fecha_actualizacion=cita.fecha_actualizacion,
-        alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-        alumno_email=alumno.correo_institucional if alumno else "",
-        alumno_celular=alumno.celular if alumno else None,
-        alumno_matricula=alumno.matricula if alumno else None,
-        personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-        personal_email=personal.correo_institucional if personal else None
+        try:
+            validados = CitaUpdate(
+                **{k: v for k, v in item.items() if k in campos_validados}
+            ).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            resultados.append(ResultadoItemLote(
+                indice=indice, id_cita=cita_id, exito=False,
+                error=str(e.errors()[0].get("msg")) if e.errors() else "Datos inválidos"
+            ))
+            continue
+
+        # Campos fuera de CitaUpdate que existen en la tabla se aplican tal cual
+        valores = {
+            k: v for k, v in item.items()
+            if k in columnas and k not in campos_validados
+        }
+        valores.update(validados)
+        if valores:
+            parametros.append({"id_cita": cita_id, **valores})
+        updated_ids[cita_id] = None
+        resultados.append(ResultadoItemLote(indice=indice, id_cita=cita_id, exito=True))
+
+    rechazados = _actualizar_sin_empalmes(db, parametros)
+    if rechazados:
+        resultados = [
+            ResultadoItemLote(
+                indice=r.indice, id_cita=r.id_cita, exito=False,
+                error=f"El horario se empalma con la cita {rechazados[r.id_cita]}"
+            ) if r.exito and r.id_cita in rechazados else r
+            for r in resultados
+        ]
+        for id_cita in rechazados:
+            updated_ids.pop(id_cita, None)
+    db.commit()
+
+    updated_citas = _cargar_citas(db, list(updated_ids))
+    publicar_cambios_lote(anteriores, updated_citas)
+
+    if detalle:
+        return _resultado_lote(db, resultados, updated_citas)
+    return _citas_to_out(db, updated_citas)
+
+
+# ============================================================================
+# AGENDA: CALENDARIO, DISPONIBILIDAD Y REPROGRAMACIÓN
+# ============================================================================
+
+@router.get("/calendario", response_model=CalendarioCitas)
+def get_calendario_citas(
+    request: Request,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    id_personal: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Obtener las citas con fecha confirmada entre `desde` y `hasta` agrupadas por día.
+    Las citas canceladas no ocupan la agenda y se omiten.
+
+    Hace un solo recorrido por rango sobre el índice de fecha_confirmada
+    (o id_personal + fecha_confirmada) y devuelve solo los campos que necesita
+    la vista de agenda. Por defecto devuelve la semana actual; el rango máximo
+    es de 62 días. Soporta revalidación con ETag / If-None-Match (304).
+    Los alumnos solo ven sus propias citas.
+    """
+    desde = desde or date.today() - timedelta(days=date.today().weekday())
+    hasta = hasta or desde + timedelta(days=6)
+    if hasta < desde or (hasta - desde).days > 62:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El rango de fechas debe ser de 0 a 62 días"
+        )
+
+    query = select(
+        Cita.id_cita, Cita.fecha_confirmada, Cita.estado, Cita.ubicacion,
+        Persona.correo_institucional
+    ).outerjoin(Persona, Persona.id == Cita.id_alumno).where(
+        Cita.fecha_confirmada >= datetime.combine(desde, datetime.min.time()),
+        Cita.fecha_confirmada < datetime.combine(hasta + timedelta(days=1), datetime.min.time()),
+        Cita.estado != EstadoCita.CANCELADA
+    )
+    if id_personal:
+        query = query.where(Cita.id_personal == id_personal)
+    if current_user.rol == "alumno":
+        query = query.where(Cita.id_alumno == current_user.id)
+
+    dias: Dict[date, List[CitaCalendario]] = {}
+    total = 0
+    for id_cita, fecha, estado, ubicacion, correo in db.execute(
+        query.order_by(Cita.fecha_confirmada, Cita.id_cita)
+    ):
+        dias.setdefault(fecha.date(), []).append(CitaCalendario(
+            id_cita=id_cita,
+            hora=fecha.time(),
+            alumno=correo.split('@')[0] if correo else None,
+            estado=estado,
+            ubicacion=ubicacion
+        ))
+        total += 1
+
+    calendario = CalendarioCitas(
+        desde=desde,
+        hasta=hasta,
+        total=total,
+        dias=[DiaCalendario(fecha=dia, citas=citas) for dia, citas in dias.items()]
+    )
+    return respuesta_con_etag(request, calendario)
+
+
+@router.get("/disponibilidad", response_model=List[EspacioDisponible])
+def get_disponibilidad(
+    id_personal: Optional[int] = None,
+    ubicacion: Optional[str] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Obtener los espacios libres para agendar citas, ordenados por fecha.
+
+    El primer elemento es el siguiente espacio disponible. Por defecto se
+    buscan los próximos 7 días; el rango máximo es de 31 días.
+    """
+    fecha_desde = fecha_desde or date.today()
+    fecha_hasta = fecha_hasta or fecha_desde + timedelta(days=7)
+    if fecha_hasta < fecha_desde or (fecha_hasta - fecha_desde).days > 31:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El rango de fechas debe ser de 0 a 31 días"
+        )
+
+    return agenda.espacios_disponibles(
+        db, fecha_desde, fecha_hasta,
+        id_personal=id_personal, ubicacion=ubicacion, limite=limit
+    )
+
+
+@router.get("/disponibilidad/horarios", response_model=List[DisponibilidadOut])
+def get_horarios_disponibilidad(
+    id_personal: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Listar las ventanas semanales de atención registradas.
+    """
+    query = db.query(DisponibilidadPersonal).filter(DisponibilidadPersonal.activo.is_(True))
+    if id_personal:
+        query = query.filter(DisponibilidadPersonal.id_personal == id_personal)
+    return query.order_by(
+        DisponibilidadPersonal.dia_semana, DisponibilidadPersonal.hora_inicio
+    ).all()
+
+
+@router.post("/disponibilidad", response_model=DisponibilidadOut)
+def create_disponibilidad(
+    *,
+    db: Session = Depends(get_db),
+    disponibilidad_in: DisponibilidadCreate,
+    current_user: Principal = Depends(check_administrative_access)
+) -> Any:
+    """
+    Registrar una ventana semanal de atención (solo administradores y coordinadores).
+    """
+    personal = db.query(Persona.id).filter(Persona.id == disponibilidad_in.id_personal).first()
+    if not personal:
+        raise HTTPException(status_code=404, detail="Personal no encontrado")
+
+    disponibilidad = DisponibilidadPersonal(**disponibilidad_in.model_dump())
+    db.add(disponibilidad)
+    db.commit()
+    db.refresh(disponibilidad)
+    return disponibilidad
+
+
+@router.put("/{cita_id}/reprogramar", response_model=CitaOut)
+def reprogramar_cita(
+    *,
+    db: Session = Depends(get_db),
+    cita_id: int,
+    reprogramacion: CitaReprogramar,
+    current_user: Principal = Depends(check_administrative_access)
+) -> Any:
+    """
+    Mover una cita a una nueva fecha (solo administradores y coordinadores).
+
+    La cita queda confirmada en la nueva fecha. Responde 409 si el horario se
+    empalma con otra cita del mismo personal o en la misma ubicación.
+    """
+    cita = db.query(Cita).filter(Cita.id_cita == cita_id).first()
+    if not cita:
+        raise HTTPException(status_code=404, detail="Cita no encontrada")
+    if cita.estado in (EstadoCita.CANCELADA, EstadoCita.COMPLETADA):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede reprogramar una cita cancelada o completada"
+        )
+
+    cita.estado = EstadoCita.CONFIRMADA
+    cita.fecha_confirmada = reprogramacion.fecha_confirmada
+    if reprogramacion.ubicacion is not None:
+        cita.ubicacion = reprogramacion.ubicacion
+    if reprogramacion.id_personal:
+        cita.id_personal = reprogramacion.id_personal
+    elif not cita.id_personal:
+        cita.id_personal = current_user.id
+    if reprogramacion.observaciones_personal is not None:
+        cita.observaciones_personal = reprogramacion.observaciones_personal
+
+    _verificar_empalme(db, cita)
+
+    db.commit()
+    db.refresh(cita)
+
+    return _citas_to_out(db, [cita])[0]
+
+
+# ============================================================================
+# ENDPOINTS CRUD COMPLETOS (fusión con funcionalidad de atenciones)
+# ============================================================================
+
+def _filtrar_citas(
+    query,
+    estado: Optional[EstadoCita] = None,
+    tipo_cita: Optional[TipoCita] = None,
+    id_alumno: Optional[int] = None,
+    id_personal: Optional[int] = None,
+    id_grupo: Optional[int] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None
+):
+    """Aplicar los filtros comunes del listado de citas a una consulta."""
+    if estado:
+        query = query.filter(Cita.estado == estado)
+    if tipo_cita:
+        query = query.filter(Cita.tipo_cita == tipo_cita)
+    if id_alumno:
+        query = query.filter(Cita.id_alumno == id_alumno)
+    if id_personal:
+        query = query.filter(Cita.id_personal == id_personal)
+    if id_grupo:
+        query = query.filter(Cita.id_grupo == id_grupo)
+    if fecha_desde:
+        query = query.filter(Cita.fecha_solicitud >= fecha_desde)
+    if fecha_hasta:
+        query = query.filter(Cita.fecha_solicitud <= fecha_hasta)
+    return query
+
+
+def _despues_de_cursor(query, cursor: str):
+    """
+    Continuar el orden (fecha_solicitud desc, id_cita desc) después del cursor.
+
+    La fecha de referencia se toma de la propia fila del cursor para comparar
+    con el mismo formato almacenado en SQLite; si la fila ya no existe se usa
+    la fecha codificada en el cursor.
+    """
+    valores = decode_cursor(cursor)
+    try:
+        ultimo_id = int(valores["id"])
+        ultima_fecha = datetime.fromisoformat(valores["fecha"]) if valores.get("fecha") else None
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+    fecha_referencia = func.coalesce(
+        select(Cita.fecha_solicitud).where(Cita.id_cita == ultimo_id).scalar_subquery(),
+        ultima_fecha
+    )
+    # Comparación de row values: SQLite la resuelve como rango sobre el índice
+    return query.filter(
+        tuple_(Cita.fecha_solicitud, Cita.id_cita) < tuple_(fecha_referencia, ultimo_id)
+    )
+
+
+@router.get("/", response_model=List[CitaOut])
+async def get_citas(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    estado: Optional[EstadoCita] = None,
+    tipo_cita: Optional[TipoCita] = None,
+    id_alumno: Optional[int] = None,
+    id_personal: Optional[int] = None,
+    id_grupo: Optional[int] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    current_user: Principal = Depends(get_current_active_user_async)
+) -> Any:
+    """
+    Recuperar citas con filtros opcionales.
+
+    Filtros disponibles:
+    - estado: Estado de la cita (pendiente, confirmada, cancelada, completada)
+    - tipo_cita: Tipo de cita (psicologica, academica, general)
+    - id_alumno: ID del alumno
+    - id_personal: ID del personal asignado
+    - id_grupo: ID del grupo
+    - fecha_desde: Fecha de inicio del rango
+    - fecha_hasta: Fecha de fin del rango
+
+    Paginación:
+    - skip/limit: Paginación por desplazamiento (compatibilidad)
+    - cursor: Cursor opaco recibido en la cabecera X-Next-Cursor de la página
+      anterior. Cuando se envía, se ignora skip y la consulta continúa
+      directamente sobre el índice (fecha_solicitud, id_cita).
+    """
+    query = _filtrar_citas(
+        select(Cita), estado, tipo_cita, id_alumno, id_personal,
+        id_grupo, fecha_desde, fecha_hasta
+    )
+
+    if cursor:
+        query = _despues_de_cursor(query, cursor)
+
+    # Ordenar por fecha de solicitud descendente (id_cita desempata)
+    query = query.order_by(Cita.fecha_solicitud.desc(), Cita.id_cita.desc())
+
+    if cursor:
+        citas = (await db.scalars(query.limit(limit))).all()
+    else:
+        citas = (await db.scalars(query.offset(skip).limit(limit))).all()
+
+    # Página completa: puede haber más resultados
+    if citas and len(citas) == limit:
+        ultima = citas[-1]
+        set_next_cursor(response, {
+            "fecha": ultima.fecha_solicitud.isoformat() if ultima.fecha_solicitud else None,
+            "id": ultima.id_cita
+        })
+
+    # Construir respuesta con información de alumno y personal
+    return await _citas_to_out_async(db, citas)
+
+
+# Columnas del export (encabezado CSV / llaves NDJSON)
+_COLUMNAS_EXPORT = (
+    "id_cita", "tipo_cita", "estado", "motivo", "fecha_solicitud",
+    "fecha_confirmada", "fecha_completada", "ubicacion", "id_alumno",
+    "alumno_email", "alumno_matricula", "id_personal", "personal_email",
+    "requiere_seguimiento", "requiere_canalizacion_externa",
+)
+
+# Filas que se leen de la base de datos por cada bloque del stream
+_TAMANO_BLOQUE_EXPORT = 1000
+
+
+def _valor_export(valor: Any) -> Any:
+    if isinstance(valor, (EstadoCita, TipoCita)):
+        return valor.value
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return valor
+
+
+def _filas_export(bind, consulta) -> Iterable[List[Any]]:
+    """
+    Recorrer la consulta por bloques (yield_per) en una sesión propia.
+
+    La sesión de la petición se cierra al terminar el endpoint, antes de que
+    termine de enviarse la respuesta, por eso el generador abre la suya.
+    """
+    with Session(bind=bind) as sesion:
+        resultado = sesion.execute(consulta.execution_options(yield_per=_TAMANO_BLOQUE_EXPORT))
+        for bloque in resultado.partitions():
+            yield [[_valor_export(valor) for valor in fila] for fila in bloque]
+
+
+def _stream_csv(bloques: Iterable[List[Any]]) -> Iterable[str]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(_COLUMNAS_EXPORT)
+    for bloque in bloques:
+        escritor.writerows(bloque)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Encabezado cuando no hay filas
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _stream_ndjson(bloques: Iterable[List[Any]]) -> Iterable[str]:
+    for bloque in bloques:
+        yield "".join(
+            json.dumps(dict(zip(_COLUMNAS_EXPORT, fila)), ensure_ascii=False) + "\n"
+            for fila in bloque
+        )
+
+
+@router.get("/export")
+def export_citas(
+    db: Session = Depends(get_read_db),
+    formato: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    estado: Optional[EstadoCita] = None,
+    tipo_cita: Optional[TipoCita] = None,
+    id_alumno: Optional[int] = None,
+    id_personal: Optional[int] = None,
+    id_grupo: Optional[int] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    current_user: Principal = Depends(check_administrative_access)
+) -> Any:
+    """
+    Exportar citas en CSV o NDJSON (solo administradores y coordinadores).
+
+    Acepta los mismos filtros que GET /citas/. Los datos de alumno y personal
+    se obtienen con JOIN en la misma consulta y las filas se envían por
+    bloques de 1000 conforme se leen, así que la memoria no crece con el
+    número de citas exportadas.
+    """
+    alumno = aliased(Persona)
+    personal = aliased(Persona)
+    consulta = select(
+        Cita.id_cita, Cita.tipo_cita, Cita.estado, Cita.motivo, Cita.fecha_solicitud,
+        Cita.fecha_confirmada, Cita.fecha_completada, Cita.ubicacion, Cita.id_alumno,
+        alumno.correo_institucional, alumno.matricula, Cita.id_personal,
+        personal.correo_institucional, Cita.requiere_seguimiento,
+        Cita.requiere_canalizacion_externa
+    ).outerjoin(
+        alumno, alumno.id == Cita.id_alumno
+    ).outerjoin(
+        personal, personal.id == Cita.id_personal
+    )
+    consulta = _filtrar_citas(
+        consulta, estado, tipo_cita, id_alumno, id_personal,
+        id_grupo, fecha_desde, fecha_hasta
+    ).order_by(Cita.id_cita)
+
+    bloques = _filas_export(db.get_bind(), consulta)
+    nombre = f"citas_{datetime.utcnow():%Y%m%d_%H%M%S}.{formato}"
+    if formato == "csv":
+        contenido, media_type = _stream_csv(bloques), "text/csv; charset=utf-8"
+    else:
+        contenido, media_type = _stream_ndjson(bloques), "application/x-ndjson"
+
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nombre}"'}
     )
 
 
+@router.get("/{cita_id}", response_model=CitaOut)
+def get_cita_by_id(
+    cita_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Obtener una cita específica por ID.
+    """
+    cita = db.query(Cita).filter(Cita.id_cita == cita_id).first()
+    if not cita:
+        raise HTTPException(status_code=404, detail="Cita no encontrada")
+
+    return _citas_to_out(db, [cita])[0]
+
+
 
 @router.post("/", response_model=CitaOut)
 def create_cita(
     *,
     db: Session = Depends(get_db),
     cita_in: CitaCreate,
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Crear una nueva cita (solo administradores y coordinadores).
@@ -528,42 +1241,7 @@ def create_cita(
     db.commit()
     db.refresh(db_cita)
 
-    # Obtener información del alumno
-    alumno = db.query(Persona).filter(Persona.id == db_cita.id_alumno).first() if db_cita.id_alumno else None
-
-    return CitaOut(
-        id_cita=db_cita.id_cita,
-        id_alumno=db_cita.id_alumno,
-        id_personal=db_cita.id_personal,
-        id_grupo=db_cita.id_grupo,
-        id_cuestionario=db_cita.id_cuestionario,
-        tipo_cita=db_cita.tipo_cita,
-        motivo=db_cita.motivo,
-        estado=db_cita.estado,
-        fecha_solicitud=db_cita.fecha_solicitud,
-        fecha_propuesta_alumno=db_cita.fecha_propuesta_alumno,
-        fecha_confirmada=db_cita.fecha_confirmada,
-        fecha_completada=db_cita.fecha_completada,
-        observaciones_alumno=db_cita.observaciones_alumno,
-        observaciones_personal=db_cita.observaciones_personal,
-        ubicacion=db_cita.ubicacion,
-        motivo_psicologico=db_cita.motivo_psicologico,
-        motivo_academico=db_cita.motivo_academico,
-        salud_en_general_vulnerable=db_cita.salud_en_general_vulnerable,
-        requiere_seguimiento=db_cita.requiere_seguimiento,
-        requiere_canalizacion_externa=db_cita.requiere_canalizacion_externa,
-        estatus_canalizacion_externa=db_cita.estatus_canalizacion_externa,
-        fecha_proxima_sesion=db_cita.fecha_proxima_sesion,
-        ultima_fecha_contacto=db_cita.ultima_fecha_contacto,
-        fecha_creacion=db_cita.fecha_creacion,
-        fecha_actualizacion=db_cita.fecha_actualizacion,
-        alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-        alumno_email=alumno.correo_institucional if alumno else "",
-        alumno_celular=alumno.celular if alumno else None,
-        alumno_matricula=alumno.matricula if alumno else None,
-        personal_nombre=None,
-        personal_email=None
-    )
+    return _citas_to_out(db, [db_cita])[0]
 
 
 @router.put("/{cita_id}", response_model=CitaOut)
@@ -572,7 +1250,7 @@ def update_cita(
     db: Session = Depends(get_db),
     cita_id: int,
     cita_in: CitaUpdate,
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Actualizar una cita (solo administradores y coordinadores).
@@ -595,47 +1273,13 @@ def update_cita(
     for field, value in update_data.items():
         setattr(cita, field, value)
 
+    _verificar_empalme(db, cita)
+
     db.add(cita)
     db.commit()
     db.refresh(cita)
 
-    # Obtener información del alumno y personal
-    alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-    personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
-
-    return CitaOut(
-        id_cita=cita.id_cita,
-        id_alumno=cita.id_alumno,
-        id_personal=cita.id_personal,
-        id_grupo=cita.id_grupo,
-        id_cuestionario=cita.id_cuestionario,
-        tipo_cita=cita.tipo_cita,
-        motivo=cita.motivo,
-        estado=cita.estado,
-        fecha_solicitud=cita.fecha_solicitud,
-        fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-        fecha_confirmada=cita.fecha_confirmada,
-        fecha_completada=cita.fecha_completada,
-        observaciones_alumno=cita.observaciones_alumno,
-        observaciones_personal=cita.observaciones_personal,
-        ubicacion=cita.ubicacion,
-        motivo_psicologico=cita.motivo_psicologico,
-        motivo_academico=cita.motivo_academico,
-        salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-        requiere_seguimiento=cita.requiere_seguimiento,
-        requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-        estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-        fecha_proxima_sesion=cita.fecha_proxima_sesion,
-        ultima_fecha_contacto=cita.ultima_fecha_contacto,
-        fecha_creacion=cita.fecha_creacion,
-        fecha_actualizacion=cita.fecha_actualizacion,
-        alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-        alumno_email=alumno.correo_institucional if alumno else "",
-        alumno_celular=alumno.celular if alumno else None,
-        alumno_matricula=alumno.matricula if alumno else None,
-        personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-        personal_email=personal.correo_institucional if personal else None
-    )
+    return _citas_to_out(db, [cita])[0]
 
 
 @router.delete("/{cita_id}", response_model=CitaOut)
@@ -643,7 +1287,7 @@ def delete_cita(
     *,
     db: Session = Depends(get_db),
     cita_id: int,
-    current_user: Persona = Depends(check_deletion_permission)
+    current_user: Principal = Depends(check_deletion_permission)
 ) -> Any:
     """
     Eliminar una cita (solo administradores - coordinadores NO pueden eliminar).
@@ -653,42 +1297,7 @@ def delete_cita(
         raise HTTPException(status_code=404, detail="Cita no encontrada")
 
     # Guardar información antes de eliminar
-    alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-    personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
-
-    cita_out = CitaOut(
-        id_cita=cita.id_cita,
-        id_alumno=cita.id_alumno,
-        id_personal=cita.id_personal,
-        id_grupo=cita.id_grupo,
-        id_cuestionario=cita.id_cuestionario,
-        tipo_cita=cita.tipo_cita,
-        motivo=cita.motivo,
-        estado=cita.estado,
-        fecha_solicitud=cita.fecha_solicitud,
-        fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-        fecha_confirmada=cita.fecha_confirmada,
-        fecha_completada=cita.fecha_completada,
-        observaciones_alumno=cita.observaciones_alumno,
-        observaciones_personal=cita.observaciones_personal,
-        ubicacion=cita.ubicacion,
-        motivo_psicologico=cita.motivo_psicologico,
-        motivo_academico=cita.motivo_academico,
-        salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-        requiere_seguimiento=cita.requiere_seguimiento,
-        requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-        estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-        fecha_proxima_sesion=cita.fecha_proxima_sesion,
-        ultima_fecha_contacto=cita.ultima_fecha_contacto,
-        fecha_creacion=cita.fecha_creacion,
-        fecha_actualizacion=cita.fecha_actualizacion,
-        alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-        alumno_email=alumno.correo_institucional if alumno else "",
-        alumno_celular=alumno.celular if alumno else None,
-        alumno_matricula=alumno.matricula if alumno else None,
-        personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-        personal_email=personal.correo_institucional if personal else None
-    )
+    cita_out = _citas_to_out(db, [cita])[0]
 
     db.delete(cita)
     db.commit()
@@ -699,223 +1308,106 @@ def delete_cita(
 @router.get("/search/", response_model=List[CitaOut])
 def search_citas(
     *,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
-    current_user: Persona = Depends(get_current_active_user)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Buscar citas por texto en varios campos.
 
     Busca en: motivo, observaciones_alumno, observaciones_personal,
     estatus_canalizacion_externa.
+
+    Usa el índice FTS5 (resultados ordenados por relevancia bm25, sin
+    distinguir acentos ni mayúsculas) y LIKE si el índice no está disponible.
+    La siguiente página se obtiene con el cursor de la cabecera X-Next-Cursor.
     """
     if not q:
         return []
 
-    citas = db.query(Cita).filter(
+    expresion = expresion_fts(q)
+    if expresion and fts_citas_disponible(db):
+        citas = _buscar_citas_fts(response, db, expresion, limit, cursor)
+    else:
+        citas = _buscar_citas_like(response, db, q, limit, cursor)
+
+    # Construir respuesta
+    return _citas_to_out(db, citas)
+
+
+def _buscar_citas_fts(
+    response: Response,
+    db: Session,
+    expresion: str,
+    limit: int,
+    cursor: Optional[str]
+) -> List[Cita]:
+    """Búsqueda rankeada sobre citas_fts; el cursor es (puntaje bm25, id_cita)."""
+    coincidencias = text(
+        "SELECT rowid AS id_cita, bm25(citas_fts) AS puntaje "
+        "FROM citas_fts WHERE citas_fts MATCH :expresion"
+    ).bindparams(expresion=expresion).columns(
+        id_cita=Integer, puntaje=Float
+    ).subquery("coincidencias")
+
+    query = db.query(Cita, coincidencias.c.puntaje).join(
+        coincidencias, coincidencias.c.id_cita == Cita.id_cita
+    )
+
+    if cursor:
+        valores = decode_cursor(cursor)
+        try:
+            ultimo = (float(valores["puntaje"]), int(valores["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido"
+            )
+        query = query.filter(tuple_(coincidencias.c.puntaje, Cita.id_cita) > tuple_(*ultimo))
+
+    # bm25 devuelve valores menores para los documentos más relevantes
+    filas = query.order_by(coincidencias.c.puntaje, Cita.id_cita).limit(limit).all()
+
+    if filas and len(filas) == limit:
+        ultima_cita, ultimo_puntaje = filas[-1]
+        set_next_cursor(response, {"puntaje": ultimo_puntaje, "id": ultima_cita.id_cita})
+
+    return [cita for cita, _ in filas]
+
+
+def _buscar_citas_like(
+    response: Response,
+    db: Session,
+    q: str,
+    limit: int,
+    cursor: Optional[str]
+) -> List[Cita]:
+    """Búsqueda de respaldo con LIKE, paginada por id_cita descendente."""
+    query = db.query(Cita).filter(
         or_(
             Cita.motivo.contains(q),
             Cita.observaciones_alumno.contains(q),
             Cita.observaciones_personal.contains(q),
             Cita.estatus_canalizacion_externa.contains(q)
         )
-    ).all()
-
-    # Construir respuesta
-    resultado = []
-    for cita in citas:
-        alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-        personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
-
-        resultado.append(CitaOut(
-            id_cita=cita.id_cita,
-            id_alumno=cita.id_alumno,
-            id_personal=cita.id_personal,
-            id_grupo=cita.id_grupo,
-            id_cuestionario=cita.id_cuestionario,
-            tipo_cita=cita.tipo_cita,
-            motivo=cita.motivo,
-            estado=cita.estado,
-            fecha_solicitud=cita.fecha_solicitud,
-            fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-            fecha_confirmada=cita.fecha_confirmada,
-            fecha_completada=cita.fecha_completada,
-            observaciones_alumno=cita.observaciones_alumno,
-            observaciones_personal=cita.observaciones_personal,
-            ubicacion=cita.ubicacion,
-            motivo_psicologico=cita.motivo_psicologico,
-            motivo_academico=cita.motivo_academico,
-            salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-            requiere_seguimiento=cita.requiere_seguimiento,
-            requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-            estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-            fecha_proxima_sesion=cita.fecha_proxima_sesion,
-            ultima_fecha_contacto=cita.ultima_fecha_contacto,
-            fecha_creacion=cita.fecha_creacion,
-            fecha_actualizacion=cita.fecha_actualizacion,
-            alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-            alumno_email=alumno.correo_institucional if alumno else "",
-            alumno_celular=alumno.celular if alumno else None,
-            alumno_matricula=alumno.matricula if alumno else None,
-            personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-            personal_email=personal.correo_institucional if personal else None
-        ))
-
-    return resultado
-
-
-@router.post("/bulk-create", response_model=List[CitaOut])
-def bulk_create_citas(
-    *,
-    db: Session = Depends(get_db),
-    bulk_citas: CitaBulkCreate,
-    current_user: Persona = Depends(check_admin_role)
-) -> Any:
-    """
-    Crear múltiples citas en una sola operación (solo administradores).
-    """
-    created_citas = []
-
-    for cita_data in bulk_citas.items:
-        db_cita = Cita(
-            id_alumno=cita_data.id_alumno,
-            id_personal=cita_data.id_personal,
-            id_grupo=cita_data.id_grupo,
-            id_cuestionario=cita_data.id_cuestionario,
-            tipo_cita=cita_data.tipo_cita,
-            motivo=cita_data.motivo,
-            fecha_propuesta_alumno=cita_data.fecha_propuesta_alumno,
-            observaciones_alumno=cita_data.observaciones_alumno,
-            estado=EstadoCita.PENDIENTE
-        )
-        db.add(db_cita)
-        created_citas.append(db_cita)
-
-    db.commit()
-
-    # Refrescar todos los objetos
-    for cita in created_citas:
-        db.refresh(cita)
-
-    # Construir respuesta
-    resultado = []
-    for cita in created_citas:
-        alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-        personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
-
-        resultado.append(CitaOut(
-            id_cita=cita.id_cita,
-            id_alumno=cita.id_alumno,
-            id_personal=cita.id_personal,
-            id_grupo=cita.id_grupo,
-            id_cuestionario=cita.id_cuestionario,
-            tipo_cita=cita.tipo_cita,
-            motivo=cita.motivo,
-            estado=cita.estado,
-            fecha_solicitud=cita.fecha_solicitud,
-            fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-            fecha_confirmada=cita.fecha_confirmada,
-            fecha_completada=cita.fecha_completada,
-            observaciones_alumno=cita.observaciones_alumno,
-            observaciones_personal=cita.observaciones_personal,
-            ubicacion=cita.ubicacion,
-            motivo_psicologico=cita.motivo_psicologico,
-            motivo_academico=cita.motivo_academico,
-            salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-            requiere_seguimiento=cita.requiere_seguimiento,
-            requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-            estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-            fecha_proxima_sesion=cita.fecha_proxima_sesion,
-            ultima_fecha_contacto=cita.ultima_fecha_contacto,
-            fecha_creacion=cita.fecha_creacion,
-            fecha_actualizacion=cita.fecha_actualizacion,
-            alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-            alumno_email=alumno.correo_institucional if alumno else "",
-            alumno_celular=alumno.celular if alumno else None,
-            alumno_matricula=alumno.matricula if alumno else None,
-            personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-            personal_email=personal.correo_institucional if personal else None
-        ))
-
-    return resultado
-
-
-@router.put("/bulk-update", response_model=List[CitaOut])
-def bulk_update_citas(
-    *,
-    db: Session = Depends(get_db),
-    bulk_update: CitaBulkUpdate,
-    current_user: Persona = Depends(check_admin_role)
-) -> Any:
-    """
-    Actualizar múltiples citas en una sola operación (solo administradores).
-    """
-    updated_citas = []
-
-    for item in bulk_update.items:
-        if "id_cita" not in item:
-            continue
-
-        cita_id = item.pop("id_cita")
-        cita = db.query(Cita).filter(Cita.id_cita == cita_id).first()
-
-        if not cita:
-            continue
-
-        # Actualizar campos
-        for field, value in item.items():
-            if hasattr(cita, field):
-                setattr(cita, field, value)
-
-        db.add(cita)
-        updated_citas.append(cita)
-
-    db.commit()
-
-    # Refrescar todos los objetos
-    for cita in updated_citas:
-        db.refresh(cita)
-
-    # Construir respuesta
-    resultado = []
-    for cita in updated_citas:
-        alumno = db.query(Persona).filter(Persona.id == cita.id_alumno).first()
-        personal = db.query(Persona).filter(Persona.id == cita.id_personal).first() if cita.id_personal else None
+    )
 
-        resultado.append(CitaOut(
-            id_cita=cita.id_cita,
-            id_alumno=cita.id_alumno,
-            id_personal=cita.id_personal,
-            id_grupo=cita.id_grupo,
-            id_cuestionario=cita.id_cuestionario,
-            tipo_cita=cita.tipo_cita,
-            motivo=cita.motivo,
-            estado=cita.estado,
-            fecha_solicitud=cita.fecha_solicitud,
-            fecha_propuesta_alumno=cita.fecha_propuesta_alumno,
-            fecha_confirmada=cita.fecha_confirmada,
-            fecha_completada=cita.fecha_completada,
-            observaciones_alumno=cita.observaciones_alumno,
-            observaciones_personal=cita.observaciones_personal,
-            ubicacion=cita.ubicacion,
-            motivo_psicologico=cita.motivo_psicologico,
-            motivo_academico=cita.motivo_academico,
-            salud_en_general_vulnerable=cita.salud_en_general_vulnerable,
-            requiere_seguimiento=cita.requiere_seguimiento,
-            requiere_canalizacion_externa=cita.requiere_canalizacion_externa,
-            estatus_canalizacion_externa=cita.estatus_canalizacion_externa,
-            fecha_proxima_sesion=cita.fecha_proxima_sesion,
-            ultima_fecha_contacto=cita.ultima_fecha_contacto,
-            fecha_creacion=cita.fecha_creacion,
-            fecha_actualizacion=cita.fecha_actualizacion,
-            alumno_nombre=alumno.correo_institucional.split('@')[0] if alumno else "Desconocido",
-            alumno_email=alumno.correo_institucional if alumno else "",
-            alumno_celular=alumno.celular if alumno else None,
-            alumno_matricula=alumno.matricula if alumno else None,
-            personal_nombre=personal.correo_institucional.split('@')[0] if personal else None,
-            personal_email=personal.correo_institucional if personal else None
-        ))
+    if cursor:
+        valores = decode_cursor(cursor)
+        try:
+            query = query.filter(Cita.id_cita < int(valores["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido"
+            )
 
-    return resultado
+    citas = query.order_by(Cita.id_cita.desc()).limit(limit).all()
 
+    if citas and len(citas) == limit:
+        set_next_cursor(response, {"id": citas[-1].id_cita})
 
+    return citas
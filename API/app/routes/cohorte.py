@@ -5,9 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.cohorte import Cohorte
 from app.models.persona import Persona
+from app.services.principales import Principal
 from app.schemas.cohorte import (
     CohorteCreate,
     CohorteUpdate,
@@ -26,7 +27,7 @@ def create_cohorte(
     *,
     db: Session = Depends(get_db),
     cohorte_in: CohorteCreate,
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Crear una nueva cohorte (solo administradores y coordinadores).
@@ -45,11 +46,11 @@ def create_cohorte(
 
 @router.get("/", response_model=List[CohorteOut])
 def read_cohortes(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     activo: Optional[bool] = None,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Recuperar cohortes con filtros opcionales.
@@ -69,8 +70,8 @@ def read_cohortes(
 
 @router.get("/activas/", response_model=List[CohorteOut])
 def read_cohortes_activas(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Recuperar solo cohortes activas para formularios.
@@ -85,7 +86,7 @@ def read_cohortes_activas(
 @router.get("/generar-opciones/", response_model=List[CohorteOut])
 def generar_opciones_cohortes(
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Generar automáticamente opciones de cohortes desde años pasados hasta futuros (solo administradores y coordinadores).
@@ -121,9 +122,9 @@ def generar_opciones_cohortes(
 @router.get("/search/", response_model=List[CohorteOut])
 def search_cohortes(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=1),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Buscar cohortes por texto en varios campos.
@@ -146,7 +147,7 @@ def read_cohorte(
     *,
     db: Session = Depends(get_db),
     cohorte_id: int,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener una cohorte por ID.
@@ -163,7 +164,7 @@ def update_cohorte(
     db: Session = Depends(get_db),
     cohorte_id: int,
     cohorte_in: CohorteUpdate,
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Actualizar una cohorte (solo administradores y coordinadores).
@@ -193,7 +194,7 @@ def delete_cohorte(
     *,
     db: Session = Depends(get_db),
     cohorte_id: int,
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Eliminar una cohorte (solo administradores y coordinadores).
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.contacto_emergencia import ContactoEmergencia
 from app.models.persona import Persona
 from app.schemas.contacto_emergencia import (
@@ -64,7 +64,7 @@ def create_contacto_emergencia(
 
 @router.get("/", response_model=List[ContactoEmergenciaOut])
 def read_contactos_emergencia(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     id_persona: Optional[int] = None,
@@ -284,7 +284,7 @@ def bulk_delete_contactos_emergencia(
 @router.get("/search/", response_model=List[ContactoEmergenciaOut])
 def search_contactos_emergencia(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.cuestionario import Cuestionario
 from app.schemas.cuestionario import (
     CuestionarioCreate, 
@@ -48,7 +48,7 @@ def create_cuestionario(
 
 @router.get("/", response_model=List[CuestionarioOut])
 def read_cuestionarios(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(get_current_active_user)
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.persona import Persona
 from app.models.cuestionario import Cuestionario
 from app.schemas.cuestionario import (
@@ -17,6 +17,7 @@ from app.schemas.cuestionario import (
 )
 from app.utils.deps import get_current_active_user
 from app.services.ai_service import ai_service
+from app.services.principales import Principal
 
 router = APIRouter()
 
@@ -30,7 +31,7 @@ PREGUNTAS_CUESTIONARIO = {
 
 @router.get("/preguntas")
 def get_preguntas_cuestionario(
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict[str, str]:
     """
     Obtener las preguntas del cuestionario psicopedagógico.
@@ -43,7 +44,7 @@ def get_preguntas_cuestionario(
 def completar_cuestionario(
     cuestionario_data: CuestionarioPsicopedagogicoCreate,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Completar el cuestionario psicopedagógico.
@@ -136,7 +137,7 @@ def completar_cuestionario(
 def get_cuestionario_estudiante(
     persona_id: int,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener el estado del cuestionario de un estudiante.
@@ -176,7 +177,7 @@ def get_cuestionario_estudiante(
 def get_reporte_cuestionario(
     persona_id: int,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener el reporte completo del cuestionario psicopedagógico.
@@ -214,8 +215,8 @@ def get_reporte_cuestionario(
 
 @router.get("/reportes", response_model=List[CuestionarioPsicopedagogicoOut])
 def get_todos_los_reportes(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user),
     skip: int = 0,
     limit: int = 100
 ) -> Any:
@@ -251,8 +252,8 @@ def get_todos_los_reportes(
 
 @router.get("/estudiantes-con-cuestionarios")
 def get_estudiantes_con_cuestionarios(
-    db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> List[Dict[str, Any]]:
     """
     Obtener lista de estudiantes que han completado cuestionarios psicopedagógicos.
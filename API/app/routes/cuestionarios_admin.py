@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_, and_, func
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.cuestionario_admin import (
     CuestionarioAdmin, 
     Pregunta, 
@@ -16,7 +16,6 @@ from app.models.cuestionario_admin import (
     TipoUsuario,
     EstadoCuestionario
 )
-from app.models.persona import Persona
 from app.schemas.cuestionario_admin import (
     CuestionarioAdminCreate,
     CuestionarioAdminUpdate,
@@ -29,6 +28,7 @@ from app.schemas.cuestionario_admin import (
     PreguntaOut,
     RespuestaCuestionarioOut
 )
+from app.services.principales import Principal
 from app.utils.deps import (
     get_current_active_user,
     check_admin_or_coordinador_role
@@ -40,7 +40,7 @@ router = APIRouter(prefix="/cuestionarios-admin", tags=["cuestionarios-admin"])
 @router.get("/", response_model=CuestionariosPaginados)
 def get_cuestionarios(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     titulo: Optional[str] = Query(None, description="Filtrar por título"),
     estado: Optional[EstadoCuestionario] = Query(None, description="Filtrar por estado"),
     tipo_usuario: Optional[TipoUsuario] = Query(None, description="Filtrar por tipo de usuario asignado"),
@@ -49,7 +49,7 @@ def get_cuestionarios(
     creado_por: Optional[int] = Query(None, description="Filtrar por creador"),
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros"),
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Obtener lista de cuestionarios administrativos con filtros y paginación.
@@ -126,7 +126,7 @@ def get_cuestionario(
     *,
     db: Session = Depends(get_db),
     cuestionario_id: str,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Obtener un cuestionario específico por ID.
@@ -170,7 +170,7 @@ def create_cuestionario(
     *,
     db: Session = Depends(get_db),
     cuestionario_in: CuestionarioAdminCreate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Crear un nuevo cuestionario administrativo.
@@ -253,7 +253,7 @@ def update_cuestionario(
     db: Session = Depends(get_db),
     cuestionario_id: str,
     cuestionario_in: CuestionarioAdminUpdate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Actualizar un cuestionario administrativo existente.
@@ -354,7 +354,7 @@ def delete_cuestionario(
     *,
     db: Session = Depends(get_db),
     cuestionario_id: str,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Eliminar un cuestionario administrativo.
@@ -402,7 +402,7 @@ def duplicate_cuestionario(
     db: Session = Depends(get_db),
     cuestionario_id: str,
     duplicate_data: CuestionarioDuplicate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Duplicar un cuestionario administrativo existente.
@@ -496,7 +496,7 @@ def cambiar_estado_cuestionario(
     db: Session = Depends(get_db),
     cuestionario_id: str,
     estado_update: CuestionarioEstadoUpdate,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Cambiar el estado de un cuestionario (activar/desactivar/borrador).
@@ -570,7 +570,7 @@ def bulk_delete_cuestionarios(
     *,
     db: Session = Depends(get_db),
     bulk_delete: CuestionarioBulkDelete,
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Eliminar múltiples cuestionarios en una sola operación.
@@ -624,7 +624,7 @@ def bulk_delete_cuestionarios(
 @router.get("/respuestas/todas")
 def get_todas_las_respuestas(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     cuestionario_id: Optional[str] = Query(None, description="Filtrar por cuestionario específico"),
     usuario_id: Optional[int] = Query(None, description="Filtrar por usuario específico"),
     estado: Optional[str] = Query(None, description="Filtrar por estado (pendiente, en_progreso, completado)"),
@@ -632,7 +632,7 @@ def get_todas_las_respuestas(
     fecha_hasta: Optional[datetime] = Query(None, description="Filtrar hasta fecha"),
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(50, ge=1, le=100, description="Número máximo de registros"),
-    current_user: Persona = Depends(check_admin_or_coordinador_role)
+    current_user: Principal = Depends(check_admin_or_coordinador_role)
 ) -> Any:
     """
     Obtener todas las respuestas de cuestionarios administrativos con filtros.
@@ -3,10 +3,11 @@ import uuid
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, select
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.models.cuestionario_admin import (
     CuestionarioAdmin,
     Pregunta,
@@ -16,7 +17,6 @@ from app.models.cuestionario_admin import (
     TipoUsuario,
     EstadoCuestionario
 )
-from app.models.persona import Persona
 from app.schemas.cuestionario_admin import (
     CuestionarioAdminOut,
     RespuestaCuestionarioCreate,
@@ -24,7 +24,8 @@ from app.schemas.cuestionario_admin import (
     RespuestaCuestionarioOut,
     PreguntaOut
 )
-from app.utils.deps import get_current_active_user
+from app.services.principales import Principal
+from app.utils.deps import get_current_active_user, get_current_active_user_async
 
 router = APIRouter(prefix="/cuestionarios-usuario", tags=["cuestionarios-usuario"])
 
@@ -41,14 +42,45 @@ def get_tipo_usuario_from_rol(rol: str) -> TipoUsuario:
         raise ValueError(f"Rol no válido para cuestionarios: {rol}")
 
 
+def consulta_cuestionarios_asignados(tipo_usuario: TipoUsuario, ahora: datetime):
+    """
+    Cuestionarios activos asignados a un tipo de usuario y vigentes en `ahora`,
+    del más reciente al más antiguo.
+
+    Las colecciones que usan total_preguntas, total_respuestas y
+    tipos_usuario_asignados se cargan por adelantado (sin lazy load en async).
+    """
+    return select(CuestionarioAdmin).join(
+        AsignacionCuestionario,
+        CuestionarioAdmin.id == AsignacionCuestionario.cuestionario_id
+    ).where(
+        AsignacionCuestionario.tipo_usuario == tipo_usuario,
+        CuestionarioAdmin.estado == EstadoCuestionario.ACTIVO,
+        # Filtrar por fechas de disponibilidad
+        or_(
+            CuestionarioAdmin.fecha_inicio.is_(None),
+            CuestionarioAdmin.fecha_inicio <= ahora
+        ),
+        or_(
+            CuestionarioAdmin.fecha_fin.is_(None),
+            CuestionarioAdmin.fecha_fin >= ahora
+        )
+    ).options(
+        selectinload(CuestionarioAdmin.preguntas),
+        selectinload(CuestionarioAdmin.respuestas),
+        selectinload(CuestionarioAdmin.asignaciones),
+        joinedload(CuestionarioAdmin.creador)
+    ).order_by(CuestionarioAdmin.created_at.desc())
+
+
 @router.get("/asignados")
-def get_cuestionarios_asignados(
+async def get_cuestionarios_asignados(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     estado: Optional[str] = Query(None, description="Filtrar por estado de respuesta"),
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=50, description="Número máximo de registros"),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user_async)
 ) -> Any:
     """
     Obtener cuestionarios asignados al usuario actual según su rol.
@@ -63,41 +95,19 @@ def get_cuestionarios_asignados(
         )
 
     # Obtener cuestionarios asignados al tipo de usuario
-    query = db.query(CuestionarioAdmin).join(
-        AsignacionCuestionario,
-        CuestionarioAdmin.id == AsignacionCuestionario.cuestionario_id
-    ).filter(
-        AsignacionCuestionario.tipo_usuario == tipo_usuario,
-        CuestionarioAdmin.estado == EstadoCuestionario.ACTIVO
-    ).options(
-        joinedload(CuestionarioAdmin.preguntas),
-        joinedload(CuestionarioAdmin.creador)
-    )
-
-    # Filtrar por fechas de disponibilidad
-    now = datetime.utcnow()
-    query = query.filter(
-        or_(
-            CuestionarioAdmin.fecha_inicio.is_(None),
-            CuestionarioAdmin.fecha_inicio <= now
-        ),
-        or_(
-            CuestionarioAdmin.fecha_fin.is_(None),
-            CuestionarioAdmin.fecha_fin >= now
-        )
-    )
-
-    cuestionarios = query.order_by(CuestionarioAdmin.created_at.desc()).offset(skip).limit(limit).all()
+    cuestionarios = (await db.scalars(
+        consulta_cuestionarios_asignados(tipo_usuario, datetime.utcnow()).offset(skip).limit(limit)
+    )).all()
 
     # Obtener respuestas del usuario para estos cuestionarios
     cuestionarios_ids = [c.id for c in cuestionarios]
     respuestas_usuario = {}
     
     if cuestionarios_ids:
-        respuestas = db.query(RespuestaCuestionario).filter(
+        respuestas = (await db.scalars(select(RespuestaCuestionario).where(
             RespuestaCuestionario.cuestionario_id.in_(cuestionarios_ids),
             RespuestaCuestionario.usuario_id == current_user.id
-        ).all()
+        ))).all()
         
         for respuesta in respuestas:
             respuestas_usuario[respuesta.cuestionario_id] = respuesta
@@ -193,7 +203,7 @@ def get_cuestionario_para_responder(
     *,
     db: Session = Depends(get_db),
     cuestionario_id: str,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener un cuestionario específico para responder, incluyendo preguntas y respuestas previas.
@@ -325,7 +335,7 @@ def guardar_respuesta_cuestionario(
     db: Session = Depends(get_db),
     cuestionario_id: str,
     respuesta_data: RespuestaCuestionarioCreate,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Guardar o actualizar respuestas a un cuestionario.
@@ -441,7 +451,7 @@ def get_mi_respuesta(
     *,
     db: Session = Depends(get_db),
     cuestionario_id: str,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener la respuesta del usuario actual a un cuestionario específico.
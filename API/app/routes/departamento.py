@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.departamento import Departamento
 from app.schemas.departamento import (
     DepartamentoCreate,
@@ -63,7 +63,7 @@ def create_departamento(
 
 @router.get("/publico/", response_model=List[DepartamentoOut])
 def read_departamentos_publico(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Any:
     """
     Recuperar todos los departamentos activos (endpoint público sin autenticación).
@@ -83,7 +83,7 @@ def read_departamentos_publico(
 
 @router.get("/", response_model=List[DepartamentoOut])
 def read_departamentos(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(get_current_active_user)
@@ -310,7 +310,7 @@ def bulk_delete_departamentos(
 @router.get("/search/", response_model=List[DepartamentoOut])
 def search_departamentos(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
     current_user = Depends(get_current_active_user)
 ) -> Any:
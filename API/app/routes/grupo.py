@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.grupo import Grupo
 from app.schemas.grupo import (
     GrupoCreate, 
@@ -51,7 +51,7 @@ def create_grupo(
 
 @router.get("/", response_model=List[GrupoOut])
 def read_grupos(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     tipo_grupo: Optional[str] = None,
@@ -235,7 +235,7 @@ def bulk_delete_grupos(
 @router.get("/search/", response_model=List[GrupoOut])
 def search_grupos(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
     current_user = Depends(get_current_active_user)
 ) -> Any:
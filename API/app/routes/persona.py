@@ -1,12 +1,18 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from sqlalchemy import and_, or_, select, text
 import logging
+import re
 
-from app.core.security import get_password_hash
-from app.db.database import get_db
+from app.core.hashing import hash_password_sync
+from app.db.database import get_async_db, get_db, get_read_db
+from app.db.fts import (
+    expresion_fts, fts_personas_disponible, identificador_normalizado, normalizar_identificador
+)
+from app.models.associations import persona_programa
 from app.models.persona import Persona
 from app.models.programa_educativo import ProgramaEducativo
 from app.models.grupo import Grupo
@@ -19,16 +25,25 @@ from app.schemas.persona import (
     PersonaOut,
     PersonaBulkDelete,
     PersonaBulkCreate,
-    PersonaBulkUpdate
+    PersonaBulkUpdate,
+    PersonaImportacion,
+    EstadoImportacion,
+    PersonaValidacionLote
 )
 from app.utils.deps import (
     get_current_active_user,
+    get_current_active_user_async,
+    get_current_persona,
     check_admin_role,
     check_administrative_access,
     check_admin_or_coordinador_role,  # DEPRECATED
     check_deletion_permission
 )
 from app.middleware.rate_limit import registro_rate_limiter
+from app.services.disponibilidad import disponibilidad
+from app.services.importacion import iniciar_importacion, obtener_trabajo
+from app.services.principales import Principal
+from app.utils.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter(prefix="/personas", tags=["personas"])
 
@@ -43,9 +58,12 @@ def validate_email(
 ) -> Any:
     """
     Validar si un correo electrónico ya está en uso.
+
+    Los correos libres se responden desde el filtro en memoria
+    (app/services/disponibilidad.py) sin consultar la base de datos; los
+    demás se confirman con una consulta puntual.
     """
-    db_persona = db.query(Persona).filter(Persona.correo_institucional == email).first()
-    return {"available": db_persona is None}
+    return {"available": disponibilidad.disponible(db, "correo", email)}
 
 
 @router.get("/validate-matricula/{matricula}")
@@ -59,8 +77,30 @@ def validate_matricula(
     if not matricula or matricula.strip() == "":
         return {"available": False, "message": "La matrícula es obligatoria"}
 
-    db_persona = db.query(Persona).filter(Persona.matricula == matricula.strip()).first()
-    return {"available": db_persona is None}
+    return {"available": disponibilidad.disponible(db, "matricula", matricula.strip())}
+
+
+@router.post("/validate-batch")
+def validate_batch(
+    validacion: PersonaValidacionLote,
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Validar varios correos y matrículas en una sola llamada.
+
+    Respuesta: {"emails": {correo: disponible}, "matriculas": {matrícula: disponible}}.
+    Las matrículas se comparan sin espacios al inicio ni al final y una
+    matrícula vacía nunca está disponible (igual que /validate-matricula).
+    """
+    matriculas = {matricula: matricula.strip() for matricula in validacion.matriculas}
+    libres = disponibilidad.disponibles(db, "matricula", [m for m in matriculas.values() if m])
+    return {
+        "emails": disponibilidad.disponibles(db, "correo", validacion.emails),
+        "matriculas": {
+            matricula: bool(limpia) and libres[limpia]
+            for matricula, limpia in matriculas.items()
+        },
+    }
 
 
 @router.post("/registro-alumno/", response_model=PersonaOut)
@@ -132,7 +172,7 @@ def registro_usuario(
         rol=persona_in.rol,  # SEGURIDAD: Usar rol validado del schema
         cohorte_ano=persona_in.cohorte_ano if persona_in.rol == "alumno" else None,
         cohorte_periodo=persona_in.cohorte_periodo if persona_in.rol == "alumno" else None,
-        hashed_password=get_password_hash(persona_in.password),
+        hashed_password=hash_password_sync(persona_in.password),
         is_active=is_active
     )
 
@@ -150,7 +190,7 @@ def registro_usuario(
 def get_mi_perfil(
     *,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Persona = Depends(get_current_persona)
 ) -> Any:
     """
     Obtener el perfil del usuario actual (para alumnos).
@@ -163,7 +203,7 @@ def update_mi_perfil(
     *,
     db: Session = Depends(get_db),
     persona_in: PersonaUpdate,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Persona = Depends(get_current_persona)
 ) -> Any:
     """
     Actualizar el perfil del usuario actual (para alumnos).
@@ -182,7 +222,7 @@ def update_mi_perfil(
     for field, value in persona_in.dict(exclude_unset=True).items():
         if field in allowed_fields and value is not None:
             if field == 'password':
-                update_data['hashed_password'] = get_password_hash(value)
+                update_data['hashed_password'] = hash_password_sync(value)
             else:
                 update_data[field] = value
 
@@ -202,7 +242,7 @@ def create_persona(
     *,
     db: Session = Depends(get_db),
     persona_in: PersonaCreate,
-    current_user: Persona = Depends(check_administrative_access)
+    current_user: Principal = Depends(check_administrative_access)
 ) -> Any:
     """
     Crear una nueva persona (solo administradores y coordinadores).
@@ -242,7 +282,7 @@ def create_persona(
         rol=persona_in.rol,
         cohorte_ano=persona_in.cohorte_ano,  # Año de cohorte
         cohorte_periodo=persona_in.cohorte_periodo,  # Período de cohorte
-        hashed_password=get_password_hash(persona_in.password)
+        hashed_password=hash_password_sync(persona_in.password)
     )
 
     # Agregar programas educativos
@@ -265,67 +305,126 @@ def create_persona(
     return db_persona
 
 
+def _persona_directorio(persona: Persona) -> dict:
+    """Fila del directorio de personas (programas y grupos ya cargados)."""
+    # Normalizar estado_civil si es necesario
+    estado_civil_normalizado = persona.estado_civil
+    if estado_civil_normalizado not in ['soltero', 'soltera', 'casado', 'casada', 'divorciado', 'divorciada', 'viudo', 'viuda', 'union_libre', 'otro']:
+        estado_civil_normalizado = 'soltero'
+
+    return {
+        'id': persona.id,
+        # SEGURIDAD: Eliminamos tipo_persona, usamos solo rol
+        'sexo': persona.sexo,
+        'genero': persona.genero,
+        'edad': persona.edad,
+        'estado_civil': estado_civil_normalizado,
+        'religion': persona.religion,
+        'trabaja': persona.trabaja,
+        'lugar_trabajo': persona.lugar_trabajo,
+        'lugar_origen': persona.lugar_origen,
+        'colonia_residencia_actual': persona.colonia_residencia_actual,
+        'celular': persona.celular,
+        'correo_institucional': persona.correo_institucional,
+        'discapacidad': persona.discapacidad,
+        'observaciones': persona.observaciones,
+        'matricula': persona.matricula,
+        'semestre': persona.semestre,
+        'numero_hijos': persona.numero_hijos,
+        'grupo_etnico': persona.grupo_etnico,
+        'rol': persona.rol,
+        'is_active': persona.is_active,
+        'fecha_creacion': persona.fecha_creacion.isoformat() if persona.fecha_creacion else None,
+        'fecha_actualizacion': persona.fecha_actualizacion.isoformat() if persona.fecha_actualizacion else None,
+        'cohorte_ano': persona.cohorte_ano,
+        'cohorte_periodo': persona.cohorte_periodo,
+        'programas': [
+            {
+                'id': p.id,
+                'nombre_programa': p.nombre_programa,
+                'clave_programa': p.clave_programa
+            } for p in persona.programas
+        ],
+        'grupos': [
+            {
+                'id': g.id,
+                'nombre_grupo': g.nombre_grupo,
+                'tipo_grupo': g.tipo_grupo,
+                'observaciones_grupo': g.observaciones_grupo
+            } for g in persona.grupos
+        ],
+        'cohorte': None
+    }
+
+
 @router.get("/", response_model=List[dict])
-def read_personas(
-    db: Session = Depends(get_db),
+async def read_personas(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     # SEGURIDAD: Eliminamos tipo_persona, usamos solo rol
     rol: Optional[str] = None,
-    current_user: Persona = Depends(get_current_active_user)
+    semestre: Optional[int] = None,
+    cohorte_ano: Optional[int] = None,
+    cohorte_periodo: Optional[int] = None,
+    programa_id: Optional[int] = None,
+    current_user: Principal = Depends(get_current_active_user_async)
 ) -> Any:
     """
-    Recuperar personas con filtros opcionales.
+    Recuperar personas con filtros opcionales (directorio).
+
+    Filtros disponibles (cada uno con su índice):
+    - rol, semestre, cohorte_ano / cohorte_periodo
+    - programa_id: Personas inscritas en el programa educativo
+
+    Programas y grupos se cargan con selectinload: dos consultas en total
+    para toda la página, no una por persona.
+
+    Paginación:
+    - skip/limit: Paginación por desplazamiento (compatibilidad)
+    - cursor: Cursor opaco recibido en la cabecera X-Next-Cursor de la página
+      anterior. Cuando se envía, se ignora skip y la consulta continúa por id
+      directamente sobre el índice del filtro.
     """
-    query = db.query(Persona)
+    query = select(Persona).options(
+        selectinload(Persona.programas), selectinload(Persona.grupos)
+    )
 
     # Aplicar filtros si se proporcionan
     if rol:
-        query = query.filter(Persona.rol == rol)
-
-    personas = query.offset(skip).limit(limit).all()
-
-    # Convertir a diccionario simple para evitar problemas de serialización
-    result = []
-    for persona in personas:
-        # Normalizar estado_civil si es necesario
-        estado_civil_normalizado = persona.estado_civil
-        if estado_civil_normalizado not in ['soltero', 'soltera', 'casado', 'casada', 'divorciado', 'divorciada', 'viudo', 'viuda', 'union_libre', 'otro']:
-            estado_civil_normalizado = 'soltero'
-
-        persona_dict = {
-            'id': persona.id,
-            # SEGURIDAD: Eliminamos tipo_persona, usamos solo rol
-            'sexo': persona.sexo,
-            'genero': persona.genero,
-            'edad': persona.edad,
-            'estado_civil': estado_civil_normalizado,
-            'religion': persona.religion,
-            'trabaja': persona.trabaja,
-            'lugar_trabajo': persona.lugar_trabajo,
-            'lugar_origen': persona.lugar_origen,
-            'colonia_residencia_actual': persona.colonia_residencia_actual,
-            'celular': persona.celular,
-            'correo_institucional': persona.correo_institucional,
-            'discapacidad': persona.discapacidad,
-            'observaciones': persona.observaciones,
-            'matricula': persona.matricula,
-            'semestre': persona.semestre,
-            'numero_hijos': persona.numero_hijos,
-            'grupo_etnico': persona.grupo_etnico,
-            'rol': persona.rol,
-            'is_active': persona.is_active,
-            'fecha_creacion': persona.fecha_creacion.isoformat() if persona.fecha_creacion else None,
-            'fecha_actualizacion': persona.fecha_actualizacion.isoformat() if persona.fecha_actualizacion else None,
-            'cohorte_ano': persona.cohorte_ano,
-            'cohorte_periodo': persona.cohorte_periodo,
-            'programas': [],
-            'grupos': [],
-            'cohorte': None
-        }
-        result.append(persona_dict)
-
-    return result
+        query = query.where(Persona.rol == rol)
+    if semestre is not None:
+        query = query.where(Persona.semestre == semestre)
+    if cohorte_ano is not None:
+        query = query.where(Persona.cohorte_ano == cohorte_ano)
+    if cohorte_periodo is not None:
+        query = query.where(Persona.cohorte_periodo == cohorte_periodo)
+    if programa_id is not None:
+        query = query.join(
+            persona_programa, persona_programa.c.persona_id == Persona.id
+        ).where(persona_programa.c.programa_id == programa_id)
+
+    if cursor:
+        valores = decode_cursor(cursor)
+        try:
+            ultimo_id = int(valores["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+        query = query.where(Persona.id > ultimo_id)
+
+    query = query.order_by(Persona.id)
+    if cursor:
+        personas = (await db.scalars(query.limit(limit))).all()
+    else:
+        personas = (await db.scalars(query.offset(skip).limit(limit))).all()
+
+    # Página completa: puede haber más resultados
+    if personas and len(personas) == limit:
+        set_next_cursor(response, {"id": personas[-1].id})
+
+    return [_persona_directorio(persona) for persona in personas]
 
 
 @router.get("/{persona_id}", response_model=PersonaOut)
@@ -333,7 +432,7 @@ def read_persona(
     *,
     db: Session = Depends(get_db),
     persona_id: int,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener una persona por ID.
@@ -356,7 +455,7 @@ def update_persona(
     db: Session = Depends(get_db),
     persona_id: int,
     persona_in: PersonaUpdate,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Actualizar una persona.
@@ -375,7 +474,7 @@ def update_persona(
 
     # Manejar la contraseña por separado
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = hash_password_sync(update_data["password"])
         del update_data["password"]
         setattr(persona, "hashed_password", hashed_password)
 
@@ -420,7 +519,7 @@ def delete_persona(
     *,
     db: Session = Depends(get_db),
     persona_id: int,
-    current_user: Persona = Depends(check_deletion_permission)
+    current_user: Principal = Depends(check_deletion_permission)
 ) -> Any:
     """
     Eliminar una persona (solo administradores - coordinadores NO pueden eliminar).
@@ -468,7 +567,7 @@ def bulk_create_personas(
     *,
     db: Session = Depends(get_db),
     bulk_personas: PersonaBulkCreate,
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     Crear múltiples personas en una sola operación.
@@ -507,7 +606,7 @@ def bulk_create_personas(
             numero_hijos=persona_data.numero_hijos,
             grupo_etnico=persona_data.grupo_etnico,
             rol=persona_data.rol,
-            hashed_password=get_password_hash(persona_data.password)
+            hashed_password=hash_password_sync(persona_data.password)
         )
 
         # Agregar programas educativos
@@ -536,12 +635,50 @@ def bulk_create_personas(
     return created_personas
 
 
+@router.post("/bulk-import", response_model=EstadoImportacion, status_code=202)
+def bulk_import_personas(
+    *,
+    db: Session = Depends(get_db),
+    importacion: PersonaImportacion,
+    current_user: Principal = Depends(check_admin_role)
+) -> Any:
+    """
+    Importar muchas personas (p. ej. una generación completa) en segundo plano.
+
+    Responde de inmediato con el id de la importación; el progreso y los
+    errores de cada fila se consultan en GET /personas/bulk-import/{id}.
+    Ver app/services/importacion.py.
+    """
+    # El trabajo abre sus propias sesiones sobre el mismo motor que la petición
+    sesiones = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    trabajo = iniciar_importacion(importacion.items, sesiones)
+    security_logger.info(
+        f"Importación masiva {trabajo.id}: {trabajo.total} personas, iniciada por el usuario {current_user.id}"
+    )
+    return trabajo
+
+
+@router.get("/bulk-import/{trabajo_id}", response_model=EstadoImportacion)
+def bulk_import_estado(
+    trabajo_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(check_admin_role)
+) -> Any:
+    """
+    Consultar el progreso de una importación masiva (desde cualquier worker).
+    """
+    trabajo = obtener_trabajo(db, trabajo_id)
+    if not trabajo:
+        raise HTTPException(status_code=404, detail="Importación no encontrada")
+    return trabajo
+
+
 @router.put("/bulk-update", response_model=List[PersonaOut])
 def bulk_update_personas(
     *,
     db: Session = Depends(get_db),
     bulk_update: PersonaBulkUpdate,
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     Actualizar múltiples personas en una sola operación.
@@ -560,7 +697,7 @@ def bulk_update_personas(
 
         # Manejar la contraseña por separado
         if "password" in item:
-            hashed_password = get_password_hash(item["password"])
+            hashed_password = hash_password_sync(item["password"])
             del item["password"]
             setattr(persona, "hashed_password", hashed_password)
 
@@ -604,7 +741,7 @@ def bulk_delete_personas(
     *,
     db: Session = Depends(get_db),
     bulk_delete: PersonaBulkDelete,
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     Eliminar múltiples personas en una sola operación.
@@ -638,7 +775,7 @@ def bulk_delete_personas(
 def limpiar_notificaciones_obsoletas(
     *,
     db: Session = Depends(get_db),
-    current_user: Persona = Depends(check_admin_role)
+    current_user: Principal = Depends(check_admin_role)
 ) -> Any:
     """
     TEMPORAL: Limpiar todas las notificaciones de registro obsoletas.
@@ -667,10 +804,10 @@ def limpiar_notificaciones_obsoletas(
 
 @router.get("/list/estudiantes", response_model=List[PersonaOut])
 def get_estudiantes(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: Persona = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Obtener solo estudiantes/alumnos para atenciones.
@@ -690,17 +827,80 @@ def get_estudiantes(
 @router.get("/search/", response_model=List[PersonaOut])
 def search_personas(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
-    current_user: Persona = Depends(get_current_active_user)
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Buscar personas por texto en varios campos.
+
+    - Celular y matrícula: por prefijo, sin importar separadores
+      ("686-123" encuentra "6861234567"), sobre índices de expresión.
+    - Correo, matrícula, lugar de origen y colonia: índice FTS5 con búsqueda
+      por prefijo de cada palabra, sin distinguir acentos ni mayúsculas.
+
+    Primero se devuelven las coincidencias de celular/matrícula y después las
+    de texto por relevancia (bm25), hasta `limit` resultados. Si el índice
+    FTS5 no está disponible se usa LIKE.
     """
     if not q:
         return []
 
-    personas = db.query(Persona).filter(
+    ids = _buscar_personas_identificador(db, q, limit)
+    expresion = expresion_fts(q)
+    if expresion and fts_personas_disponible(db):
+        ids += _buscar_personas_fts(db, expresion, limit + len(ids))
+    else:
+        ids += _buscar_personas_like(db, q, limit + len(ids))
+
+    # Sin duplicados, conservando el orden de relevancia
+    ids = list(dict.fromkeys(ids))[:limit]
+    if not ids:
+        return []
+
+    personas = db.query(Persona).options(
+        selectinload(Persona.programas), selectinload(Persona.grupos)
+    ).filter(Persona.id.in_(ids)).all()
+    por_id = {persona.id: persona for persona in personas}
+    return [PersonaOut.from_orm_with_relations(por_id[i]) for i in ids if i in por_id]
+
+
+def _buscar_personas_identificador(db: Session, q: str, limit: int) -> List[int]:
+    """Ids de personas cuyo celular o matrícula normalizados empiezan con `q`."""
+    prefijo = normalizar_identificador(q)
+    # Solo textos con forma de identificador (al menos un dígito, sin espacios internos)
+    if len(prefijo) < 3 or not re.fullmatch(r"[0-9A-Z]*[0-9][0-9A-Z]*", prefijo):
+        return []
+
+    # Rango [prefijo, siguiente) en lugar de LIKE: SQLite lo resuelve con el índice
+    siguiente = prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+    condiciones = [
+        and_(expresion >= prefijo, expresion < siguiente)
+        for expresion in (
+            identificador_normalizado(Persona.celular),
+            identificador_normalizado(Persona.matricula),
+        )
+    ]
+    filas = db.query(Persona.id).filter(or_(*condiciones)).order_by(Persona.id).limit(limit)
+    return [fila.id for fila in filas]
+
+
+def _buscar_personas_fts(db: Session, expresion: str, limit: int) -> List[int]:
+    """Ids de personas_fts por relevancia; correo y matrícula pesan más que el domicilio."""
+    filas = db.execute(
+        text(
+            "SELECT rowid AS id FROM personas_fts WHERE personas_fts MATCH :expresion "
+            "ORDER BY bm25(personas_fts, 10.0, 10.0, 1.0, 1.0), rowid LIMIT :limit"
+        ),
+        {"expresion": expresion, "limit": limit}
+    )
+    return [fila.id for fila in filas]
+
+
+def _buscar_personas_like(db: Session, q: str, limit: int) -> List[int]:
+    """Búsqueda de respaldo con LIKE (recorre la tabla)."""
+    filas = db.query(Persona.id).filter(
         or_(
             Persona.correo_institucional.contains(q),
             Persona.matricula.contains(q),
@@ -708,6 +908,5 @@ def search_personas(
             Persona.lugar_origen.contains(q),
             Persona.colonia_residencia_actual.contains(q)
         )
-    ).all()
-
-    return personas
+    ).order_by(Persona.id).limit(limit)
+    return [fila.id for fila in filas]
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.personal import Personal
 from app.models.persona import Persona
 from app.schemas.personal import (
@@ -71,7 +71,7 @@ def create_personal(
 
 @router.get("/", response_model=List[PersonalOut])
 def read_personal_list(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     area: Optional[str] = None,
@@ -311,7 +311,7 @@ def bulk_delete_personal(
 @router.get("/search/", response_model=List[PersonalOut])
 def search_personal(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
     current_user = Depends(get_current_active_user)
 ) -> Any:
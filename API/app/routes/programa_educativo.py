@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.programa_educativo import ProgramaEducativo
 from app.schemas.programa_educativo import (
     ProgramaEducativoCreate,
@@ -56,7 +56,7 @@ def create_programa_educativo(
 
 @router.get("/publico/", response_model=List[ProgramaEducativoOut])
 def read_programas_educativos_publico(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Any:
     """
     Recuperar todos los programas educativos (endpoint público sin autenticación).
@@ -68,7 +68,7 @@ def read_programas_educativos_publico(
 
 @router.get("/", response_model=List[ProgramaEducativoOut])
 def read_programas_educativos(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(get_current_active_user)
@@ -270,7 +270,7 @@ def bulk_delete_programas_educativos(
 @router.get("/search/", response_model=List[ProgramaEducativoOut])
 def search_programas_educativos(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
     current_user = Depends(get_current_active_user)
 ) -> Any:
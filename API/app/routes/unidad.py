@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.unidad import Unidad
 from app.schemas.unidad import (
     UnidadCreate,
@@ -54,7 +54,7 @@ def create_unidad(
 
 @router.get("/publico/", response_model=List[UnidadOut])
 def read_unidades_publico(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Any:
     """
     Recuperar todas las unidades (endpoint público sin autenticación).
@@ -66,7 +66,7 @@ def read_unidades_publico(
 
 @router.get("/", response_model=List[UnidadOut])
 def read_unidades(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(get_current_active_user)
@@ -235,7 +235,7 @@ def bulk_delete_unidades(
 @router.get("/search/", response_model=List[UnidadOut])
 def search_unidades(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: str = Query(None, min_length=3),
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime, time
 from enum import Enum
 
 class EstadoCita(str, Enum):
@@ -154,6 +154,8 @@ class EstadisticasCitas(BaseModel):
     canceladas: int
     completadas: int
     por_tipo: dict
+    # Matriz estado x tipo de cita: {"pendiente": {"psicologica": 3, ...}, ...}
+    matriz: Dict[str, Dict[str, int]] = {}
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -172,3 +174,42 @@ class CitaBulkCreate(BaseModel):
 class CitaBulkUpdate(BaseModel):
     """Schema para actualización masiva de citas."""
     items: List[Dict[str, Any]]  # Lista de diccionarios con id_cita y campos a actualizar
+
+
+class ResultadoItemLote(BaseModel):
+    """Resultado de un elemento dentro de una operación masiva."""
+    indice: int  # Posición del elemento en la petición
+    id_cita: Optional[int] = None
+    exito: bool
+    error: Optional[str] = None
+
+
+class ResultadoLoteCitas(BaseModel):
+    """Reporte detallado de una operación masiva de citas (parámetro detalle=true)."""
+    exitosos: int
+    fallidos: int
+    resultados: List[ResultadoItemLote]
+    citas: List[CitaOut] = []
+
+
+class CitaCalendario(BaseModel):
+    """Entrada compacta de una cita dentro del calendario."""
+    id_cita: int
+    hora: time
+    alumno: Optional[str] = None
+    estado: EstadoCita
+    ubicacion: Optional[str] = None
+
+
+class DiaCalendario(BaseModel):
+    """Citas de un día del calendario, ordenadas por hora."""
+    fecha: date
+    citas: List[CitaCalendario]
+
+
+class CalendarioCitas(BaseModel):
+    """Calendario de citas confirmadas agrupadas por día."""
+    desde: date
+    hasta: date
+    total: int
+    dias: List[DiaCalendario]
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Optional
+from datetime import datetime, time
+
+
+class DisponibilidadCreate(BaseModel):
+    """Schema para registrar una ventana semanal de atención."""
+    id_personal: int
+    dia_semana: int = Field(..., ge=0, le=6, description="0 = lunes ... 6 = domingo")
+    hora_inicio: time
+    hora_fin: time
+    ubicacion: Optional[str] = Field(None, max_length=200)
+
+    @model_validator(mode='after')
+    def validate_horario(self):
+        if self.hora_fin <= self.hora_inicio:
+            raise ValueError('La hora de fin debe ser posterior a la hora de inicio')
+        return self
+
+
+class DisponibilidadOut(DisponibilidadCreate):
+    """Schema de respuesta para una ventana de atención."""
+    id: int
+    activo: bool = True
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EspacioDisponible(BaseModel):
+    """Espacio libre para agendar una cita."""
+    id_personal: int
+    inicio: datetime
+    fin: datetime
+    ubicacion: Optional[str] = None
+
+
+class CitaReprogramar(BaseModel):
+    """Schema para reprogramar una cita a una nueva fecha."""
+    fecha_confirmada: datetime
+    ubicacion: Optional[str] = Field(None, max_length=200)
+    id_personal: Optional[int] = None
+    observaciones_personal: Optional[str] = Field(None, max_length=500)
@@ -1,8 +1,10 @@
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, EmailStr, field_validator, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 from datetime import datetime
 from enum import Enum
 
+from app.core.config import settings
+
 
 # Enums para validación
 
@@ -372,3 +374,38 @@ class PersonaBulkUpdate(BaseModel):
 
 class PersonaBulkDelete(BaseModel):
     ids: List[int]
+
+
+class PersonaValidacionLote(BaseModel):
+    """Correos y matrículas a validar en una sola llamada (formularios de registro)."""
+    emails: List[str] = Field(default_factory=list, max_length=100)
+    matriculas: List[str] = Field(default_factory=list, max_length=100)
+
+
+class PersonaImportacion(BaseModel):
+    """
+    Filas de una importación masiva. Cada fila se valida por separado con
+    PersonaCreate para reportar sus errores sin rechazar toda la petición.
+    """
+    items: List[Dict[str, Any]] = Field(..., max_length=settings.IMPORTACION_MAX_FILAS)
+
+
+class ErrorImportacion(BaseModel):
+    indice: int  # Posición de la fila en la petición
+    error: str
+
+
+class EstadoImportacion(BaseModel):
+    """Progreso y resultado de una importación masiva."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    estado: str  # pendiente, en_proceso, completada, fallida
+    total: int
+    procesadas: int
+    exitosas: int
+    fallidas: int
+    errores: List[ErrorImportacion] = []
+    creada_en: datetime
+    terminada_en: Optional[datetime] = None
+    error: Optional[str] = None
@@ -0,0 +1,387 @@
+"""
+Motor de agenda para citas: índice de intervalos, detección de empalmes y
+generación de espacios disponibles.
+
+Las citas confirmadas se guardan en memoria como intervalos
+[fecha_confirmada, fecha_confirmada + DURACION_CITA_MINUTOS) ordenados por
+inicio, una lista por miembro del personal y otra por ubicación. Con búsqueda
+binaria (bisect) cada verificación de empalme cuesta O(log n) aunque existan
+decenas de miles de citas confirmadas.
+
+El índice se construye de forma perezosa desde la base de datos, se actualiza
+con los commits de la sesión (eventos de SQLAlchemy) y se reconstruye cada
+AGENDA_INDICE_TTL segundos para recoger cambios hechos por otros workers. La
+reconstrucción usa una sesión propia (solo ve datos confirmados) y lee la
+tabla fuera del lock; mientras tanto las consultas usan el índice anterior.
+
+Como puede estar desactualizado respecto de otros workers, el índice solo
+sirve para generar espacios. La verificación que decide si una cita se
+guarda es buscar_empalme_bd: una consulta por rango dentro de la
+transacción de escritura (bloquear_escritura).
+"""
+import threading
+import time
+from bisect import bisect_right, insort
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
+
+from app.core.config import settings
+from app.models.cita import Cita, EstadoCita
+from app.models.disponibilidad import DisponibilidadPersonal
+
+# Sentinela mayor que cualquier id_cita para las búsquedas binarias
+_ID_MAXIMO = float("inf")
+
+
+def normalizar_fecha(fecha: Optional[datetime]) -> Optional[datetime]:
+    """Convertir fechas con zona horaria a UTC sin tzinfo (formato almacenado en SQLite)."""
+    if fecha is not None and fecha.tzinfo is not None:
+        return fecha.astimezone(timezone.utc).replace(tzinfo=None)
+    return fecha
+
+
+def bloquear_escritura(db: Session) -> None:
+    """
+    Tomar el bloqueo de escritura antes de verificar empalmes y guardar.
+
+    En SQLite, BEGIN IMMEDIATE serializa a los escritores de todos los
+    workers: una confirmación concurrente espera (busy_timeout) al commit de
+    la otra y su verificación ya ve la cita guardada. Si la transacción ya
+    escribió algo, el bloqueo ya está tomado.
+    """
+    conexion = db.connection()
+    if conexion.dialect.name != "sqlite":
+        return
+    if not conexion.connection.driver_connection.in_transaction:
+        conexion.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _claves(id_personal: Optional[int], ubicacion: Optional[str]) -> List[Hashable]:
+    claves: List[Hashable] = []
+    if id_personal:
+        claves.append(("personal", id_personal))
+    if ubicacion and ubicacion.strip():
+        claves.append(("ubicacion", ubicacion.strip().lower()))
+    return claves
+
+
+class IndiceIntervalos:
+    """Intervalos de duración fija ordenados por inicio, agrupados por clave."""
+
+    def __init__(self, duracion: timedelta):
+        self.duracion = duracion
+        self._por_clave: Dict[Hashable, List[Tuple[datetime, int]]] = {}
+        self._citas: Dict[int, Tuple[datetime, List[Hashable]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._citas)
+
+    def agregar(self, id_cita: int, inicio: datetime, claves: List[Hashable]) -> None:
+        self.quitar(id_cita)
+        for clave in claves:
+            insort(self._por_clave.setdefault(clave, []), (inicio, id_cita))
+        self._citas[id_cita] = (inicio, claves)
+
+    def quitar(self, id_cita: int) -> None:
+        registro = self._citas.pop(id_cita, None)
+        if not registro:
+            return
+        inicio, claves = registro
+        for clave in claves:
+            intervalos = self._por_clave.get(clave, [])
+            posicion = bisect_right(intervalos, (inicio, id_cita)) - 1
+            if posicion >= 0 and intervalos[posicion] == (inicio, id_cita):
+                del intervalos[posicion]
+
+    def empalme(self, clave: Hashable, inicio: datetime, excluir: Optional[int] = None) -> Optional[int]:
+        """
+        Devolver el id de una cita que se empalma con [inicio, inicio + duración).
+
+        Dos intervalos de igual duración se empalman si sus inicios distan
+        menos de una duración, así que basta con revisar los inicios en
+        (inicio - duración, inicio + duración).
+        """
+        intervalos = self._por_clave.get(clave)
+        if not intervalos:
+            return None
+
+        posicion = bisect_right(intervalos, (inicio - self.duracion, _ID_MAXIMO))
+        limite = inicio + self.duracion
+        while posicion < len(intervalos) and intervalos[posicion][0] < limite:
+            id_cita = intervalos[posicion][1]
+            if id_cita != excluir:
+                return id_cita
+            posicion += 1
+        return None
+
+
+class Agenda:
+    """Índice de citas confirmadas compartido por el proceso."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Un solo hilo reconstruye a la vez (la lectura de la tabla es lenta)
+        self._construccion = threading.Lock()
+        self._indice: Optional[IndiceIntervalos] = None
+        self._construido_en = 0.0
+        # Cambia con cada invalidación: una reconstrucción iniciada antes no
+        # guarda su resultado (pudo leer la tabla antes del cambio)
+        self._generacion = 0
+        # Cambios confirmados mientras se reconstruye, para aplicarlos al resultado
+        self._cambios_pendientes: Optional[List[Dict[int, Optional[tuple]]]] = None
+
+    @property
+    def duracion(self) -> timedelta:
+        return timedelta(minutes=settings.DURACION_CITA_MINUTOS)
+
+    def invalidar(self) -> None:
+        """Descartar el índice; se reconstruirá en la siguiente consulta."""
+        with self._lock:
+            self._indice = None
+            self._generacion += 1
+
+    def precargar(self, db: Session) -> int:
+        """Construir el índice por adelantado (arranque); devuelve el número de citas."""
+        return len(self._obtener_indice(db))
+
+    def _vigente(self) -> Optional[IndiceIntervalos]:
+        vencido = time.monotonic() - self._construido_en > settings.AGENDA_INDICE_TTL
+        return None if vencido else self._indice
+
+    def _obtener_indice(self, db: Session) -> IndiceIntervalos:
+        with self._lock:
+            indice = self._vigente()
+            anterior = self._indice
+        if indice is not None:
+            return indice
+
+        # Con un índice vencido no se espera a otro hilo que ya reconstruye
+        if not self._construccion.acquire(blocking=anterior is None):
+            return anterior
+        try:
+            with self._lock:
+                indice = self._vigente()
+                if indice is not None:
+                    return indice
+                generacion = self._generacion
+                self._cambios_pendientes = []
+
+            indice = self._construir(db)
+
+            with self._lock:
+                for cambios in self._cambios_pendientes:
+                    self._aplicar(indice, cambios)
+                self._cambios_pendientes = None
+                if generacion == self._generacion:
+                    self._indice = indice
+                    self._construido_en = time.monotonic()
+            return indice
+        finally:
+            self._construccion.release()
+
+    def _construir(self, db: Session) -> IndiceIntervalos:
+        indice = IndiceIntervalos(self.duracion)
+        consulta = select(
+            Cita.id_cita, Cita.fecha_confirmada, Cita.id_personal, Cita.ubicacion
+        ).where(Cita.estado == EstadoCita.CONFIRMADA, Cita.fecha_confirmada.isnot(None))
+
+        bind = db.get_bind()
+        if isinstance(bind.pool, (SingletonThreadPool, StaticPool)):
+            # Base en memoria: otra sesión compartiría la misma conexión
+            with db.no_autoflush:
+                filas = db.execute(consulta).all()
+        else:
+            # Sesión propia sin autoflush: los cambios sin confirmar de la
+            # petición (que aún puede hacer rollback) no entran al índice
+            with Session(bind=bind, autoflush=False) as lectura:
+                filas = lectura.execute(consulta).all()
+
+        for id_cita, inicio, id_personal, ubicacion in filas:
+            indice.agregar(id_cita, normalizar_fecha(inicio), _claves(id_personal, ubicacion))
+        return indice
+
+    @staticmethod
+    def _aplicar(indice: IndiceIntervalos, cambios: Dict[int, Optional[tuple]]) -> None:
+        for id_cita, valores in cambios.items():
+            if valores is None:
+                indice.quitar(id_cita)
+                continue
+            estado, inicio, id_personal, ubicacion = valores
+            if estado == EstadoCita.CONFIRMADA and inicio is not None:
+                indice.agregar(id_cita, normalizar_fecha(inicio), _claves(id_personal, ubicacion))
+            else:
+                indice.quitar(id_cita)
+
+    def aplicar_cambios(self, cambios: Dict[int, Optional[tuple]]) -> None:
+        """Aplicar al índice las citas modificadas en un commit."""
+        with self._lock:
+            if self._cambios_pendientes is not None:
+                self._cambios_pendientes.append(cambios)
+            if self._indice is not None:
+                self._aplicar(self._indice, cambios)
+
+    def buscar_empalme(
+        self,
+        db: Session,
+        inicio: datetime,
+        id_personal: Optional[int],
+        ubicacion: Optional[str],
+        excluir: Optional[int] = None
+    ) -> Optional[int]:
+        """Id de una cita confirmada que ocupa al mismo personal o ubicación, si existe."""
+        inicio = normalizar_fecha(inicio)
+        indice = self._obtener_indice(db)
+        with self._lock:
+            for clave in _claves(id_personal, ubicacion):
+                id_cita = indice.empalme(clave, inicio, excluir)
+                if id_cita is not None:
+                    return id_cita
+        return None
+
+    def buscar_empalme_bd(
+        self,
+        db: Session,
+        inicio: datetime,
+        id_personal: Optional[int],
+        ubicacion: Optional[str],
+        excluir: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Igual que buscar_empalme, pero consultando la base de datos.
+
+        Busca por rango las citas confirmadas que empiezan a menos de una
+        duración de `inicio`: por personal con ix_citas_personal_fecha_confirmada
+        y por ubicación con ix_citas_fecha_confirmada (la ubicación se compara
+        normalizada, como en el índice). Para que el resultado sea definitivo
+        se llama después de bloquear_escritura y antes del commit.
+        """
+        inicio = normalizar_fecha(inicio)
+        rango = [
+            Cita.fecha_confirmada > inicio - self.duracion,
+            Cita.fecha_confirmada < inicio + self.duracion,
+        ]
+        if excluir is not None:
+            rango.append(Cita.id_cita != excluir)
+
+        if id_personal:
+            id_cita = db.execute(
+                select(Cita.id_cita).where(
+                    *rango, Cita.id_personal == id_personal, Cita.estado == EstadoCita.CONFIRMADA
+                ).limit(1)
+            ).scalar()
+            if id_cita is not None:
+                return id_cita
+
+        clave = _claves(None, ubicacion)
+        if clave:
+            # El estado se filtra aquí: con él en el WHERE, SQLite prefiere
+            # ix_citas_estado_fecha_solicitud y recorre todas las confirmadas
+            filas = db.execute(
+                select(Cita.id_cita, Cita.estado, Cita.ubicacion)
+                .where(*rango, Cita.ubicacion.isnot(None))
+            )
+            for id_cita, estado, otra in filas:
+                if estado == EstadoCita.CONFIRMADA and _claves(None, otra) == clave:
+                    return id_cita
+        return None
+
+    def espacios_disponibles(
+        self,
+        db: Session,
+        desde: date,
+        hasta: date,
+        id_personal: Optional[int] = None,
+        ubicacion: Optional[str] = None,
+        limite: int = 50
+    ) -> List[dict]:
+        """
+        Generar los espacios libres a partir de las ventanas de disponibilidad.
+
+        Los espacios se devuelven ordenados por inicio; el primero es el
+        siguiente espacio libre.
+        """
+        query = db.query(DisponibilidadPersonal).filter(DisponibilidadPersonal.activo.is_(True))
+        if id_personal:
+            query = query.filter(DisponibilidadPersonal.id_personal == id_personal)
+        if ubicacion:
+            query = query.filter(DisponibilidadPersonal.ubicacion == ubicacion)
+
+        ventanas_por_dia: Dict[int, List[DisponibilidadPersonal]] = {}
+        for ventana in query.all():
+            ventanas_por_dia.setdefault(ventana.dia_semana, []).append(ventana)
+
+        duracion = self.duracion
+        ahora = datetime.now()
+        espacios: List[dict] = []
+
+        indice = self._obtener_indice(db)
+        with self._lock:
+            dia = desde
+            while dia <= hasta and len(espacios) < limite:
+                del_dia = []
+                for ventana in ventanas_por_dia.get(dia.weekday(), []):
+                    inicio = datetime.combine(dia, ventana.hora_inicio)
+                    fin_ventana = datetime.combine(dia, ventana.hora_fin)
+                    claves = _claves(ventana.id_personal, ventana.ubicacion)
+                    while inicio + duracion <= fin_ventana:
+                        libre = inicio >= ahora and all(
+                            indice.empalme(clave, inicio) is None for clave in claves
+                        )
+                        if libre:
+                            del_dia.append({
+                                "id_personal": ventana.id_personal,
+                                "inicio": inicio,
+                                "fin": inicio + duracion,
+                                "ubicacion": ventana.ubicacion
+                            })
+                        inicio += duracion
+                del_dia.sort(key=lambda e: (e["inicio"], e["id_personal"]))
+                espacios.extend(del_dia)
+                dia += timedelta(days=1)
+
+        return espacios[:limite]
+
+
+# Instancia global de la agenda
+agenda = Agenda()
+
+
+# --- Sincronización con los commits de la sesión ---
+
+@event.listens_for(Session, "after_flush")
+def _registrar_cambios_citas(session, flush_context):
+    cambios = session.info.setdefault("agenda_cambios", {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Cita) and obj.id_cita is not None:
+            cambios[obj.id_cita] = (obj.estado, obj.fecha_confirmada, obj.id_personal, obj.ubicacion)
+    for obj in session.deleted:
+        if isinstance(obj, Cita) and obj.id_cita is not None:
+            cambios[obj.id_cita] = None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_operaciones_masivas(orm_execute_state):
+    # UPDATE/DELETE masivos no pasan por el flush: se invalida el índice completo
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        mapper.class_ is Cita for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info["agenda_invalidar"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _aplicar_cambios_citas(session):
+    cambios = session.info.pop("agenda_cambios", None)
+    if session.info.pop("agenda_invalidar", False):
+        agenda.invalidar()
+    elif cambios:
+        agenda.aplicar_cambios(cambios)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_cambios_citas(session):
+    session.info.pop("agenda_cambios", None)
+    session.info.pop("agenda_invalidar", None)
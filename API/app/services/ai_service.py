@@ -1,29 +1,48 @@
 """
 Servicio de IA para generar reportes psicopedagógicos.
+
+El SDK de OpenAI se importa y el cliente se crea en el primer reporte, no al
+importar el módulo: importar `openai` cuesta cientos de milisegundos y solo
+lo usa /cuestionario-psicopedagogico/completar.
 """
 
 import os
+import threading
 from typing import Dict, Any, Optional
-from openai import OpenAI
 import json
 import logging
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Marca de cliente aún no creado (None significa modo simulado)
+_SIN_INICIALIZAR = object()
+
+
 class AIReportService:
     """Servicio para generar reportes psicopedagógicos usando IA."""
     
     def __init__(self):
-        """Inicializar el servicio de IA."""
+        """Inicializar el servicio de IA (sin crear el cliente de OpenAI)."""
+        self._client = _SIN_INICIALIZAR
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Cliente de OpenAI creado en el primer uso; None si no hay API key."""
+        if self._client is _SIN_INICIALIZAR:
+            with self._lock:
+                if self._client is _SIN_INICIALIZAR:
+                    self._client = self._crear_cliente()
+        return self._client
+
+    def _crear_cliente(self):
         # Obtener la API key de OpenAI desde variables de entorno
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
             logger.warning("OPENAI_API_KEY no encontrada. Usando modo simulado.")
-            self.client = None
-        else:
-            self.client = OpenAI(api_key=self.api_key)
+            return None
+        from openai import OpenAI
+        return OpenAI(api_key=api_key)
     
     def generate_psychopedagogical_report(
         self, 
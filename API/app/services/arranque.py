@@ -0,0 +1,171 @@
+"""
+Secuencia de arranque de la API (lifespan de FastAPI).
+
+1. Esquema: verificar la revisión de Alembic (ver app/db/migraciones.py).
+2. Calentamiento opcional (CALENTAR_CACHES_AL_INICIAR): configurar los
+   mapeadores del ORM, abrir las primeras conexiones de cada pool, ejecutar
+   una vez las consultas de catálogos y de cuestionarios asignados (quedan
+   compiladas en la caché de SQLAlchemy y sus páginas en la caché de
+   SQLite), construir el índice de la agenda de citas y el de correos y
+   matrículas registrados, e iniciar los workers del executor de hash de
+   contraseñas.
+3. Calibración opcional del costo de bcrypt (BCRYPT_OBJETIVO_MS): el primer
+   worker que arranca mide el costo y lo guarda en parametros_sistema; los
+   demás usan el valor guardado, así que todos comparten el mismo costo.
+
+Así la primera petición de cada worker no paga esos costos. Los tiempos de
+cada paso se registran en el log y quedan en app.state.arranque.
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import configure_mappers
+
+from app.core import hashing
+from app.core.config import settings
+from app.core.security import bcrypt_rounds, calibrar_bcrypt_rounds
+from app.db import database
+from app.db.migraciones import preparar_esquema
+from app.models.cuestionario_admin import TipoUsuario
+from app.models.discapacidad import Discapacidad
+from app.models.grupo_etnico import GrupoEtnico
+from app.models.parametro import ParametroSistema
+from app.models.persona import Persona
+from app.models.religion import Religion
+from app.routes.cuestionarios_usuario import consulta_cuestionarios_asignados
+from app.services.agenda import agenda
+from app.services.disponibilidad import disponibilidad
+
+logger = logging.getLogger(__name__)
+
+# BCRYPT_ROUNDS fijado en el entorno: tiene prioridad sobre la calibración.
+# Se evalúa al importar; después settings.BCRYPT_ROUNDS cambia al calibrar
+_BCRYPT_ROUNDS_EXPLICITO = "BCRYPT_ROUNDS" in settings.model_fields_set
+
+
+@contextmanager
+def _medir(tiempos: Dict[str, float], paso: str):
+    inicio = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        # Un paso de calentamiento fallido no impide arrancar
+        logger.warning("Arranque: falló el paso '%s'", paso, exc_info=True)
+    finally:
+        tiempos[paso] = (time.perf_counter() - inicio) * 1000
+
+
+def _abrir_conexiones_sync() -> None:
+    for engine in {database.engine, database.read_engine}:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+
+def _precargar_agenda() -> None:
+    with database.SessionLocalRO() as db:
+        agenda.precargar(db)
+
+
+def _precargar_disponibilidad() -> None:
+    with database.SessionLocalRO() as db:
+        disponibilidad.precargar(db)
+
+
+def costo_bcrypt_compartido(objetivo_ms: float) -> int:
+    """
+    Costo de bcrypt común a todos los workers.
+
+    Si ningún worker lo ha calibrado, se mide en este equipo sin bajar del
+    mayor costo de los hashes almacenados (bajarlo recalcularía esos hashes
+    con un costo menor) y se guarda en parametros_sistema. Si otro worker
+    lo guardó primero, se usa el suyo. Para recalibrar se borra la fila.
+    """
+    with database.SessionLocal() as db:
+        guardado = db.get(ParametroSistema, "bcrypt_rounds")
+        if guardado is not None:
+            return int(guardado.valor)
+
+        # Los costos tienen dos dígitos ($2b$12$...): el máximo de texto es el numérico
+        mayor_hash = db.scalar(
+            select(func.max(Persona.hashed_password)).where(Persona.hashed_password.like("$2_$__$%"))
+        )
+        costo = max(calibrar_bcrypt_rounds(objetivo_ms), bcrypt_rounds(mayor_hash or "") or 0)
+        db.add(ParametroSistema(clave="bcrypt_rounds", valor=str(costo), actualizado_en=datetime.utcnow()))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Otro worker terminó de calibrar primero
+            db.rollback()
+            costo = int(db.get(ParametroSistema, "bcrypt_rounds").valor)
+        return costo
+
+
+async def calentar(tiempos: Dict[str, float]) -> None:
+    """Ejecutar los pasos de calentamiento registrando su duración en `tiempos`."""
+    with _medir(tiempos, "mapeadores"):
+        configure_mappers()
+
+    with _medir(tiempos, "conexiones"):
+        await asyncio.to_thread(_abrir_conexiones_sync)
+        async with database.async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async with database.AsyncSessionLocal() as db:
+        with _medir(tiempos, "catalogos"):
+            # Mismas consultas que /catalogos/*/activas/ (formularios públicos)
+            for modelo in (Religion, GrupoEtnico, Discapacidad):
+                (await db.scalars(select(modelo).where(modelo.activo == True))).all()
+
+        with _medir(tiempos, "cuestionarios"):
+            ahora = datetime.utcnow()
+            for tipo_usuario in TipoUsuario:
+                (await db.scalars(consulta_cuestionarios_asignados(tipo_usuario, ahora).limit(10))).all()
+
+    with _medir(tiempos, "agenda"):
+        await asyncio.to_thread(_precargar_agenda)
+
+    with _medir(tiempos, "disponibilidad"):
+        await asyncio.to_thread(_precargar_disponibilidad)
+
+    with _medir(tiempos, "hash"):
+        # Con HASH_EXECUTOR="proceso" lanzar los workers toma cientos de ms
+        await hashing.iniciar_executor()
+
+
+async def arrancar() -> Dict[str, float]:
+    """Preparar el proceso antes de aceptar peticiones; devuelve los tiempos en ms."""
+    inicio = time.perf_counter()
+    tiempos: Dict[str, float] = {}
+
+    if settings.VERIFICAR_ESQUEMA_AL_INICIAR:
+        # Sin _medir: un esquema desactualizado detiene el arranque (MIGRACIONES_ESTRICTAS)
+        paso = time.perf_counter()
+        await asyncio.to_thread(preparar_esquema, database.engine)
+        tiempos["esquema"] = (time.perf_counter() - paso) * 1000
+
+    if settings.CALENTAR_CACHES_AL_INICIAR:
+        await calentar(tiempos)
+
+    if settings.BCRYPT_OBJETIVO_MS and not _BCRYPT_ROUNDS_EXPLICITO:
+        with _medir(tiempos, "bcrypt"):
+            settings.BCRYPT_ROUNDS = await asyncio.to_thread(
+                costo_bcrypt_compartido, settings.BCRYPT_OBJETIVO_MS
+            )
+            logger.info(
+                "Costo de bcrypt: %d (objetivo %.0f ms)",
+                settings.BCRYPT_ROUNDS, settings.BCRYPT_OBJETIVO_MS,
+            )
+
+    tiempos["total"] = (time.perf_counter() - inicio) * 1000
+    logger.info(
+        "Arranque listo en %.1f ms (%s)",
+        tiempos["total"],
+        ", ".join(f"{paso}: {ms:.1f} ms" for paso, ms in tiempos.items() if paso != "total"),
+    )
+    return tiempos
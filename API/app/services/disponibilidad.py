@@ -0,0 +1,207 @@
+"""
+Disponibilidad de correos institucionales y matrículas para los
+formularios de registro (/personas/validate-*).
+
+En semanas de registro masivo los formularios validan en cada tecla. La
+mayoría de las validaciones son de valores libres, así que se mantiene en
+memoria un filtro de Bloom por campo que las responde sin consultar la base
+de datos. Con 1 % de falsos positivos y el filtro dimensionado al doble de
+los valores ocupa ~2.4 bytes por valor registrado (unos 240 KB por campo con
+100 000 personas); no se guardan los valores.
+Un positivo del filtro puede ser falso o venir de un valor ya dado de baja
+(el filtro no admite quitar valores): se confirma con una consulta puntual
+sobre el índice único del campo.
+
+Igual que la agenda de citas, los filtros se construyen de forma perezosa,
+se actualizan con los commits de la sesión (eventos de SQLAlchemy) y se
+reconstruyen cada DISPONIBILIDAD_INDICE_TTL segundos para recoger altas
+hechas por otros workers. La reconstrucción lee la tabla fuera del lock y
+mientras tanto las demás validaciones usan los filtros anteriores. Es solo
+una ayuda para el formulario: la restricción UNIQUE de la tabla sigue siendo
+la validación definitiva.
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.persona import Persona
+from app.utils.bloom import FiltroBloom
+
+# Campo del formulario -> atributo de Persona
+CAMPOS = {
+    "correo": "correo_institucional",
+    "matricula": "matricula",
+}
+
+# Capacidad mínima del filtro: deja lugar a las altas entre reconstrucciones
+_CAPACIDAD_MINIMA = 1024
+
+
+def _filtro(valores: List[str]) -> FiltroBloom:
+    capacidad = max(_CAPACIDAD_MINIMA, 2 * len(valores))
+    return FiltroBloom.desde(valores, capacidad, settings.DISPONIBILIDAD_FALSOS_POSITIVOS)
+
+
+class Disponibilidad:
+    """Filtros de correos y matrículas registrados compartidos por el proceso."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Un solo hilo reconstruye a la vez (la lectura de la tabla es lenta)
+        self._construccion = threading.Lock()
+        self._filtros: Optional[Dict[str, FiltroBloom]] = None
+        self._construido_en = 0.0
+        # Cambia con cada invalidación: una reconstrucción iniciada antes no
+        # guarda su resultado (pudo leer la tabla antes del cambio)
+        self._generacion = 0
+        # Altas confirmadas mientras se reconstruye, para aplicarlas al resultado
+        self._altas_pendientes: Optional[List[Tuple[str, str]]] = None
+
+    def invalidar(self) -> None:
+        """Descartar los filtros; se reconstruirán en la siguiente consulta."""
+        with self._lock:
+            self._filtros = None
+            self._generacion += 1
+
+    def precargar(self, db: Session) -> int:
+        """Construir los filtros por adelantado (arranque); devuelve el número de correos."""
+        return len(self._obtener_filtros(db)["correo"])
+
+    def _vigentes(self) -> Optional[Dict[str, FiltroBloom]]:
+        vencido = time.monotonic() - self._construido_en > settings.DISPONIBILIDAD_INDICE_TTL
+        return None if vencido else self._filtros
+
+    def _obtener_filtros(self, db: Session) -> Dict[str, FiltroBloom]:
+        with self._lock:
+            filtros = self._vigentes()
+            anteriores = self._filtros
+        if filtros is not None:
+            return filtros
+
+        # Con filtros vencidos no se espera a otro hilo que ya reconstruye
+        if not self._construccion.acquire(blocking=anteriores is None):
+            return anteriores
+        try:
+            with self._lock:
+                filtros = self._vigentes()
+                if filtros is not None:
+                    return filtros
+                generacion = self._generacion
+                self._altas_pendientes = []
+
+            filtros = self._construir(db)
+
+            with self._lock:
+                for campo, valor in self._altas_pendientes:
+                    filtros[campo].agregar(valor)
+                self._altas_pendientes = None
+                if generacion == self._generacion:
+                    self._filtros = filtros
+                    self._construido_en = time.monotonic()
+            return filtros
+        finally:
+            self._construccion.release()
+
+    def _construir(self, db: Session) -> Dict[str, FiltroBloom]:
+        correos: List[str] = []
+        matriculas: List[str] = []
+        for correo, matricula in db.execute(select(Persona.correo_institucional, Persona.matricula)):
+            if correo:
+                correos.append(correo)
+            if matricula:
+                matriculas.append(matricula)
+        return {"correo": _filtro(correos), "matricula": _filtro(matriculas)}
+
+    def disponibles(self, db: Session, campo: str, valores: Iterable[str]) -> Dict[str, bool]:
+        """Indicar para cada valor si está libre (ningún registro lo usa)."""
+        valores = list(valores)
+        filtro = self._obtener_filtros(db)[campo]
+        posibles = {valor for valor in valores if valor in filtro}
+        registrados = set()
+        if posibles:
+            columna = getattr(Persona, CAMPOS[campo])
+            registrados = set(db.execute(select(columna).where(columna.in_(posibles))).scalars())
+        return {valor: valor not in registrados for valor in valores}
+
+    def disponible(self, db: Session, campo: str, valor: str) -> bool:
+        return self.disponibles(db, campo, [valor])[valor]
+
+    def aplicar_cambios(self, cambios: List[Tuple[str, str, str]]) -> None:
+        """
+        Aplicar las altas y bajas de un commit: (operación, campo, valor).
+
+        Las bajas no cambian el filtro: sus positivos se descartan al
+        confirmarlos en la base de datos.
+        """
+        with self._lock:
+            for operacion, campo, valor in cambios:
+                if operacion != "agregar":
+                    continue
+                if self._altas_pendientes is not None:
+                    self._altas_pendientes.append((campo, valor))
+                if self._filtros is not None:
+                    filtro = self._filtros[campo]
+                    filtro.agregar(valor)
+                    if filtro.saturado:
+                        # Más altas que la capacidad: reconstruir con el tamaño nuevo
+                        self._construido_en = 0.0
+
+
+# Instancia global
+disponibilidad = Disponibilidad()
+
+
+# --- Sincronización con los commits de la sesión ---
+
+@event.listens_for(Session, "after_flush")
+def _registrar_cambios_personas(session, flush_context):
+    cambios = session.info.setdefault("disponibilidad_cambios", [])
+    for obj in session.new:
+        if isinstance(obj, Persona):
+            for campo, atributo in CAMPOS.items():
+                valor = getattr(obj, atributo)
+                if valor:
+                    cambios.append(("agregar", campo, valor))
+    for obj in session.dirty:
+        if isinstance(obj, Persona):
+            estado = inspect(obj)
+            for campo, atributo in CAMPOS.items():
+                historial = estado.attrs[atributo].history
+                cambios.extend(("quitar", campo, valor) for valor in historial.deleted if valor)
+                cambios.extend(("agregar", campo, valor) for valor in historial.added if valor)
+    for obj in session.deleted:
+        if isinstance(obj, Persona):
+            # Sin cargar atributos expirados (la fila ya no existe)
+            datos = inspect(obj).dict
+            for campo, atributo in CAMPOS.items():
+                if atributo not in datos:
+                    session.info["disponibilidad_invalidar"] = True
+                elif datos[atributo]:
+                    cambios.append(("quitar", campo, datos[atributo]))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_operaciones_masivas(orm_execute_state):
+    # INSERT/UPDATE/DELETE masivos no pasan por el flush: se invalida el índice completo
+    es_masiva = orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    if es_masiva and any(mapper.class_ is Persona for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info["disponibilidad_invalidar"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _aplicar_cambios_personas(session):
+    cambios = session.info.pop("disponibilidad_cambios", None)
+    if session.info.pop("disponibilidad_invalidar", False):
+        disponibilidad.invalidar()
+    elif cambios:
+        disponibilidad.aplicar_cambios(cambios)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_cambios_personas(session):
+    session.info.pop("disponibilidad_cambios", None)
+    session.info.pop("disponibilidad_invalidar", None)
@@ -0,0 +1,176 @@
+"""
+Publicación en proceso de los cambios de estado de las citas.
+
+Las conexiones de /citas/stream (Server-Sent Events) se suscriben por
+persona y reciben un evento cuando una cita en la que participan (como
+alumno o como personal asignado) se confirma, se cancela o se completa.
+
+Los eventos se detectan en el flush de la sesión y se publican solo después
+del commit, de modo que un rollback nunca genera notificaciones. La
+publicación es segura desde cualquier hilo: cada suscripción recibe los
+eventos en el event loop donde se creó.
+"""
+import asyncio
+import itertools
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.cita import Cita, EstadoCita, TipoCita
+
+# Estados que generan una notificación
+ESTADOS_NOTIFICADOS = (EstadoCita.CONFIRMADA, EstadoCita.CANCELADA, EstadoCita.COMPLETADA)
+
+
+def mensaje_notificacion(cita: Cita) -> Optional[str]:
+    """Texto de la notificación para el alumno según el estado de la cita."""
+    tipo = TipoCita(cita.tipo_cita).value if cita.tipo_cita else TipoCita.GENERAL.value
+    if cita.estado == EstadoCita.CONFIRMADA:
+        mensaje = f"Tu cita de tipo '{tipo}' ha sido confirmada"
+        if cita.fecha_confirmada:
+            mensaje += f" para el {cita.fecha_confirmada.strftime('%d/%m/%Y a las %H:%M')}"
+        return mensaje
+    if cita.estado == EstadoCita.CANCELADA:
+        return f"Tu cita de tipo '{tipo}' ha sido cancelada"
+    if cita.estado == EstadoCita.COMPLETADA:
+        return f"Tu cita de tipo '{tipo}' ha sido completada"
+    return None
+
+
+class Suscripcion:
+    """Cola de eventos de una conexión, ligada a su event loop."""
+
+    def __init__(self, id_persona: int, loop: asyncio.AbstractEventLoop):
+        self.id_persona = id_persona
+        self.loop = loop
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=settings.SSE_MAX_EVENTOS_PENDIENTES)
+
+    def _entregar(self, evento: dict) -> None:
+        # Un cliente lento no bloquea a los demás: se descarta el evento más antiguo
+        if self.cola.full():
+            self.cola.get_nowait()
+        self.cola.put_nowait(evento)
+
+    def entregar(self, evento: dict) -> None:
+        self.loop.call_soon_threadsafe(self._entregar, evento)
+
+
+class CanalEventos:
+    """Pub/sub en memoria de eventos de citas por persona."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suscripciones: Dict[int, Set[Suscripcion]] = {}
+        self._secuencia = itertools.count(1)
+
+    def suscribir(self, id_persona: int) -> Suscripcion:
+        """Registrar una suscripción en el event loop actual."""
+        suscripcion = Suscripcion(id_persona, asyncio.get_running_loop())
+        with self._lock:
+            self._suscripciones.setdefault(id_persona, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            suscripciones = self._suscripciones.get(suscripcion.id_persona)
+            if suscripciones:
+                suscripciones.discard(suscripcion)
+                if not suscripciones:
+                    del self._suscripciones[suscripcion.id_persona]
+
+    def suscriptores(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._suscripciones.values())
+
+    def publicar(self, ids_persona: Iterable[int], evento: dict) -> None:
+        """Enviar `evento` a todas las conexiones de las personas indicadas."""
+        evento = {"id_evento": next(self._secuencia), **evento}
+        with self._lock:
+            destinos = [
+                suscripcion
+                for id_persona in set(ids_persona)
+                for suscripcion in self._suscripciones.get(id_persona, ())
+            ]
+        for suscripcion in destinos:
+            try:
+                suscripcion.entregar(evento)
+            except RuntimeError:
+                # El event loop de la conexión ya se cerró
+                self.cancelar(suscripcion)
+
+
+# Canal global de eventos de citas
+canal_citas = CanalEventos()
+
+
+def _evento_cita(cita: Cita) -> dict:
+    estado = EstadoCita(cita.estado).value
+    return {
+        "id_cita": cita.id_cita,
+        "tipo_notificacion": f"cita_{estado}",
+        "estado": estado,
+        "mensaje": mensaje_notificacion(cita),
+        "fecha_cita": cita.fecha_confirmada.isoformat() if cita.fecha_confirmada else None,
+        "ubicacion": cita.ubicacion,
+        "id_alumno": cita.id_alumno,
+        "id_personal": cita.id_personal,
+    }
+
+
+def _debe_notificar(cita: Cita, estado_anterior, fecha_anterior) -> bool:
+    # Cambio de estado, o nueva fecha de una cita que sigue confirmada
+    return cita.estado in ESTADOS_NOTIFICADOS and (
+        cita.estado != estado_anterior
+        or (cita.estado == EstadoCita.CONFIRMADA and cita.fecha_confirmada != fecha_anterior)
+    )
+
+
+def _publicar(evento: dict) -> None:
+    canal_citas.publicar(
+        [i for i in (evento["id_alumno"], evento["id_personal"]) if i], evento
+    )
+
+
+def publicar_cambios_lote(anteriores: Dict[int, tuple], citas: Iterable[Cita]) -> None:
+    """
+    Publicar los cambios de citas actualizadas con UPDATE masivo, que no pasa
+    por el flush. `anteriores` mapea id_cita -> (estado, fecha_confirmada)
+    previos al UPDATE; se debe llamar después del commit.
+    """
+    for cita in citas:
+        estado, fecha = anteriores.get(cita.id_cita, (None, None))
+        if _debe_notificar(cita, estado, fecha):
+            _publicar(_evento_cita(cita))
+
+
+# --- Detección de cambios en la sesión ---
+
+@event.listens_for(Session, "after_flush")
+def _registrar_eventos_citas(session, flush_context):
+    pendientes: List[dict] = []
+    for obj in session.dirty:
+        if not isinstance(obj, Cita) or obj.estado not in ESTADOS_NOTIFICADOS:
+            continue
+        atributos = inspect(obj).attrs
+        # Cambio de estado, o nueva fecha de una cita que sigue confirmada
+        if atributos.estado.history.has_changes() or (
+            obj.estado == EstadoCita.CONFIRMADA
+            and atributos.fecha_confirmada.history.has_changes()
+        ):
+            pendientes.append(_evento_cita(obj))
+    if pendientes:
+        session.info.setdefault("eventos_citas", []).extend(pendientes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar_eventos_citas(session):
+    for evento in session.info.pop("eventos_citas", ()):
+        _publicar(evento)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_eventos_citas(session):
+    session.info.pop("eventos_citas", None)
@@ -0,0 +1,310 @@
+"""
+Importación masiva de personas en segundo plano (POST /personas/bulk-import).
+
+Una generación completa de alumnos (miles de filas) no cabe en una petición:
+con una consulta de unicidad, un bcrypt síncrono y un refresh por fila,
+bulk-create tarda minutos y ocupa un worker. Aquí cada importación es un
+trabajo que corre en un hilo propio (una importación a la vez por proceso,
+las demás esperan como "pendiente") y se consulta con
+GET /personas/bulk-import/{id}:
+
+1. Una consulta carga los correos y matrículas existentes en conjuntos, y
+   otra los ids de programas y grupos; cada fila se valida con
+   PersonaCreate y contra esos conjuntos (también contra las filas
+   anteriores de la misma importación).
+2. Las contraseñas se hashean en paralelo en un executor propio (ver
+   crear_executor_lote) y, por lotes de IMPORTACION_LOTE filas conforme
+   llegan los hashes, las filas se insertan con un INSERT multi-fila +
+   executemany para las asociaciones, un commit por lote. Si un lote choca con un registro concurrente (UNIQUE),
+   se reintenta fila por fila con SAVEPOINT para aislar las que fallan.
+
+Los errores se reportan por fila (índice en la petición). El estado y el
+progreso se guardan en la tabla importaciones_personas (en la misma
+transacción que cada lote), así que cualquier worker puede responder la
+consulta. Las importaciones terminadas se conservan IMPORTACION_ESTADO_TTL
+segundos.
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice, repeat
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.hashing import crear_executor_lote
+from app.core.security import get_password_hash
+from app.models.associations import persona_grupo, persona_programa
+from app.models.grupo import Grupo
+from app.models.importacion import ImportacionPersonas
+from app.models.persona import Persona
+from app.models.programa_educativo import ProgramaEducativo
+from app.schemas.persona import PersonaCreate
+from app.services.disponibilidad import disponibilidad
+
+logger = logging.getLogger(__name__)
+
+# Columnas de `personas` que se toman de PersonaCreate
+_COLUMNAS = [c for c in PersonaCreate.model_fields if c in Persona.__table__.columns]
+
+
+@dataclass
+class TrabajoImportacion:
+    """Estado de una importación en el worker que la ejecuta (ver ImportacionPersonas)."""
+    id: str
+    total: int
+    estado: str = "pendiente"
+    procesadas: int = 0
+    exitosas: int = 0
+    fallidas: int = 0
+    errores: List[Dict[str, Any]] = field(default_factory=list)
+    creada_en: datetime = field(default_factory=datetime.utcnow)
+    terminada_en: Optional[datetime] = None
+    error: Optional[str] = None
+
+    def fallar_fila(self, indice: int, error: str) -> None:
+        self.errores.append({"indice": indice, "error": error})
+        self.fallidas += 1
+        self.procesadas += 1
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+# Importaciones encoladas en este proceso: al apagar, las que no empezaron
+# se marcan como fallidas
+_encoladas: Dict[str, Tuple[Future, Callable[[], Session]]] = {}
+_lock = threading.Lock()
+
+
+def _obtener_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="importacion")
+        return _executor
+
+
+def _vencimiento() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.IMPORTACION_ESTADO_TTL)
+
+
+def _guardar(db: Session, trabajo: TrabajoImportacion) -> None:
+    """Escribir el estado del trabajo en su fila (se confirma con el commit del llamador)."""
+    valores = asdict(trabajo)
+    del valores["id"]
+    db.execute(
+        update(ImportacionPersonas).where(ImportacionPersonas.id == trabajo.id).values(**valores)
+    )
+
+
+def iniciar_importacion(items: List[Dict[str, Any]], sesiones: Callable[[], Session]) -> TrabajoImportacion:
+    """Registrar una importación y encolarla; `sesiones` crea las sesiones del trabajo."""
+    trabajo = TrabajoImportacion(id=uuid.uuid4().hex, total=len(items))
+    with sesiones() as db:
+        db.execute(delete(ImportacionPersonas).where(ImportacionPersonas.terminada_en < _vencimiento()))
+        db.add(ImportacionPersonas(**asdict(trabajo)))
+        db.commit()
+
+    futuro = _obtener_executor().submit(_ejecutar, trabajo, items, sesiones)
+    with _lock:
+        _encoladas[trabajo.id] = (futuro, sesiones)
+    futuro.add_done_callback(lambda _: _encoladas.pop(trabajo.id, None))
+    return trabajo
+
+
+def obtener_trabajo(db: Session, trabajo_id: str) -> Optional[ImportacionPersonas]:
+    """Estado de una importación de cualquier worker; None si no existe o ya venció."""
+    trabajo = db.get(ImportacionPersonas, trabajo_id)
+    if trabajo is None or (trabajo.terminada_en and trabajo.terminada_en < _vencimiento()):
+        return None
+    return trabajo
+
+
+def cerrar_importaciones() -> None:
+    """Descartar las importaciones pendientes (apagado de la API)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        encoladas = list(_encoladas.items())
+    if executor is None:
+        return
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for trabajo_id, (futuro, sesiones) in encoladas:
+        if not futuro.cancelled():
+            continue
+        try:
+            with sesiones() as db:
+                db.execute(
+                    update(ImportacionPersonas)
+                    .where(ImportacionPersonas.id == trabajo_id)
+                    .values(
+                        estado="fallida",
+                        error="La API se detuvo antes de iniciar la importación",
+                        terminada_en=datetime.utcnow(),
+                    )
+                )
+                db.commit()
+        except Exception:
+            logger.exception("No se pudo marcar la importación %s como fallida", trabajo_id)
+
+
+def _ejecutar(trabajo: TrabajoImportacion, items: List[Dict[str, Any]], sesiones: Callable[[], Session]) -> None:
+    trabajo.estado = "en_proceso"
+    try:
+        with sesiones() as db:
+            validas = _validar(db, trabajo, items)
+            _guardar(db, trabajo)
+            db.commit()
+            if validas:
+                workers = settings.IMPORTACION_HASH_WORKERS or os.cpu_count() or 1
+                executor = crear_executor_lote(workers)
+                try:
+                    # Un solo flujo de hashes para toda la importación: los
+                    # workers siguen hasheando mientras se inserta cada lote
+                    hashes = executor.map(
+                        get_password_hash,
+                        [datos.password for _, datos in validas],
+                        repeat(settings.BCRYPT_ROUNDS),
+                        chunksize=max(1, min(64, len(validas) // (workers * 4))),
+                    )
+                    for inicio in range(0, len(validas), settings.IMPORTACION_LOTE):
+                        lote = validas[inicio:inicio + settings.IMPORTACION_LOTE]
+                        _importar_lote(db, trabajo, lote, list(islice(hashes, len(lote))))
+                finally:
+                    executor.shutdown(wait=True, cancel_futures=True)
+        trabajo.estado = "completada"
+    except Exception as e:
+        logger.exception("Importación %s fallida", trabajo.id)
+        trabajo.estado = "fallida"
+        trabajo.error = str(e)
+    finally:
+        # El TTL del estado corre desde que termina
+        trabajo.terminada_en = datetime.utcnow()
+        try:
+            with sesiones() as db:
+                _guardar(db, trabajo)
+                db.commit()
+        except Exception:
+            logger.exception("No se pudo guardar el estado de la importación %s", trabajo.id)
+
+
+def _mensaje_validacion(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    )
+
+
+def _validar(db: Session, trabajo: TrabajoImportacion, items: List[Dict[str, Any]]) -> List[Tuple[int, PersonaCreate]]:
+    """Filas válidas (índice, datos); las demás se registran como errores."""
+    correos: Set[str] = set()
+    matriculas: Set[str] = set()
+    for correo, matricula in db.execute(select(Persona.correo_institucional, Persona.matricula)):
+        correos.add(correo)
+        if matricula:
+            matriculas.add(matricula)
+    programas = set(db.scalars(select(ProgramaEducativo.id)))
+    grupos = set(db.scalars(select(Grupo.id)))
+
+    validas = []
+    for indice, item in enumerate(items):
+        try:
+            datos = PersonaCreate.model_validate(item)
+        except ValidationError as e:
+            trabajo.fallar_fila(indice, _mensaje_validacion(e))
+            continue
+
+        # SEGURIDAD: la importación no crea administradores ni coordinadores
+        if datos.rol in ("admin", "coordinador"):
+            error = f"No se permite importar personas con rol {datos.rol.value}"
+        elif datos.correo_institucional in correos:
+            error = "El correo institucional ya está registrado"
+        elif datos.matricula in matriculas:
+            error = "La matrícula ya está registrada"
+        elif set(datos.programas_ids or []) - programas:
+            error = f"Programas inexistentes: {sorted(set(datos.programas_ids) - programas)}"
+        elif set(datos.grupos_ids or []) - grupos:
+            error = f"Grupos inexistentes: {sorted(set(datos.grupos_ids) - grupos)}"
+        else:
+            error = None
+
+        if error:
+            trabajo.fallar_fila(indice, error)
+            continue
+        correos.add(datos.correo_institucional)
+        matriculas.add(datos.matricula)
+        validas.append((indice, datos))
+    return validas
+
+
+def _fila(datos: PersonaCreate, hashed_password: str) -> Dict[str, Any]:
+    fila = datos.model_dump(mode="json", include=set(_COLUMNAS))
+    fila.update(hashed_password=hashed_password, is_active=True)
+    return fila
+
+
+def _insertar(db: Session, filas: List[Dict[str, Any]], lote: List[Tuple[int, PersonaCreate]]) -> List[int]:
+    """INSERT multi-fila de personas y executemany de sus asociaciones; devuelve los ids."""
+    # sort_by_parameter_order: los ids llegan en el orden de `filas`
+    ids = list(db.execute(
+        insert(Persona.__table__).returning(Persona.__table__.c.id, sort_by_parameter_order=True),
+        filas
+    ).scalars())
+    programas = [
+        {"persona_id": id_persona, "programa_id": id_programa}
+        for id_persona, (_, datos) in zip(ids, lote)
+        for id_programa in dict.fromkeys(datos.programas_ids or [])
+    ]
+    grupos = [
+        {"persona_id": id_persona, "grupo_id": id_grupo}
+        for id_persona, (_, datos) in zip(ids, lote)
+        for id_grupo in dict.fromkeys(datos.grupos_ids or [])
+    ]
+    if programas:
+        db.execute(insert(persona_programa), programas)
+    if grupos:
+        db.execute(insert(persona_grupo), grupos)
+    return ids
+
+
+def _importar_lote(
+    db: Session, trabajo: TrabajoImportacion, lote: List[Tuple[int, PersonaCreate]], hashes: List[str]
+) -> None:
+    filas = [_fila(datos, hashed) for (_, datos), hashed in zip(lote, hashes)]
+
+    try:
+        _insertar(db, filas, lote)
+        importadas = lote
+    except IntegrityError:
+        # Otro registro ocupó un correo o matrícula después de la validación,
+        # o la fila viola otra restricción de la tabla
+        db.rollback()
+        importadas = []
+        for fila, elemento in zip(filas, lote):
+            try:
+                with db.begin_nested():
+                    _insertar(db, [fila], [elemento])
+                importadas.append(elemento)
+            except IntegrityError as e:
+                trabajo.fallar_fila(elemento[0], f"No se pudo insertar la fila: {e.orig}")
+
+    # El progreso se confirma junto con las filas del lote
+    trabajo.exitosas += len(importadas)
+    trabajo.procesadas += len(importadas)
+    _guardar(db, trabajo)
+    db.commit()
+
+    # Los INSERT de Core no pasan por los eventos del ORM
+    disponibilidad.aplicar_cambios(
+        [("agregar", "correo", datos.correo_institucional) for _, datos in importadas]
+        + [("agregar", "matricula", datos.matricula) for _, datos in importadas]
+    )
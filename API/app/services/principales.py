@@ -0,0 +1,140 @@
+"""
+Caché de principales autenticados (usuario del token JWT).
+
+get_current_user solo necesita id, rol, is_active y correo de la persona
+del token. En lugar de cargar la fila completa de `personas` en cada
+petición se guarda un Principal en una caché LRU con TTL por id.
+
+La caché se invalida con eventos de SQLAlchemy cuando una Persona se
+modifica o se elimina (después del commit; un rollback no invalida), y se
+vacía con UPDATE/DELETE masivos sobre Persona. Los cambios hechos por
+otros workers se reflejan al vencer el TTL (PRINCIPALES_CACHE_TTL).
+
+Los handlers que necesitan el objeto ORM completo lo cargan con
+get_current_persona (app/utils/deps.py).
+"""
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import Select, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.persona import Persona
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Datos mínimos del usuario autenticado."""
+    id: int
+    rol: str
+    is_active: bool
+    correo_institucional: str
+
+
+cache_principales = TTLCache(
+    max_entries=settings.PRINCIPALES_CACHE_MAX,
+    ttl_seconds=settings.PRINCIPALES_CACHE_TTL
+)
+
+# Generación de la caché: una carga iniciada antes de una invalidación no
+# guarda su resultado (podría ser la versión anterior de la fila)
+_generacion = 0
+_lock = threading.Lock()
+
+
+def _consulta(id_persona: int) -> Select:
+    return select(
+        Persona.id, Persona.rol, Persona.is_active, Persona.correo_institucional
+    ).where(Persona.id == id_persona)
+
+
+def _clave(id_persona) -> Optional[int]:
+    try:
+        return int(id_persona)
+    except (TypeError, ValueError):
+        return None
+
+
+def _guardar(clave: int, generacion: int, fila) -> Optional[Principal]:
+    if fila is None:
+        return None
+    principal = Principal(*fila)
+    with _lock:
+        if generacion == _generacion:
+            cache_principales.set(clave, principal)
+    return principal
+
+
+def cargar_principal(db: Session, id_persona) -> Optional[Principal]:
+    """Principal de la persona `id_persona` (desde la caché o con una consulta de 4 columnas)."""
+    clave = _clave(id_persona)
+    if clave is None:
+        return None
+    principal = cache_principales.get(clave)
+    if principal is not None:
+        return principal
+    generacion = _generacion
+    return _guardar(clave, generacion, db.execute(_consulta(clave)).first())
+
+
+async def cargar_principal_async(db: AsyncSession, id_persona) -> Optional[Principal]:
+    """Variante de cargar_principal para AsyncSession."""
+    clave = _clave(id_persona)
+    if clave is None:
+        return None
+    principal = cache_principales.get(clave)
+    if principal is not None:
+        return principal
+    generacion = _generacion
+    return _guardar(clave, generacion, (await db.execute(_consulta(clave))).first())
+
+
+def invalidar_principal(id_persona: Optional[int] = None) -> None:
+    """Descartar un principal (o toda la caché si no se indica id)."""
+    global _generacion
+    with _lock:
+        _generacion += 1
+        if id_persona is None:
+            cache_principales.clear()
+        else:
+            cache_principales.invalidate(id_persona)
+
+
+# --- Invalidación con eventos de la sesión ---
+
+@event.listens_for(Session, "after_flush")
+def _registrar_personas_modificadas(session, flush_context):
+    ids = {
+        obj.id for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, Persona) and obj.id is not None
+    }
+    if ids:
+        session.info.setdefault("principales_invalidar", set()).update(ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_operaciones_masivas(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        mapper.class_ is Persona for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info["principales_vaciar"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_principales(session):
+    ids = session.info.pop("principales_invalidar", ())
+    if session.info.pop("principales_vaciar", False):
+        invalidar_principal()
+    else:
+        for id_persona in ids:
+            invalidar_principal(id_persona)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_invalidaciones(session):
+    session.info.pop("principales_invalidar", None)
+    session.info.pop("principales_vaciar", None)
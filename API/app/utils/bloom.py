@@ -0,0 +1,58 @@
+"""
+Filtro de Bloom: pertenencia aproximada a un conjunto en poco espacio.
+
+Un valor que no está en el filtro seguro no se agregó; uno que sí está
+pudo haberse agregado (falso positivo con probabilidad ~tasa_falsos_positivos
+mientras no se supere la capacidad). No admite quitar valores.
+"""
+import hashlib
+import math
+from typing import Iterable, Iterator
+
+
+class FiltroBloom:
+    """Arreglo de bits con k posiciones por valor (doble hashing sobre blake2b)."""
+
+    def __init__(self, capacidad: int, tasa_falsos_positivos: float = 0.01):
+        """
+        Args:
+            capacidad: Número de valores esperados
+            tasa_falsos_positivos: Probabilidad de falso positivo con `capacidad` valores
+        """
+        self.capacidad = max(1, capacidad)
+        bits = -self.capacidad * math.log(tasa_falsos_positivos) / math.log(2) ** 2
+        self.num_bits = max(8, int(math.ceil(bits)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacidad * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._valores = 0
+
+    @classmethod
+    def desde(cls, valores: Iterable[str], capacidad: int, tasa_falsos_positivos: float = 0.01) -> "FiltroBloom":
+        filtro = cls(capacidad, tasa_falsos_positivos)
+        for valor in valores:
+            filtro.agregar(valor)
+        return filtro
+
+    def _posiciones(self, valor: str) -> Iterator[int]:
+        digest = hashlib.blake2b(valor.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def agregar(self, valor: str) -> None:
+        for posicion in self._posiciones(valor):
+            self._bits[posicion >> 3] |= 1 << (posicion & 7)
+        self._valores += 1
+
+    def __contains__(self, valor: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._posiciones(valor))
+
+    def __len__(self) -> int:
+        """Valores agregados (con repeticiones)."""
+        return self._valores
+
+    @property
+    def saturado(self) -> bool:
+        """Se agregaron más valores que la capacidad: la tasa de falsos positivos ya no se cumple."""
+        return self._valores > self.capacidad
@@ -0,0 +1,72 @@
+"""
+Caché en memoria con expiración (TTL) y tamaño acotado (LRU).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Caché LRU acotada con expiración por entrada, segura entre hilos.
+
+    Pensada para resultados baratos de recalcular pero consultados con mucha
+    frecuencia (estadísticas, catálogos, principales autenticados).
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 15.0):
+        """
+        Args:
+            max_entries: Número máximo de entradas antes de descartar la menos usada
+            ttl_seconds: Segundos de vida de cada entrada
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Obtener un valor vigente o None si no existe o expiró."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expira, valor = item
+            if expira <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return valor
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Guardar un valor, descartando la entrada menos usada si se excede el tamaño."""
+        expira = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (expira, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Obtener un valor o calcularlo con `factory` y guardarlo."""
+        valor = self.get(key)
+        if valor is None:
+            valor = factory()
+            self.set(key, valor)
+        return valor
+
+    def invalidate(self, key: Hashable) -> None:
+        """Eliminar una entrada concreta."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vaciar la caché."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -1,52 +1,137 @@
 from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.security import ALGORITHM
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.models.persona import Persona
 from app.schemas.token import TokenPayload
+from app.services.principales import Principal, cargar_principal, cargar_principal_async
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> Persona:
+# Variante sin error automático: el token también puede llegar por query string
+oauth2_scheme_opcional = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
+
+
+def _decodificar_token(token: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No se pudo validar las credenciales",
         )
-    user = db.query(Persona).filter(Persona.id == token_data.sub).first()
+
+
+def _usuario_desde_token(db: Session, token: str) -> Principal:
+    token_data = _decodificar_token(token)
+    user = cargar_principal(db, token_data.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return user
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Principal del token (id, rol, is_active, correo) desde la caché de
+    principales; solo consulta la base de datos si no está en caché.
+    """
+    return _usuario_desde_token(db, token)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """Variante de get_current_user para endpoints async (AsyncSession)."""
+    token_data = _decodificar_token(token)
+    user = await cargar_principal_async(db, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     return user
 
 
+def get_current_active_user_stream(
+    db: Session = Depends(get_db),
+    token_header: Optional[str] = Depends(oauth2_scheme_opcional),
+    token: Optional[str] = Query(None),
+) -> Principal:
+    """
+    Usuario activo para conexiones de streaming (Server-Sent Events).
+
+    EventSource no permite enviar cabeceras, así que el token se acepta
+    también en el parámetro `token` de la URL.
+    """
+    token = token_header or token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No autenticado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = _usuario_desde_token(db, token)
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return user
+
+
 def get_current_active_user(
-    current_user: Persona = Depends(get_current_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Usuario inactivo")
     return current_user
 
 
-def check_admin_role(
-    current_user: Persona = Depends(get_current_active_user),
+async def get_current_active_user_async(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Principal:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return current_user
+
+
+def get_current_persona(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Persona:
+    """Objeto ORM completo del usuario activo, para handlers que lo leen o modifican."""
+    persona = db.get(Persona, current_user.id)
+    if not persona:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return persona
+
+
+async def get_current_persona_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user_async),
 ) -> Persona:
+    """Variante de get_current_persona para endpoints async (AsyncSession)."""
+    persona = await db.get(Persona, current_user.id)
+    if not persona:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return persona
+
+
+def check_admin_role(
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """Solo administradores tienen acceso completo incluyendo eliminaciones."""
     if current_user.rol != "admin":
         raise HTTPException(
@@ -57,8 +142,8 @@ def check_admin_role(
 
 
 def check_coordinador_role(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """Coordinadores tienen acceso administrativo excepto eliminaciones."""
     if current_user.rol not in ["admin", "coordinador"]:
         raise HTTPException(
@@ -69,8 +154,8 @@ def check_coordinador_role(
 
 
 def check_administrative_access(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Acceso administrativo para admin y coordinador.
     Permite gestión de personas, citas, reportes y configuraciones.
@@ -84,8 +169,8 @@ def check_administrative_access(
 
 
 def check_end_user_access(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Acceso de usuario final para docente, personal y alumno.
     Permite acceso a perfil propio, cuestionarios y funciones básicas.
@@ -101,8 +186,8 @@ def check_end_user_access(
 # DEPRECATED: Mantenidas temporalmente para compatibilidad
 # Serán reemplazadas gradualmente por el nuevo sistema de permisos
 def check_admin_or_coordinador_role(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """DEPRECATED: Usar check_administrative_access() en su lugar."""
     if current_user.rol not in ["admin", "coordinador"]:
         raise HTTPException(
@@ -113,8 +198,8 @@ def check_admin_or_coordinador_role(
 
 
 def check_user_level_access(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """DEPRECATED: Usar check_end_user_access() o get_current_active_user según el caso."""
     if current_user.rol not in ["admin", "coordinador", "personal", "docente", "alumno"]:
         raise HTTPException(
@@ -127,8 +212,8 @@ def check_user_level_access(
 # DEPRECATED: Estas funciones se mantienen temporalmente para compatibilidad
 # pero serán eliminadas en la próxima versión
 def check_personal_role(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     DEPRECATED: Usar check_administrative_access() para operaciones administrativas
     o check_end_user_access() para operaciones de usuario final.
@@ -145,8 +230,8 @@ def check_personal_role(
 
 
 def check_docente_role(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     DEPRECATED: Usar check_administrative_access() para operaciones administrativas
     o check_end_user_access() para operaciones de usuario final.
@@ -163,8 +248,8 @@ def check_docente_role(
 
 
 def check_deletion_permission(
-    current_user: Persona = Depends(get_current_active_user),
-) -> Persona:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Solo administradores pueden eliminar registros.
     Los coordinadores tienen acceso administrativo pero NO pueden eliminar.
@@ -0,0 +1,40 @@
+"""
+Revalidación HTTP con ETag.
+
+El ETag se calcula con un hash del cuerpo JSON; si el cliente envía el mismo
+valor en If-None-Match se responde 304 sin cuerpo.
+"""
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+
+def calcular_etag(cuerpo: bytes) -> str:
+    """ETag fuerte a partir del cuerpo serializado."""
+    return '"' + hashlib.blake2b(cuerpo, digest_size=16).hexdigest() + '"'
+
+
+def _coincide(if_none_match: str, etag: str) -> bool:
+    valores = [valor.strip() for valor in if_none_match.split(",")]
+    # La comparación de If-None-Match es débil: se ignora el prefijo W/
+    return "*" in valores or etag in (v[2:] if v.startswith("W/") else v for v in valores)
+
+
+def respuesta_con_etag(request: Request, contenido: Any) -> Response:
+    """
+    Serializar `contenido` a JSON con su ETag, o responder 304 si el cliente
+    ya tiene la misma versión.
+    """
+    cuerpo = json.dumps(
+        jsonable_encoder(contenido), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    etag = calcular_etag(cuerpo)
+    cabeceras = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _coincide(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+    return Response(content=cuerpo, media_type="application/json", headers=cabeceras)
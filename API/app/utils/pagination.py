@@ -0,0 +1,47 @@
+"""
+Utilidades de paginación por cursor (keyset).
+
+Los cursores son opacos para el cliente: un JSON codificado en base64 url-safe
+con los valores de la última fila devuelta.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+from fastapi import HTTPException, Response, status
+
+# Cabecera con el cursor de la siguiente página (se expone vía CORS)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Codificar los valores de la última fila en un cursor opaco."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodificar un cursor generado por encode_cursor.
+
+    Raises:
+        HTTPException: 400 si el cursor está mal formado
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        values = None
+
+    if not isinstance(values, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+    return values
+
+
+def set_next_cursor(response: Response, values: Dict[str, Any]) -> None:
+    """Publicar el cursor de la siguiente página en la cabecera de la respuesta."""
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(values)
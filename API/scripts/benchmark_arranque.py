@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque: importación en frío de app.main y latencia de la
+primera petición, con y sin calentamiento de cachés.
+
+Cada medición usa un proceso nuevo sobre una base SQLite temporal que ya
+está en la última revisión de Alembic (el caso normal de un worker):
+
+- importación: tiempo de `import app.main` en un intérprete limpio
+- arranque: desde lanzar uvicorn hasta que responde la primera petición
+- primera / segunda: latencia de las dos primeras peticiones a endpoints
+  con consultas (catálogos activos y cuestionarios asignados)
+
+Uso:
+    python scripts/benchmark_arranque.py [--repeticiones 3]
+"""
+
+import argparse
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+DIRECTORIO_API = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(DIRECTORIO_API)
+
+RUTAS = [
+    "/api/v1/catalogos/religiones/activas/",
+    "/api/v1/cuestionarios-usuario/asignados",
+]
+
+
+def preparar_base(url: str) -> int:
+    """Crear el esquema en la última revisión y un alumno; devuelve su id."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.migraciones import preparar_esquema
+    from app.models.persona import Persona
+
+    engine = create_engine(url)
+    preparar_esquema(engine)
+    with sessionmaker(bind=engine)() as db:
+        alumno = Persona(
+            sexo="otro", genero="otro", edad=20, estado_civil="soltero",
+            lugar_origen="Benchmark", colonia_residencia_actual="Benchmark",
+            celular="0000000000", correo_institucional="alumno@benchmark.edu",
+            rol="alumno", is_active=True, hashed_password="x"
+        )
+        db.add(alumno)
+        db.commit()
+        id_alumno = alumno.id
+    engine.dispose()
+    return id_alumno
+
+
+def medir_importacion(entorno: dict) -> float:
+    codigo = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], env=entorno, cwd=DIRECTORIO_API,
+        capture_output=True, text=True, check=True
+    )
+    return float(salida.stdout.strip().splitlines()[-1]) * 1000
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def medir_servidor(entorno: dict, headers: dict) -> tuple:
+    """Lanzar uvicorn; devuelve (ms hasta la primera respuesta, ms 1ª petición, ms 2ª petición)."""
+    puerto = puerto_libre()
+    base = f"http://127.0.0.1:{puerto}"
+    t0 = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(puerto),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=DIRECTORIO_API, env=entorno,
+    )
+    try:
+        while True:
+            if proceso.poll() is not None:
+                raise RuntimeError("uvicorn terminó antes de aceptar conexiones")
+            try:
+                requests.get(f"{base}/", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.01)
+        listo = (time.perf_counter() - t0) * 1000
+
+        latencias = []
+        for _ in range(2):
+            inicio = time.perf_counter()
+            for ruta in RUTAS:
+                assert requests.get(f"{base}{ruta}", headers=headers, timeout=30).status_code == 200
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        return (listo, *latencias)
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticiones", type=int, default=3, help="Procesos por configuración")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        url = f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        os.environ.update(DATABASE_URL=url, SECRET_KEY=secrets.token_urlsafe(32))
+        from app.core.security import create_access_token
+
+        headers = {"Authorization": f"Bearer {create_access_token(preparar_base(url))}"}
+
+        print(f"{'calentamiento':<14} {'importación':>12} {'arranque':>10} {'1ª petición':>12} {'2ª petición':>12}")
+        for calentar in ("true", "false"):
+            entorno = dict(os.environ, PYTHONPATH=DIRECTORIO_API, CALENTAR_CACHES_AL_INICIAR=calentar)
+            importacion = [medir_importacion(entorno) for _ in range(args.repeticiones)]
+            servidor = [medir_servidor(entorno, headers) for _ in range(args.repeticiones)]
+            listo, primera, segunda = (statistics.median(col) for col in zip(*servidor))
+            print(
+                f"{'sí' if calentar == 'true' else 'no':<14} {statistics.median(importacion):>9.1f} ms"
+                f" {listo:>7.1f} ms {primera:>9.1f} ms {segunda:>9.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
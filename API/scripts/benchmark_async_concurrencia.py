@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de los endpoints de lectura: síncronos (threadpool) vs.
+asíncronos (AsyncSession + aiosqlite).
+
+Levanta uvicorn sobre una base SQLite temporal y lanza peticiones
+concurrentes contra pares de endpoints equivalentes:
+
+- /personas/mi-perfil/ (def, Session) vs. /auth/test-token (async def)
+- /citas/solicitudes   (def, Session) vs. /citas/         (async def)
+
+Los endpoints `def` ocupan un hilo del threadpool de AnyIO (40 por
+defecto) en cada paso síncrono (dependencias y endpoint). Con más clientes
+que hilos y conexiones del pool (DB_POOL_SIZE + DB_MAX_OVERFLOW), los
+hilos quedan esperando una conexión mientras las peticiones que ya la
+tienen esperan un hilo para terminar: todas expiran tras DB_POOL_TIMEOUT.
+Los endpoints async no ocupan hilos del threadpool y solo hacen cola en el
+pool de conexiones.
+
+Resultado de referencia (1000 peticiones, 100 clientes): los endpoints
+`def` fallan por timeout en todas las peticiones; test-token async
+~86 req/s y /citas/ async ~55 req/s sin errores. Con 10 clientes ambos
+caminos rinden de forma parecida.
+
+Uso:
+    python scripts/benchmark_async_concurrencia.py [--peticiones 1000] [--concurrencia 10 50 100]
+"""
+
+import argparse
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DIRECTORIO_API = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(DIRECTORIO_API)
+
+PARES = [
+    ("perfil (def)", "/api/v1/personas/mi-perfil/"),
+    ("test-token (async)", "/api/v1/auth/test-token"),
+    ("solicitudes (def)", "/api/v1/citas/solicitudes?limit=50"),
+    ("citas (async)", "/api/v1/citas/?limit=50"),
+]
+
+
+def preparar_base(url: str) -> int:
+    """Crear el esquema, un administrador y citas de ejemplo; devuelve el id del admin."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401  Registrar todos los modelos
+    from app.db.database import Base
+    from app.models.cita import Cita, EstadoCita
+    from app.models.persona import Persona
+    from app.models.programa_educativo import ProgramaEducativo
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    datos = dict(
+        sexo="otro", genero="otro", edad=20, estado_civil="soltero",
+        lugar_origen="Benchmark", colonia_residencia_actual="Benchmark",
+        celular="0000000000", is_active=True, hashed_password="x"
+    )
+    with Session() as db:
+        admin = Persona(correo_institucional="admin@benchmark.edu", rol="admin", **datos)
+        admin.programas.append(ProgramaEducativo(nombre_programa="Benchmark", clave_programa="BEN"))
+        db.add(admin)
+        alumnos = [
+            Persona(correo_institucional=f"alumno{i}@benchmark.edu", rol="alumno", **datos)
+            for i in range(50)
+        ]
+        db.add_all(alumnos)
+        db.flush()
+        db.add_all([
+            Cita(id_alumno=alumnos[i % 50].id, motivo=f"Benchmark {i}", estado=EstadoCita.PENDIENTE)
+            for i in range(500)
+        ])
+        db.commit()
+        id_admin = admin.id
+    engine.dispose()
+    return id_admin
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def esperar_servidor(base: str, proceso: subprocess.Popen) -> None:
+    for _ in range(100):
+        if proceso.poll() is not None:
+            raise RuntimeError("uvicorn terminó antes de aceptar conexiones")
+        try:
+            requests.get(f"{base}/", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn no respondió a tiempo")
+
+
+def medir(base: str, ruta: str, headers: dict, peticiones: int, concurrencia: int):
+    """Lanzar `peticiones` GET con `concurrencia` clientes; devuelve (req/s, p50, p95, errores)."""
+    local = threading.local()
+    latencias = []
+    errores = 0
+
+    def una_peticion(_):
+        if not hasattr(local, "sesion"):
+            local.sesion = requests.Session()
+        t0 = time.perf_counter()
+        try:
+            codigo = local.sesion.get(f"{base}{ruta}", headers=headers, timeout=60).status_code
+        except requests.RequestException:
+            codigo = None
+        return time.perf_counter() - t0, codigo
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+        for latencia, codigo in executor.map(una_peticion, range(peticiones)):
+            latencias.append(latencia)
+            if codigo != 200:
+                errores += 1
+    transcurrido = time.perf_counter() - t0
+
+    latencias.sort()
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    return peticiones / transcurrido, statistics.median(latencias) * 1000, p95 * 1000, errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--peticiones", type=int, default=1000, help="Peticiones por endpoint y nivel")
+    parser.add_argument("--concurrencia", type=int, nargs="+", default=[10, 50, 100],
+                        help="Clientes concurrentes a probar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        url = f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        entorno = dict(os.environ, DATABASE_URL=url, SECRET_KEY=secrets.token_urlsafe(32))
+        # La configuración se lee al importar: debe ver la misma base y llave
+        os.environ.update(DATABASE_URL=entorno["DATABASE_URL"], SECRET_KEY=entorno["SECRET_KEY"])
+
+        from app.core.security import create_access_token
+
+        id_admin = preparar_base(url)
+        headers = {"Authorization": f"Bearer {create_access_token(id_admin)}"}
+
+        puerto = puerto_libre()
+        base = f"http://127.0.0.1:{puerto}"
+        proceso = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(puerto),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=directorio, env=dict(entorno, PYTHONPATH=DIRECTORIO_API),
+        )
+        try:
+            esperar_servidor(base, proceso)
+            print(f"{args.peticiones} peticiones por endpoint y nivel de concurrencia\n")
+            print(f"{'endpoint':<20} {'clientes':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errores':>8}")
+            for concurrencia in args.concurrencia:
+                for nombre, ruta in PARES:
+                    # Calentamiento: conexiones del pool y cachés de SQLite
+                    medir(base, ruta, headers, min(100, args.peticiones), concurrencia)
+                    rps, p50, p95, errores = medir(base, ruta, headers, args.peticiones, concurrencia)
+                    print(f"{nombre:<20} {concurrencia:>8} {rps:>9.1f} {p50:>9.1f} {p95:>9.1f} {errores:>8}")
+                print()
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+
+if __name__ == "__main__":
+    main()
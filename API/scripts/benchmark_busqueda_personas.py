@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda de personas (GET /personas/search/) con muchas filas.
+
+Crea una base SQLite temporal con N personas (índices FTS5 y de expresión
+incluidos, igual que create_all) y mide la mediana de latencia por consulta
+de la búsqueda anterior (contains() sobre cinco columnas, todas las
+coincidencias) y de la actual (celular/matrícula por prefijo normalizado +
+FTS5 rankeado, limitada a --limit resultados).
+
+Resultado de referencia con 200 000 personas: la búsqueda anterior tarda
+~100-1000 ms por consulta (recorre la tabla completa y materializa todas las
+coincidencias); la actual ~0.3-6 ms para celulares, matrículas y palabras
+poco frecuentes y ~50 ms para palabras presentes en el 10% de las filas
+(bm25 puntúa todas las coincidencias antes de limitar).
+
+Uso:
+    python scripts/benchmark_busqueda_personas.py [--personas 200000] [--repeticiones 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Agregar el directorio padre al path para importar módulos de la app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, or_  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401  Registrar todos los modelos
+from app.db.database import Base  # noqa: E402
+from app.db.fts import expresion_fts  # noqa: E402
+from app.models.persona import Persona  # noqa: E402
+from app.routes.persona import (  # noqa: E402
+    _buscar_personas_fts, _buscar_personas_identificador
+)
+
+NOMBRES = ["maria", "jose", "juan", "ana", "luis", "sofia", "carlos", "lucia", "miguel", "elena"]
+APELLIDOS = ["lopez", "garcia", "martinez", "hernandez", "gonzalez", "perez", "sanchez", "ramirez"]
+CIUDADES = ["Mexicali", "Tijuana", "Ensenada", "Tecate", "San Felipe", "Rosarito", "San Quintín"]
+COLONIAS = ["Centro", "Pueblo Nuevo", "Nueva Esperanza", "Villa Verde", "Las Fuentes", "Hidalgo"]
+
+CONSULTAS = ["maria", "garc", "tijuana", "pueblo nuevo", "686-123", "A0012", "sin coincidencias"]
+
+
+def poblar(engine, total: int) -> None:
+    azar = random.Random(42)
+    filas = []
+    for i in range(total):
+        nombre, apellido = azar.choice(NOMBRES), azar.choice(APELLIDOS)
+        filas.append(dict(
+            sexo="otro", genero="otro", edad=20, estado_civil="soltero",
+            lugar_origen=azar.choice(CIUDADES),
+            colonia_residencia_actual=azar.choice(COLONIAS),
+            celular=f"{azar.choice(['686', '664', '646'])}-{azar.randrange(10**7):07d}",
+            correo_institucional=f"{nombre}.{apellido}{i}@uabc.edu.mx",
+            matricula=f"A{i:07d}", rol="alumno", is_active=True, hashed_password="x",
+        ))
+    with engine.begin() as conn:
+        for inicio in range(0, total, 10000):
+            conn.execute(insert(Persona), filas[inicio:inicio + 10000])
+        conn.exec_driver_sql("ANALYZE")
+
+
+def busqueda_anterior(db, q: str) -> int:
+    return len(db.query(Persona).filter(
+        or_(
+            Persona.correo_institucional.contains(q),
+            Persona.matricula.contains(q),
+            Persona.celular.contains(q),
+            Persona.lugar_origen.contains(q),
+            Persona.colonia_residencia_actual.contains(q)
+        )
+    ).all())
+
+
+def busqueda_actual(db, q: str, limit: int) -> int:
+    ids = _buscar_personas_identificador(db, q, limit)
+    ids += _buscar_personas_fts(db, expresion_fts(q), limit + len(ids))
+    ids = list(dict.fromkeys(ids))[:limit]
+    return len(db.query(Persona).filter(Persona.id.in_(ids)).all()) if ids else 0
+
+
+def mediana_ms(funcion, repeticiones: int) -> tuple:
+    tiempos, resultado = [], 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--personas", type=int, default=200000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        engine = create_engine(f"sqlite:///{os.path.join(directorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        inicio = time.perf_counter()
+        poblar(engine, args.personas)
+        print(f"{args.personas} personas creadas en {time.perf_counter() - inicio:.1f} s\n")
+
+        db = sessionmaker(bind=engine)()
+        print(f"{'consulta':<20} {'anterior ms':>12} {'filas':>7} {'actual ms':>10} {'filas':>6}")
+        for q in CONSULTAS:
+            anterior, filas_anterior = mediana_ms(lambda: busqueda_anterior(db, q), max(1, args.repeticiones // 4))
+            actual, filas_actual = mediana_ms(lambda: busqueda_actual(db, q, args.limit), args.repeticiones)
+            print(f"{q:<20} {anterior:>12.1f} {filas_anterior:>7} {actual:>10.2f} {filas_actual:>6}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las operaciones masivas de citas (bulk-create, bulk-update, bulk-delete).
+
+Ejecuta los endpoints en proceso (TestClient) contra una base SQLite temporal,
+por lo que no requiere el servidor en ejecución.
+
+Uso:
+    python scripts/benchmark_citas_bulk.py [--items 10000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio padre al path para importar módulos de la app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  Registrar todos los modelos
+from app.db.database import Base, get_db
+from app.main import app
+from app.models.persona import Persona
+from app.utils.deps import check_admin_role
+
+
+def medir(nombre: str, funcion):
+    """Ejecutar `funcion` e imprimir el tiempo transcurrido."""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    transcurrido = time.perf_counter() - inicio
+    print(f"{nombre:<14} {transcurrido * 1000:>10.1f} ms")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000, help="Elementos por petición")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directorio, 'bench.db')}",
+            connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = SessionBench()
+        admin = Persona(
+            sexo="otro", genero="otro", edad=30, estado_civil="soltero",
+            lugar_origen="Sistema", colonia_residencia_actual="Sistema",
+            celular="0000000000", correo_institucional="admin@sistema.edu",
+            rol="admin", is_active=True, hashed_password="x"
+        )
+        db.add(admin)
+        db.commit()
+        db.refresh(admin)
+
+        def override_get_db():
+            session = SessionBench()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[check_admin_role] = lambda: admin
+
+        client = TestClient(app)
+        n = args.items
+        print(f"Operaciones masivas con {n} citas\n")
+
+        items = [
+            {"id_alumno": admin.id, "motivo": f"Cita generada para benchmark {i}"}
+            for i in range(n)
+        ]
+        creadas = medir("bulk-create", lambda: client.post(
+            "/api/v1/citas/bulk-create?detalle=true", json={"items": items}
+        ).json())
+        ids = [r["id_cita"] for r in creadas["resultados"] if r["exito"]]
+
+        cambios = [
+            {"id_cita": cita_id, "estado": "confirmada", "ubicacion": f"Cubículo {i % 10}"}
+            for i, cita_id in enumerate(ids)
+        ]
+        medir("bulk-update", lambda: client.put(
+            "/api/v1/citas/bulk-update?detalle=true", json={"items": cambios}
+        ).json())
+
+        medir("bulk-delete", lambda: client.post(
+            "/api/v1/citas/bulk-delete", json={"ids": ids}
+        ).json())
+
+        app.dependency_overrides.clear()
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la importación masiva de personas: bulk-create (una consulta
+de unicidad, un bcrypt y un refresh por fila) contra bulk-import (trabajo
+en segundo plano con hash en paralelo e inserción por lotes).
+
+Ejecuta los endpoints en proceso (TestClient) contra una base SQLite
+temporal, por lo que no requiere el servidor en ejecución. Con costo de
+bcrypt 12 cada hash toma ~250-400 ms de CPU: el tiempo de ambos caminos lo
+domina el hash, y bulk-import escala con los núcleos (--workers) mientras
+bulk-create usa a lo más HASH_WORKERS y ocupa la petición todo ese tiempo.
+
+Resultado de referencia en 1 núcleo: con --filas 2000 --rounds 4 (el hash
+casi no cuesta) bulk-create ~10.4 s y bulk-import ~5.9 s; con --filas 500
+--rounds 8 ~15.9 s contra ~13.6 s, porque ahí el hash es casi todo el
+tiempo y un núcleo no permite paralelizarlo. Con N núcleos el hash de
+bulk-import se divide entre N.
+
+Uso:
+    python scripts/benchmark_importacion_personas.py [--filas 5000] [--rounds 12] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio padre al path para importar módulos de la app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401  Registrar todos los modelos
+from app.core.config import settings  # noqa: E402
+from app.db.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.persona import Persona  # noqa: E402
+from app.utils.deps import check_admin_role  # noqa: E402
+
+
+def filas(n: int, prefijo: str) -> list:
+    return [
+        dict(
+            sexo="otro", genero="otro", edad=19, estado_civil="soltero",
+            lugar_origen="Mexicali", colonia_residencia_actual="Centro",
+            celular="6860000000", correo_institucional=f"{prefijo}{i}@uabc.edu.mx",
+            matricula=f"{prefijo.upper()}{i:06d}", password="secreto123",
+        )
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS, help="Costo de bcrypt")
+    parser.add_argument("--workers", type=int, default=None, help="Workers de hash de bulk-import")
+    parser.add_argument("--sin-bulk-create", action="store_true", help="Medir solo bulk-import")
+    args = parser.parse_args()
+
+    settings.BCRYPT_ROUNDS = args.rounds
+    settings.IMPORTACION_HASH_WORKERS = args.workers
+    settings.ADMISION_HABILITADA = False
+
+    with tempfile.TemporaryDirectory() as directorio:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directorio, 'bench.db')}",
+            connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = SessionBench()
+        admin = Persona(
+            sexo="otro", genero="otro", edad=30, estado_civil="soltero",
+            lugar_origen="Sistema", colonia_residencia_actual="Sistema",
+            celular="0000000000", correo_institucional="admin@sistema.edu",
+            rol="admin", is_active=True, hashed_password="x"
+        )
+        db.add(admin)
+        db.commit()
+        db.refresh(admin)
+
+        def override_get_db():
+            session = SessionBench()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[check_admin_role] = lambda: admin
+
+        print(f"Importación de {args.filas} personas (bcrypt {args.rounds})\n")
+        client = TestClient(app)
+        if not args.sin_bulk_create:
+            inicio = time.perf_counter()
+            response = client.post("/api/v1/personas/bulk-create", json={"items": filas(args.filas, "c")})
+            print(f"{'bulk-create':<12} {time.perf_counter() - inicio:>8.1f} s  "
+                  f"({len(response.json())} creadas)")
+
+        inicio = time.perf_counter()
+        trabajo = client.post("/api/v1/personas/bulk-import", json={"items": filas(args.filas, "i")}).json()
+        respuesta = time.perf_counter() - inicio
+        while trabajo["estado"] in ("pendiente", "en_proceso"):
+            time.sleep(0.2)
+            trabajo = client.get(f"/api/v1/personas/bulk-import/{trabajo['id']}").json()
+        print(f"{'bulk-import':<12} {time.perf_counter() - inicio:>8.1f} s  "
+              f"({trabajo['exitosas']} creadas, {trabajo['fallidas']} con error; "
+              f"respuesta inicial en {respuesta * 1000:.0f} ms)")
+
+        app.dependency_overrides.clear()
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark de logins concurrentes junto con tráfico mixto.
+
+Levanta uvicorn sobre una base SQLite temporal y, durante --duracion
+segundos, lanza a la vez:
+
+- clientes de login: POST /auth/login en ciclo (bcrypt en cada uno)
+- clientes mixtos: GET a endpoints de lectura con token
+
+Reporta p50/p99 de los endpoints que no son login y los logins por
+segundo, para cada executor de hash (HASH_EXECUTOR) y una línea base sin
+logins. Los logins rechazados por saturación (503) se cuentan aparte: son
+el límite de concurrencia trabajando, no errores.
+
+Resultado de referencia (1 núcleo, 20 clientes de login y 5 mixtos): sin
+logins p99 ~90 ms; con bcrypt en procesos (nice 10) p99 ~130 ms y en
+hilos ~250 ms. Antes de liberar la conexión de la base antes del hash, los
+logins en espera retenían el pool async y el p99 mixto subía a ~2.7 s.
+
+Uso:
+    python scripts/benchmark_login_concurrente.py [--duracion 15] [--logins 30] [--mixtos 10]
+"""
+
+import argparse
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+DIRECTORIO_API = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(DIRECTORIO_API)
+
+PASSWORD = "benchmark123"
+RUTAS_MIXTAS = [
+    "/api/v1/catalogos/religiones/activas/",
+    "/api/v1/citas/?limit=20",
+    "/api/v1/personas/mi-perfil/",
+]
+
+
+def preparar_base(url: str, usuarios: int) -> int:
+    """Crear el esquema, un administrador y `usuarios` alumnos; devuelve el id del admin."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.security import get_password_hash
+    from app.db.migraciones import preparar_esquema
+    from app.models.persona import Persona
+
+    engine = create_engine(url)
+    preparar_esquema(engine)
+    hashed = get_password_hash(PASSWORD)
+    datos = dict(
+        sexo="otro", genero="otro", edad=20, estado_civil="soltero",
+        lugar_origen="Benchmark", colonia_residencia_actual="Benchmark",
+        celular="0000000000", is_active=True, hashed_password=hashed
+    )
+    with sessionmaker(bind=engine)() as db:
+        admin = Persona(correo_institucional="admin@benchmark.edu", rol="admin", **datos)
+        db.add(admin)
+        db.add_all([
+            Persona(correo_institucional=f"alumno{i}@benchmark.edu", rol="alumno", **datos)
+            for i in range(usuarios)
+        ])
+        db.commit()
+        id_admin = admin.id
+    engine.dispose()
+    return id_admin
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def esperar_servidor(base: str, proceso: subprocess.Popen) -> None:
+    for _ in range(100):
+        if proceso.poll() is not None:
+            raise RuntimeError("uvicorn terminó antes de aceptar conexiones")
+        try:
+            requests.get(f"{base}/", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn no respondió a tiempo")
+
+
+def percentil(valores: list, p: float) -> float:
+    valores = sorted(valores)
+    return valores[max(0, int(len(valores) * p) - 1)] * 1000 if valores else float("nan")
+
+
+def escenario(base: str, headers: dict, duracion: float, logins: int, mixtos: int) -> dict:
+    """Correr clientes de login y mixtos durante `duracion` segundos."""
+    fin = time.perf_counter() + duracion
+    lock = threading.Lock()
+    resultado = {"latencias": [], "errores": 0, "logins": 0, "saturados": 0}
+
+    def cliente_login(i: int):
+        sesion = requests.Session()
+        datos = {"username": f"alumno{i}@benchmark.edu", "password": PASSWORD}
+        while time.perf_counter() < fin:
+            try:
+                codigo = sesion.post(f"{base}/api/v1/auth/login", data=datos, timeout=60).status_code
+            except requests.RequestException:
+                codigo = None
+            with lock:
+                if codigo == 200:
+                    resultado["logins"] += 1
+                elif codigo == 503:
+                    resultado["saturados"] += 1
+
+    def cliente_mixto(i: int):
+        sesion = requests.Session()
+        n = i
+        while time.perf_counter() < fin:
+            ruta = RUTAS_MIXTAS[n % len(RUTAS_MIXTAS)]
+            n += 1
+            t0 = time.perf_counter()
+            try:
+                codigo = sesion.get(f"{base}{ruta}", headers=headers, timeout=60).status_code
+            except requests.RequestException:
+                codigo = None
+            with lock:
+                resultado["latencias"].append(time.perf_counter() - t0)
+                if codigo != 200:
+                    resultado["errores"] += 1
+
+    hilos = [threading.Thread(target=cliente_login, args=(i,)) for i in range(logins)]
+    hilos += [threading.Thread(target=cliente_mixto, args=(i,)) for i in range(mixtos)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duracion", type=float, default=15, help="Segundos por escenario")
+    parser.add_argument("--logins", type=int, default=30, help="Clientes de login concurrentes")
+    parser.add_argument("--mixtos", type=int, default=10, help="Clientes de tráfico mixto")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        url = f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        os.environ.update(DATABASE_URL=url, SECRET_KEY=secrets.token_urlsafe(32))
+        from app.core.security import create_access_token
+
+        headers = {"Authorization": f"Bearer {create_access_token(preparar_base(url, args.logins))}"}
+
+        print(f"{args.logins} clientes de login y {args.mixtos} mixtos durante {args.duracion:.0f} s\n")
+        print(f"{'escenario':<18} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8} {'logins/s':>9} {'503':>6}")
+        for nombre, executor, logins in (
+            ("sin logins", "proceso", 0),
+            ("hash en hilos", "hilo", args.logins),
+            ("hash en procesos", "proceso", args.logins),
+        ):
+            puerto = puerto_libre()
+            base = f"http://127.0.0.1:{puerto}"
+            proceso = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(puerto),
+                 "--log-level", "warning", "--no-access-log"],
+                cwd=directorio, env=dict(os.environ, PYTHONPATH=DIRECTORIO_API, HASH_EXECUTOR=executor),
+            )
+            try:
+                esperar_servidor(base, proceso)
+                r = escenario(base, headers, args.duracion, logins, args.mixtos)
+            finally:
+                proceso.terminate()
+                proceso.wait()
+            print(
+                f"{nombre:<18} {statistics.median(r['latencias']) * 1000:>9.1f}"
+                f" {percentil(r['latencias'], 0.99):>9.1f} {r['errores']:>8}"
+                f" {r['logins'] / args.duracion:>9.1f} {r['saturados']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
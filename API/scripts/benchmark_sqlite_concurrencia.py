@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escrituras concurrentes en SQLite: motor por defecto vs.
+motor configurado (create_db_engine: WAL, synchronous=NORMAL, busy_timeout...).
+
+Simula varios workers de uvicorn con procesos independientes que escriben a
+la vez sobre el mismo archivo: cada transacción crea una cita, lee las citas
+del alumno y confirma la cita (patrón de confirmaciones y autoguardado).
+
+Uso:
+    python scripts/benchmark_sqlite_concurrencia.py [--workers 4] [--transacciones 200]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio padre al path para importar módulos de la app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  Registrar todos los modelos
+from app.db.database import Base, create_db_engine
+from app.models.cita import Cita, EstadoCita
+from app.models.persona import Persona
+
+
+def crear_motor(modo: str, url: str):
+    if modo == "por_defecto":
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_db_engine(url)
+
+
+def preparar_base(url: str) -> int:
+    """Crear el esquema y un alumno; devuelve su id."""
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        alumno = Persona(
+            sexo="otro", genero="otro", edad=20, estado_civil="soltero",
+            lugar_origen="Benchmark", colonia_residencia_actual="Benchmark",
+            celular="0000000000", correo_institucional="alumno@benchmark.edu",
+            rol="alumno", is_active=True, hashed_password="x"
+        )
+        db.add(alumno)
+        db.commit()
+        id_alumno = alumno.id
+    engine.dispose()
+    return id_alumno
+
+
+def worker(modo: str, url: str, id_alumno: int, transacciones: int, inicio, resultados):
+    engine = crear_motor(modo, url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    exitosas = bloqueos = 0
+
+    inicio.wait()
+    for i in range(transacciones):
+        try:
+            with Session() as db:
+                cita = Cita(id_alumno=id_alumno, motivo=f"Benchmark {os.getpid()} {i}")
+                db.add(cita)
+                db.commit()
+
+                db.query(func.count(Cita.id_cita)).filter(Cita.id_alumno == id_alumno).scalar()
+
+                cita.estado = EstadoCita.CONFIRMADA
+                db.commit()
+            exitosas += 1
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            bloqueos += 1
+
+    engine.dispose()
+    resultados.put((exitosas, bloqueos))
+
+
+def ejecutar(modo: str, workers: int, transacciones: int) -> None:
+    with tempfile.TemporaryDirectory() as directorio:
+        url = f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        id_alumno = preparar_base(url)
+
+        inicio = multiprocessing.Event()
+        resultados = multiprocessing.Queue()
+        procesos = [
+            multiprocessing.Process(
+                target=worker, args=(modo, url, id_alumno, transacciones, inicio, resultados)
+            )
+            for _ in range(workers)
+        ]
+        for proceso in procesos:
+            proceso.start()
+
+        # Dar tiempo a que todos los procesos importen la app antes de arrancar
+        time.sleep(2)
+        t0 = time.perf_counter()
+        inicio.set()
+        totales = [resultados.get() for _ in procesos]
+        transcurrido = time.perf_counter() - t0
+        for proceso in procesos:
+            proceso.join()
+
+    exitosas = sum(t[0] for t in totales)
+    bloqueos = sum(t[1] for t in totales)
+    print(
+        f"{modo:<12} {exitosas:>8} {bloqueos:>10} {transcurrido:>9.2f} s"
+        f" {exitosas / transcurrido:>10.1f} tx/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4, help="Procesos escritores")
+    parser.add_argument("--transacciones", type=int, default=200, help="Transacciones por proceso")
+    args = parser.parse_args()
+
+    print(f"{args.workers} procesos x {args.transacciones} transacciones\n")
+    print(f"{'motor':<12} {'exitosas':>8} {'bloqueadas':>10} {'tiempo':>11} {'throughput':>13}")
+    for modo in ("por_defecto", "configurado"):
+        ejecutar(modo, args.workers, args.transacciones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Latencia de verificación de bcrypt por costo en este equipo.
+
+Para cada costo reporta la mediana de verificar una contraseña y los
+logins por segundo que puede atender un worker de hash, y recomienda el
+mayor costo que no excede --objetivo-ms (el mismo criterio que usa el
+arranque con BCRYPT_OBJETIVO_MS).
+
+Subir un punto de costo duplica el trabajo de un atacante por contraseña,
+pero también el tiempo de cada login: el costo recomendado debe fijarse en
+el entorno (BCRYPT_ROUNDS) para que todos los workers lo compartan. Los
+hashes existentes se actualizan al costo nuevo en el siguiente login.
+
+Uso:
+    python scripts/calibrar_bcrypt.py [--objetivo-ms 250] [--desde 10] [--hasta 14]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import medir_verificacion_ms  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objetivo-ms", type=float, default=250, help="Latencia objetivo de una verificación")
+    parser.add_argument("--desde", type=int, default=settings.BCRYPT_ROUNDS_MIN, help="Costo mínimo a medir")
+    parser.add_argument("--hasta", type=int, default=14, help="Costo máximo a medir")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Verificaciones por costo")
+    args = parser.parse_args()
+
+    recomendado = args.desde
+    print(f"{'costo':>5} {'verificación ms':>16} {'logins/s por worker':>20}")
+    for rounds in range(args.desde, args.hasta + 1):
+        ms = medir_verificacion_ms(rounds, args.repeticiones)
+        if ms <= args.objetivo_ms:
+            recomendado = rounds
+        marca = "  (actual)" if rounds == settings.BCRYPT_ROUNDS else ""
+        print(f"{rounds:>5} {ms:>16.1f} {1000 / ms:>20.1f}{marca}")
+        if ms > args.objetivo_ms * 4:
+            break
+
+    print(f"\nCosto recomendado para {args.objetivo_ms:.0f} ms: BCRYPT_ROUNDS={recomendado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Fixtures compartidos para las pruebas en proceso de la API.
+
+A diferencia de los scripts manuales de este directorio (que requieren el
+servidor corriendo en localhost:8000), estas pruebas usan una base de datos
+SQLite temporal y el TestClient de FastAPI. Es un archivo (no una base en
+memoria) para que el motor síncrono y el asíncrono (aiosqlite) compartan datos.
+
+Ejecutar desde la carpeta API:
+    python -m pytest -q scripts/tests/test_citas_consultas.py
+"""
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db.database import (  # noqa: E402
+    Base, create_read_db_engine, get_async_db, get_db, get_read_db
+)
+from app.models.persona import Persona  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _vaciar_cache_principales():
+    """Cada prueba usa una base nueva: los ids y correos se repiten entre pruebas."""
+    from app.services.disponibilidad import disponibilidad
+    from app.services.principales import invalidar_principal
+    invalidar_principal()
+    disponibilidad.invalidar()
+    yield
+    invalidar_principal()
+    disponibilidad.invalidar()
+
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    return tmp_path / "pruebas.db"
+
+
+@pytest.fixture
+def engine(ruta_db):
+    """Motor SQLite sobre el archivo temporal de la prueba."""
+    engine = create_engine(
+        f"sqlite:///{ruta_db}",
+        connect_args={"check_same_thread": False},
+    )
+    import app.models  # noqa: F401  Registrar todos los modelos
+    Base.metadata.create_all(bind=engine)
+    # Como en producción (create_db_engine): los lectores no esperan a un
+    # escritor, p. ej. la consulta de progreso durante una importación
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def read_engine(engine, ruta_db):
+    """Motor de solo lectura (get_read_db) sobre el mismo archivo."""
+    read_engine = create_read_db_engine(f"sqlite:///{ruta_db}")
+    yield read_engine
+    read_engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, ruta_db):
+    """
+    Motor aiosqlite sobre el mismo archivo.
+
+    Sin pool: el TestClient ejecuta la aplicación en su propio event loop y
+    las conexiones de aiosqlite no deben sobrevivir a él.
+    """
+    return create_async_engine(f"sqlite+aiosqlite:///{ruta_db}", poolclass=NullPool)
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(session_factory, read_engine, async_engine, monkeypatch):
+    """TestClient con get_db, get_read_db y get_async_db apuntando a la base de datos de pruebas."""
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+    from app.main import app
+
+    # El lifespan trabaja sobre los motores globales, no sobre los de la prueba
+    monkeypatch.setattr(settings, "VERIFICAR_ESQUEMA_AL_INICIAR", False)
+    monkeypatch.setattr(settings, "CALENTAR_CACHES_AL_INICIAR", False)
+    # bcrypt en hilos y con el costo mínimo: evita lanzar procesos y
+    # segundos de CPU en cada prueba
+    monkeypatch.setattr(settings, "HASH_EXECUTOR", "hilo")
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+
+    read_session_factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=read_engine)
+    async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def override_get_read_db():
+        session = read_session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def motores(engine, read_engine, async_engine):
+    """Motores síncronos sobre los que se emiten sentencias (incluye el de aiosqlite)."""
+    return [engine, read_engine, async_engine.sync_engine]
+
+
+@pytest.fixture
+def contador_consultas(motores):
+    """Lista con las sentencias SQL ejecutadas sobre los motores de pruebas."""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    for motor in motores:
+        event.listen(motor, "before_cursor_execute", registrar)
+    yield sentencias
+    for motor in motores:
+        event.remove(motor, "before_cursor_execute", registrar)
+
+
+def crear_persona(db, correo: str, rol: str = "alumno", **campos) -> Persona:
+    """Crear una persona mínima válida para pruebas."""
+    datos = dict(
+        sexo="otro",
+        genero="otro",
+        edad=20,
+        estado_civil="soltero",
+        lugar_origen="Mexicali",
+        colonia_residencia_actual="Centro",
+        celular="6860000000",
+        correo_institucional=correo,
+        rol=rol,
+        is_active=True,
+        hashed_password="x",
+    )
+    datos.update(campos)
+    persona = Persona(**datos)
+    db.add(persona)
+    db.commit()
+    db.refresh(persona)
+    return persona
+
+
+def auth_headers(persona: Persona) -> dict:
+    """Cabeceras Authorization con un JWT válido para la persona."""
+    return {"Authorization": f"Bearer {create_access_token(persona.id)}"}
@@ -0,0 +1,133 @@
+"""
+Control de admisión: límite por clase de ruta, cola acotada, 503 con
+Retry-After y métricas de cola y rechazos.
+"""
+import asyncio
+
+from app.core.config import settings
+from app.middleware.admision import Admision, AdmisionMiddleware, ClaseAdmision
+
+
+def test_clasificacion_de_rutas():
+    admision = Admision()
+    clase = lambda metodo, ruta: getattr(admision.clasificar(metodo, ruta), "nombre", None)
+
+    assert clase("POST", "/api/v1/auth/login") == "criticas"
+    assert clase("POST", "/api/v1/cuestionarios-usuario/7/responder") == "criticas"
+    assert clase("GET", "/api/v1/cuestionarios-usuario/7/responder") == "general"
+    assert clase("POST", "/api/v1/personas/bulk-create") == "pesadas"
+    assert clase("POST", "/api/v1/personas/bulk-import") == "pesadas"
+    assert clase("GET", "/api/v1/personas/bulk-import/3f2a9c") == "general"
+    assert clase("GET", "/api/v1/citas/export") == "pesadas"
+    assert clase("GET", "/api/v1/personas/") == "general"
+    assert clase("GET", "/api/v1/citas/stream") is None
+    assert clase("GET", "/estado/admision") is None
+
+
+def test_cola_acotada_y_transferencia_de_lugar():
+    async def escenario():
+        clase = ClaseAdmision("general", limite=1, cola=1)
+        assert await clase.entrar(1)
+
+        esperando = asyncio.create_task(clase.entrar(1))
+        await asyncio.sleep(0)
+        assert clase.estado()["en_cola"] == 1
+        # Cola llena: rechazo inmediato
+        assert await clase.entrar(1) is False
+
+        clase.salir()
+        assert await esperando is True
+        assert clase.estado() == {
+            "limite": 1, "en_curso": 1, "en_cola": 0, "cola_maxima": 1,
+            "admitidas": 2, "rechazadas": 1, "expiradas": 0,
+        }
+        clase.salir()
+        assert clase.en_curso == 0
+
+    asyncio.run(escenario())
+
+
+def test_espera_maxima_y_cancelacion():
+    async def escenario():
+        clase = ClaseAdmision("general", limite=1, cola=5)
+        await clase.entrar(1)
+        assert await clase.entrar(0.01) is False
+        assert clase.expiradas == 1
+
+        # Un cliente que se desconecta mientras espera deja la cola
+        esperando = asyncio.create_task(clase.entrar(5))
+        await asyncio.sleep(0)
+        esperando.cancel()
+        await asyncio.gather(esperando, return_exceptions=True)
+        assert clase.estado()["en_cola"] == 0
+
+        clase.salir()
+        assert clase.en_curso == 0
+
+    asyncio.run(escenario())
+
+
+def test_lugar_transferido_al_vencer_la_espera(monkeypatch):
+    async def escenario():
+        clase = ClaseAdmision("general", limite=1, cola=1)
+        await clase.entrar(1)
+
+        async def vence_tras_la_transferencia(turno, timeout):
+            # salir() resuelve el turno, pero el plazo vence antes de reanudar
+            clase.salir()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, "wait_for", vence_tras_la_transferencia)
+        assert await clase.entrar(1) is True
+        assert clase.estado()["en_curso"] == 1
+        assert clase.expiradas == 0
+
+        clase.salir()
+        assert clase.en_curso == 0
+
+    asyncio.run(escenario())
+
+
+def test_middleware_responde_503_con_retry_after():
+    liberar = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await liberar.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AdmisionMiddleware(app, admision=Admision(limites={"general": 1}, colas={"general": 0}))
+
+    async def peticion():
+        mensajes = []
+
+        async def send(mensaje):
+            mensajes.append(mensaje)
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/personas/", "headers": []}
+        await middleware(scope, receive, send)
+        return mensajes[0]
+
+    async def escenario():
+        primera = asyncio.create_task(peticion())
+        await asyncio.sleep(0)
+        rechazada = await peticion()
+        liberar.set()
+        return (await primera), rechazada
+
+    primera, rechazada = asyncio.run(escenario())
+    assert primera["status"] == 200
+    assert rechazada["status"] == 503
+    assert (b"retry-after", str(settings.ADMISION_RETRY_AFTER).encode()) in rechazada["headers"]
+    assert middleware.admision.estado()["general"]["rechazadas"] == 1
+
+
+def test_estado_de_admision(client):
+    assert client.get("/api/v1/catalogos/religiones/activas/").status_code == 200
+    estado = client.get("/estado/admision").json()
+    assert set(estado) == {"criticas", "pesadas", "general"}
+    assert estado["general"]["admitidas"] >= 1
+    assert estado["general"]["en_curso"] == 0
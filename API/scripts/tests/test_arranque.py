@@ -0,0 +1,97 @@
+"""
+Secuencia de arranque: verificación de la revisión de Alembic y
+calentamiento de cachés (lifespan) sin create_all al importar la app.
+"""
+import asyncio
+import logging
+
+import pytest
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.hashing import cerrar_executor
+from app.core.security import get_password_hash
+from app.db import database
+from app.db.migraciones import _scripts, preparar_esquema, revision_actual, revision_head
+from app.models.parametro import ParametroSistema
+from app.services.arranque import arrancar, costo_bcrypt_compartido
+
+from conftest import crear_persona
+
+
+@pytest.fixture
+def motor_vacio(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'vacia.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_base_vacia_se_crea_en_la_ultima_revision(motor_vacio):
+    assert preparar_esquema(motor_vacio) is True
+    assert revision_actual(motor_vacio) == revision_head()
+    assert "citas" in inspect(motor_vacio).get_table_names()
+
+    # Segundo arranque: solo se compara la revisión
+    assert preparar_esquema(motor_vacio) is False
+
+
+def test_revision_desactualizada(motor_vacio, monkeypatch, caplog):
+    preparar_esquema(motor_vacio)
+    anterior = _scripts().get_revision(revision_head()).down_revision
+    with motor_vacio.begin() as conn:
+        MigrationContext.configure(conn).stamp(_scripts(), anterior)
+
+    # Por omisión no se arranca con un esquema desactualizado
+    with pytest.raises(RuntimeError, match=anterior):
+        preparar_esquema(motor_vacio)
+
+    monkeypatch.setattr(settings, "MIGRACIONES_ESTRICTAS", False)
+    with caplog.at_level(logging.WARNING, logger="app.db.migraciones"):
+        assert preparar_esquema(motor_vacio) is False
+    assert "alembic upgrade head" in caplog.text
+
+
+def test_arranque_con_calentamiento(tmp_path, monkeypatch, caplog):
+    ruta = tmp_path / "arranque.db"
+    engine = create_engine(f"sqlite:///{ruta}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta}", poolclass=NullPool)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", engine)
+    monkeypatch.setattr(database, "async_engine", async_engine)
+    monkeypatch.setattr(database, "SessionLocalRO", sessionmaker(bind=engine))
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(async_engine))
+    monkeypatch.setattr(settings, "HASH_EXECUTOR", "hilo")
+
+    try:
+        with caplog.at_level(logging.INFO, logger="app.services.arranque"):
+            tiempos = asyncio.run(arrancar())
+        assert revision_actual(engine) == revision_head()
+    finally:
+        cerrar_executor()
+        engine.dispose()
+
+    assert set(tiempos) == {
+        "esquema", "mapeadores", "conexiones", "catalogos", "cuestionarios", "agenda", "disponibilidad", "hash", "total"
+    }
+    assert "Arranque listo" in caplog.text
+    assert "falló" not in caplog.text
+
+
+def test_costo_bcrypt_se_calibra_una_vez_y_se_comparte(db, session_factory, monkeypatch):
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    alumno.hashed_password = get_password_hash("secreta123", rounds=6)
+    db.commit()
+
+    # La calibración no baja del costo de los hashes guardados
+    monkeypatch.setattr("app.services.arranque.calibrar_bcrypt_rounds", lambda objetivo_ms: 5)
+    assert costo_bcrypt_compartido(250) == 6
+    assert db.get(ParametroSistema, "bcrypt_rounds").valor == "6"
+
+    # Otro worker (otro equipo, otra medición) usa el costo guardado
+    monkeypatch.setattr("app.services.arranque.calibrar_bcrypt_rounds", lambda objetivo_ms: 9)
+    assert costo_bcrypt_compartido(250) == 6
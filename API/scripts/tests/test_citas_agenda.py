@@ -0,0 +1,253 @@
+"""
+Pruebas del motor de agenda: detección de empalmes, espacios disponibles
+y reprogramación de citas.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.models.cita import Cita, EstadoCita, TipoCita
+from app.services.agenda import IndiceIntervalos, agenda
+
+from conftest import auth_headers, crear_persona
+
+
+@pytest.fixture(autouse=True)
+def agenda_limpia():
+    # Cada prueba usa su propia base en memoria
+    agenda.invalidar()
+    yield
+    agenda.invalidar()
+
+
+def _proximo_lunes() -> date:
+    hoy = date.today()
+    return hoy + timedelta(days=7 - hoy.weekday())
+
+
+def test_indice_intervalos_empalmes():
+    indice = IndiceIntervalos(timedelta(minutes=60))
+    base = datetime(2030, 1, 7, 9, 0)
+    indice.agregar(1, base, [("personal", 1)])
+    indice.agregar(2, base + timedelta(hours=2), [("personal", 1)])
+
+    assert indice.empalme(("personal", 1), base + timedelta(minutes=30)) == 1
+    assert indice.empalme(("personal", 1), base + timedelta(hours=1)) is None
+    assert indice.empalme(("personal", 1), base, excluir=1) is None
+    assert indice.empalme(("personal", 2), base) is None
+
+    indice.quitar(1)
+    assert indice.empalme(("personal", 1), base) is None
+    assert len(indice) == 1
+
+
+def test_disponibilidad_y_reprogramacion(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    headers = auth_headers(admin)
+    lunes = _proximo_lunes()
+
+    ventana = client.post("/api/v1/citas/disponibilidad", json={
+        "id_personal": personal.id, "dia_semana": 0,
+        "hora_inicio": "09:00:00", "hora_fin": "12:00:00", "ubicacion": "Cubículo 1"
+    }, headers=headers)
+    assert ventana.status_code == 200, ventana.text
+
+    ocupada = Cita(id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.PSICOLOGICA,
+                   motivo="Cita ya confirmada", estado=EstadoCita.CONFIRMADA,
+                   fecha_confirmada=datetime.combine(lunes, time(9, 0)), ubicacion="Cubículo 1")
+    pendiente = Cita(id_alumno=alumno.id, tipo_cita=TipoCita.PSICOLOGICA,
+                     motivo="Cita por reprogramar", estado=EstadoCita.PENDIENTE)
+    db.add_all([ocupada, pendiente])
+    db.commit()
+
+    url = f"/api/v1/citas/disponibilidad?id_personal={personal.id}&fecha_desde={lunes}&fecha_hasta={lunes}"
+    espacios = client.get(url, headers=headers).json()
+    assert [e["inicio"][11:16] for e in espacios] == ["10:00", "11:00"]
+
+    empalme = client.put(f"/api/v1/citas/{pendiente.id_cita}/reprogramar", json={
+        "fecha_confirmada": f"{lunes}T09:30:00", "id_personal": personal.id
+    }, headers=headers)
+    assert empalme.status_code == 409
+
+    movida = client.put(f"/api/v1/citas/{pendiente.id_cita}/reprogramar", json={
+        "fecha_confirmada": f"{lunes}T10:00:00", "id_personal": personal.id
+    }, headers=headers)
+    assert movida.status_code == 200, movida.text
+    assert movida.json()["estado"] == "confirmada"
+
+    # El índice se actualiza con el commit: el espacio de las 10:00 ya no está libre
+    espacios = client.get(url, headers=headers).json()
+    assert [e["inicio"][11:16] for e in espacios] == ["11:00"]
+
+    # Cancelar la cita libera el espacio
+    client.put(f"/api/v1/citas/{ocupada.id_cita}", json={"estado": "cancelada"}, headers=headers)
+    espacios = client.get(url, headers=headers).json()
+    assert [e["inicio"][11:16] for e in espacios] == ["09:00", "11:00"]
+
+
+def test_calendario_por_dia_una_consulta_y_etag(client, db, contador_consultas):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    lunes = _proximo_lunes()
+    for dia, hora in [(0, 9), (0, 11), (2, 10)]:
+        alumno = crear_persona(db, f"alumno{dia}{hora}@uabc.edu.mx")
+        db.add(Cita(id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+                    motivo="Cita de calendario", estado=EstadoCita.CONFIRMADA, ubicacion="Sala",
+                    fecha_confirmada=datetime.combine(lunes + timedelta(days=dia), time(hora))))
+    # Una cita cancelada conserva su fecha, pero no aparece en el calendario
+    db.add(Cita(id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+                motivo="Cita cancelada", estado=EstadoCita.CANCELADA, ubicacion="Sala",
+                fecha_confirmada=datetime.combine(lunes, time(10))))
+    db.commit()
+    headers = auth_headers(admin)
+    url = f"/api/v1/citas/calendario?desde={lunes}&hasta={lunes + timedelta(days=6)}&id_personal={personal.id}"
+
+    contador_consultas.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    assert len([s for s in contador_consultas if "FROM citas" in s]) == 1
+
+    datos = response.json()
+    assert datos["total"] == 3
+    assert [(d["fecha"], len(d["citas"])) for d in datos["dias"]] == [
+        (str(lunes), 2), (str(lunes + timedelta(days=2)), 1)
+    ]
+    assert datos["dias"][0]["citas"][0] == {
+        "id_cita": datos["dias"][0]["citas"][0]["id_cita"], "hora": "09:00:00",
+        "alumno": "alumno09", "estado": "confirmada", "ubicacion": "Sala"
+    }
+
+    etag = response.headers["ETag"]
+    no_modificado = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert no_modificado.status_code == 304
+    assert no_modificado.content == b""
+
+
+def test_empalme_se_verifica_en_la_base_con_indice_desactualizado(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    headers = auth_headers(admin)
+    inicio = datetime.combine(_proximo_lunes(), time(9, 0))
+
+    pendiente = Cita(id_alumno=alumno.id, tipo_cita=TipoCita.GENERAL, motivo="Por confirmar")
+    db.add(pendiente)
+    db.commit()
+    agenda.precargar(db)
+
+    # Otro worker confirma una cita: este proceso no se entera hasta el TTL
+    db.execute(insert(Cita.__table__), [dict(
+        id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+        motivo="Confirmada en otro worker", estado=EstadoCita.CONFIRMADA,
+        fecha_confirmada=inicio, ubicacion="Sala 1"
+    )])
+    db.commit()
+    assert agenda.buscar_empalme(db, inicio, personal.id, None) is None
+
+    por_personal = client.put(f"/api/v1/citas/{pendiente.id_cita}/reprogramar", json={
+        "fecha_confirmada": (inicio + timedelta(minutes=30)).isoformat(), "id_personal": personal.id
+    }, headers=headers)
+    assert por_personal.status_code == 409
+
+    por_ubicacion = client.put(f"/api/v1/citas/{pendiente.id_cita}/reprogramar", json={
+        "fecha_confirmada": (inicio - timedelta(minutes=30)).isoformat(),
+        "id_personal": admin.id, "ubicacion": " SALA 1 "
+    }, headers=headers)
+    assert por_ubicacion.status_code == 409
+
+
+def test_horario_liberado_en_otro_worker_se_puede_confirmar(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    inicio = datetime.combine(_proximo_lunes(), time(9, 0))
+    confirmada = Cita(id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+                      motivo="Se cancela en otro worker", estado=EstadoCita.CONFIRMADA,
+                      fecha_confirmada=inicio)
+    pendiente = Cita(id_alumno=alumno.id, tipo_cita=TipoCita.GENERAL, motivo="Por confirmar")
+    db.add_all([confirmada, pendiente])
+    db.commit()
+    agenda.precargar(db)
+
+    # Otro worker cancela la cita: el índice de este proceso aún la tiene
+    db.execute(
+        update(Cita.__table__)
+        .where(Cita.__table__.c.id_cita == confirmada.id_cita)
+        .values(estado=EstadoCita.CANCELADA)
+    )
+    db.commit()
+    assert agenda.buscar_empalme(db, inicio, personal.id, None) == confirmada.id_cita
+
+    response = client.put(f"/api/v1/citas/{pendiente.id_cita}/confirmar", json={
+        "estado": "confirmada", "fecha_confirmada": inicio.isoformat(), "id_personal": personal.id
+    }, headers=auth_headers(admin))
+    assert response.status_code == 200, response.text
+
+
+def test_indice_no_incluye_cambios_sin_confirmar(db):
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    inicio = datetime.combine(_proximo_lunes(), time(9, 0))
+
+    db.add(Cita(id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+                motivo="Sin confirmar", estado=EstadoCita.CONFIRMADA, fecha_confirmada=inicio))
+    db.flush()
+    # La reconstrucción con la transacción abierta no ve la cita escrita
+    assert agenda.precargar(db) == 0
+    db.rollback()
+    assert agenda.buscar_empalme(db, inicio, personal.id, None) is None
+
+
+def test_confirmaciones_concurrentes_no_se_empalman(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    citas = [Cita(id_alumno=alumno.id, tipo_cita=TipoCita.GENERAL, motivo=f"Cita {i}") for i in range(4)]
+    db.add_all(citas)
+    db.commit()
+    fecha = datetime.combine(_proximo_lunes(), time(9, 0)).isoformat()
+
+    def confirmar(cita):
+        return client.put(f"/api/v1/citas/{cita.id_cita}/confirmar", json={
+            "estado": "confirmada", "fecha_confirmada": fecha, "id_personal": personal.id
+        }, headers=auth_headers(admin)).status_code
+
+    with ThreadPoolExecutor(max_workers=len(citas)) as executor:
+        codigos = list(executor.map(confirmar, citas))
+    assert sorted(codigos) == [200, 409, 409, 409]
+
+
+def test_bulk_update_rechaza_empalmes(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    lunes = _proximo_lunes()
+    ocupada = Cita(id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+                   motivo="Ya confirmada", estado=EstadoCita.CONFIRMADA,
+                   fecha_confirmada=datetime.combine(lunes, time(9, 0)))
+    citas = [Cita(id_alumno=alumno.id, tipo_cita=TipoCita.GENERAL, motivo=f"Cita {i}") for i in range(3)]
+    db.add_all([ocupada, *citas])
+    db.commit()
+
+    def confirmar(cita, hora):
+        return {"id_cita": cita.id_cita, "estado": "confirmada", "id_personal": personal.id,
+                "fecha_confirmada": datetime.combine(lunes, time(hora, 30)).isoformat()}
+
+    response = client.put("/api/v1/citas/bulk-update?detalle=true", json={"items": [
+        confirmar(citas[0], 9),   # se empalma con la cita ya confirmada
+        confirmar(citas[1], 11),
+        confirmar(citas[2], 11),  # se empalma con la anterior del mismo lote
+    ]}, headers=auth_headers(admin))
+    assert response.status_code == 200, response.text
+    datos = response.json()
+    assert [r["exito"] for r in datos["resultados"]] == [False, True, False]
+    assert datos["resultados"][0]["error"] == f"El horario se empalma con la cita {ocupada.id_cita}"
+    assert datos["resultados"][2]["error"] == f"El horario se empalma con la cita {citas[1].id_cita}"
+    assert [c["id_cita"] for c in datos["citas"]] == [citas[1].id_cita]
+
+    db.expire_all()
+    assert [c.estado for c in citas] == [EstadoCita.PENDIENTE, EstadoCita.CONFIRMADA, EstadoCita.PENDIENTE]
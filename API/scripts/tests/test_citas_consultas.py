@@ -0,0 +1,235 @@
+"""
+Pruebas de regresión: el número de consultas por petición en /citas
+no debe crecer con el tamaño de la página (sin N+1).
+"""
+from app.models.cita import Cita, EstadoCita, TipoCita
+
+from conftest import auth_headers, crear_persona
+
+
+def _poblar_citas(db, total: int):
+    """Crear `total` citas, cada una con un alumno y un personal distintos."""
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    for i in range(total):
+        alumno = crear_persona(db, f"alumno{i}@uabc.edu.mx", matricula=f"A{i:05d}")
+        personal = crear_persona(db, f"personal{i}@uabc.edu.mx", rol="personal")
+        db.add(Cita(
+            id_alumno=alumno.id,
+            id_personal=personal.id,
+            tipo_cita=TipoCita.PSICOLOGICA,
+            motivo="Motivo de prueba para la cita",
+            estado=EstadoCita.CONFIRMADA,
+        ))
+    db.commit()
+    return admin
+
+
+def _consultas_por_peticion(client, contador, url, headers) -> int:
+    contador.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(contador)
+
+
+def test_get_citas_consultas_constantes(client, db, contador_consultas):
+    admin = _poblar_citas(db, 30)
+    headers = auth_headers(admin)
+    # Primera petición: carga el principal del token en su caché
+    client.get("/api/v1/citas/?limit=1", headers=headers)
+
+    pequena = _consultas_por_peticion(client, contador_consultas, "/api/v1/citas/?limit=3", headers)
+    grande = _consultas_por_peticion(client, contador_consultas, "/api/v1/citas/?limit=30", headers)
+
+    assert pequena == grande
+    assert len(client.get("/api/v1/citas/?limit=30", headers=headers).json()) == 30
+
+
+def test_search_y_solicitudes_consultas_constantes(client, db, contador_consultas):
+    admin = _poblar_citas(db, 20)
+    headers = auth_headers(admin)
+
+    solicitudes = _consultas_por_peticion(
+        client, contador_consultas, "/api/v1/citas/solicitudes", headers
+    )
+    # Primera búsqueda: detecta una sola vez si existe el índice FTS5
+    client.get("/api/v1/citas/search/?q=prueba", headers=headers)
+    busqueda = _consultas_por_peticion(
+        client, contador_consultas, "/api/v1/citas/search/?q=prueba", headers
+    )
+
+    # Autenticación + consulta principal + carga en bloque de personas
+    assert solicitudes <= 3
+    assert busqueda <= 3
+
+
+def test_respuesta_incluye_alumno_y_personal(client, db):
+    admin = _poblar_citas(db, 2)
+    citas = client.get("/api/v1/citas/", headers=auth_headers(admin)).json()
+
+    for cita in citas:
+        assert cita["alumno_email"].startswith("alumno")
+        assert cita["personal_email"].startswith("personal")
+        assert cita["alumno_nombre"] == cita["alumno_email"].split("@")[0]
+
+
+def test_estadisticas_una_consulta_y_cache(client, db, contador_consultas):
+    from app.routes.citas import _estadisticas_cache
+
+    _estadisticas_cache.clear()
+    admin = _poblar_citas(db, 4)
+    db.add(Cita(id_alumno=admin.id, tipo_cita=TipoCita.ACADEMICA,
+                motivo="Otra cita de prueba", estado=EstadoCita.PENDIENTE))
+    db.commit()
+    headers = auth_headers(admin)
+
+    contador_consultas.clear()
+    datos = client.get("/api/v1/citas/estadisticas", headers=headers).json()
+    consultas_group_by = [s for s in contador_consultas if "GROUP BY" in s]
+    assert len(consultas_group_by) == 1
+
+    assert datos["total_solicitudes"] == 5
+    assert datos["confirmadas"] == 4
+    assert datos["pendientes"] == 1
+    assert datos["por_tipo"]["psicologica"] == 4
+    assert datos["matriz"]["pendiente"]["academica"] == 1
+
+    contador_consultas.clear()
+    client.get("/api/v1/citas/estadisticas", headers=headers)
+    assert not [s for s in contador_consultas if "GROUP BY" in s]
+
+
+def test_paginacion_por_cursor_recorre_todo_sin_duplicados(client, db):
+    admin = _poblar_citas(db, 7)
+    headers = auth_headers(admin)
+
+    vistos = []
+    response = client.get("/api/v1/citas/?limit=3", headers=headers)
+    while True:
+        assert response.status_code == 200, response.text
+        vistos.extend(c["id_cita"] for c in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"/api/v1/citas/?limit=3&cursor={cursor}", headers=headers)
+
+    # Mismo orden que la paginación por desplazamiento
+    offset = [c["id_cita"] for c in client.get("/api/v1/citas/?limit=100", headers=headers).json()]
+    assert vistos == offset
+    assert len(set(vistos)) == 7
+
+    invalido = client.get("/api/v1/citas/?cursor=no-es-un-cursor", headers=headers)
+    assert invalido.status_code == 400
+
+
+def test_busqueda_fts_sin_acentos_y_paginada(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    for i in range(5):
+        db.add(Cita(id_alumno=admin.id, tipo_cita=TipoCita.PSICOLOGICA,
+                    motivo=f"Orientación psicológica número {i}"))
+    db.add(Cita(id_alumno=admin.id, tipo_cita=TipoCita.ACADEMICA,
+                motivo="Asesoría de matemáticas"))
+    db.commit()
+    headers = auth_headers(admin)
+
+    primera = client.get("/api/v1/citas/search/?q=psicologica&limit=3", headers=headers)
+    assert primera.status_code == 200, primera.text
+    assert len(primera.json()) == 3
+    cursor = primera.headers["X-Next-Cursor"]
+
+    segunda = client.get(f"/api/v1/citas/search/?q=psicologica&limit=3&cursor={cursor}", headers=headers)
+    ids = [c["id_cita"] for c in primera.json() + segunda.json()]
+    assert len(ids) == len(set(ids)) == 5
+
+    # Las actualizaciones se reflejan en el índice vía triggers
+    cita = db.query(Cita).filter(Cita.motivo.contains("matemáticas")).first()
+    cita.observaciones_personal = "Canalizar a orientación psicológica"
+    db.commit()
+    total = client.get("/api/v1/citas/search/?q=PSICOLÓGICA", headers=headers).json()
+    assert len(total) == 6
+
+
+def test_operaciones_masivas_reportan_por_elemento(client, db, contador_consultas):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    headers = auth_headers(admin)
+
+    items = [
+        {"id_alumno": alumno.id, "motivo": f"Motivo masivo número {i}"} for i in range(20)
+    ] + [{"id_alumno": 99999, "motivo": "Alumno que no existe"}]
+
+    contador_consultas.clear()
+    creadas = client.post(
+        "/api/v1/citas/bulk-create?detalle=true", json={"items": items}, headers=headers
+    ).json()
+    assert creadas["exitosos"] == 20
+    assert creadas["resultados"][20] == {
+        "indice": 20, "id_cita": None, "exito": False, "error": "Alumno no encontrado"
+    }
+    assert len([s for s in contador_consultas if s.startswith("INSERT INTO citas")]) == 1
+    ids = [r["id_cita"] for r in creadas["resultados"] if r["exito"]]
+
+    actualizadas = client.put("/api/v1/citas/bulk-update", json={"items": [
+        {"id_cita": ids[0], "estado": "confirmada", "ubicacion": "Cubículo 1"},
+        {"id_cita": ids[1], "estado": "cancelada"},
+        {"id_cita": 99999, "estado": "cancelada"},
+    ]}, headers=headers).json()
+    assert [(c["id_cita"], c["estado"]) for c in actualizadas] == [
+        (ids[0], "confirmada"), (ids[1], "cancelada")
+    ]
+    assert actualizadas[0]["ubicacion"] == "Cubículo 1"
+
+    eliminadas = client.post(
+        "/api/v1/citas/bulk-delete", json={"ids": ids[:5] + [99999]}, headers=headers
+    ).json()
+    assert eliminadas == ids[:5]
+    assert db.query(Cita).count() == 15
+
+
+def test_export_csv_y_ndjson_con_filtros(client, db, contador_consultas):
+    import csv
+    import io
+    import json
+
+    admin = _poblar_citas(db, 5)
+    db.add(Cita(id_alumno=admin.id, tipo_cita=TipoCita.ACADEMICA,
+                motivo="Cita, con coma", estado=EstadoCita.PENDIENTE))
+    db.commit()
+    headers = auth_headers(admin)
+
+    contador_consultas.clear()
+    response = client.get("/api/v1/citas/export?format=csv", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    # Una sola consulta con JOIN para alumno y personal (sin N+1)
+    assert len([s for s in contador_consultas if "FROM citas" in s]) == 1
+
+    filas = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(filas) == 6
+    assert filas[0]["alumno_email"] == "alumno0@uabc.edu.mx"
+    assert filas[0]["personal_email"] == "personal0@uabc.edu.mx"
+    assert filas[-1]["motivo"] == "Cita, con coma"
+
+    ndjson = client.get("/api/v1/citas/export?format=ndjson&estado=pendiente", headers=headers)
+    registros = [json.loads(linea) for linea in ndjson.text.splitlines()]
+    assert [(r["estado"], r["personal_email"]) for r in registros] == [("pendiente", None)]
+
+    assert client.get("/api/v1/citas/export?format=xml", headers=headers).status_code == 422
+
+
+def test_cambios_fuera_del_indice_no_reindexan(db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    cita = Cita(id_alumno=alumno.id, tipo_cita=TipoCita.GENERAL, motivo="Cita sin reindexar")
+    db.add(cita)
+    db.commit()
+
+    # total_changes() cuenta también las filas escritas por los triggers
+    conexion = db.connection()
+    antes = conexion.exec_driver_sql("SELECT total_changes()").scalar()
+    cita.estado = EstadoCita.CANCELADA
+    db.flush()
+    assert conexion.exec_driver_sql("SELECT total_changes()").scalar() - antes == 1
+
+    cita.motivo = "Cita reindexada"
+    db.flush()
+    assert conexion.exec_driver_sql("SELECT total_changes()").scalar() - antes > 2
+    db.commit()
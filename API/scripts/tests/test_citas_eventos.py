@@ -0,0 +1,90 @@
+"""
+Pruebas de la publicación de cambios de estado de citas (/citas/stream).
+"""
+import asyncio
+
+from app.models.cita import Cita, EstadoCita, TipoCita
+from app.services.eventos import canal_citas
+
+from conftest import auth_headers, crear_persona
+
+
+def test_eventos_se_publican_despues_del_commit(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    otro = crear_persona(db, "otro@uabc.edu.mx")
+    cita = Cita(id_alumno=alumno.id, tipo_cita=TipoCita.PSICOLOGICA, motivo="Cita con evento")
+    db.add(cita)
+    db.commit()
+
+    async def escenario():
+        del_alumno = canal_citas.suscribir(alumno.id)
+        del_otro = canal_citas.suscribir(otro.id)
+        try:
+            # El rollback no publica nada
+            cita.estado = EstadoCita.CANCELADA
+            db.flush()
+            db.rollback()
+
+            # El endpoint corre en otro hilo; el evento llega por call_soon_threadsafe
+            response = await asyncio.to_thread(
+                client.put, f"/api/v1/citas/{cita.id_cita}/confirmar",
+                json={"estado": "confirmada", "ubicacion": "Cubículo 2"},
+                headers=auth_headers(admin)
+            )
+            assert response.status_code == 200, response.text
+
+            evento = await asyncio.wait_for(del_alumno.cola.get(), timeout=1)
+            assert evento["estado"] == "confirmada"
+            assert evento["id_cita"] == cita.id_cita
+            assert evento["ubicacion"] == "Cubículo 2"
+            assert evento["mensaje"].startswith("Tu cita de tipo 'psicologica' ha sido confirmada")
+            assert del_alumno.cola.empty()
+            assert del_otro.cola.empty()
+        finally:
+            canal_citas.cancelar(del_alumno)
+            canal_citas.cancelar(del_otro)
+
+    asyncio.run(escenario())
+    assert canal_citas.suscriptores() == 0
+
+
+def test_bulk_update_publica_cambios_de_estado(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx")
+    citas = [
+        Cita(id_alumno=alumno.id, tipo_cita=TipoCita.GENERAL, motivo=f"Cita {i}")
+        for i in range(3)
+    ]
+    db.add_all(citas)
+    db.commit()
+    ids = [c.id_cita for c in citas]
+
+    async def escenario():
+        suscripcion = canal_citas.suscribir(alumno.id)
+        try:
+            response = await asyncio.to_thread(
+                client.put, "/api/v1/citas/bulk-update",
+                json={"items": [
+                    {"id_cita": ids[0], "estado": "cancelada"},
+                    {"id_cita": ids[1], "motivo": "Sin cambio de estado"},
+                    {"id_cita": ids[2], "estado": "pendiente"},
+                ]},
+                headers=auth_headers(admin)
+            )
+            assert response.status_code == 200, response.text
+
+            evento = await asyncio.wait_for(suscripcion.cola.get(), timeout=1)
+            assert evento["id_cita"] == ids[0]
+            assert evento["estado"] == "cancelada"
+            await asyncio.sleep(0.05)
+            assert suscripcion.cola.empty()
+        finally:
+            canal_citas.cancelar(suscripcion)
+
+    asyncio.run(escenario())
+
+
+def test_stream_requiere_token(client):
+    assert client.get("/api/v1/citas/stream").status_code == 401
+    assert client.get("/api/v1/citas/stream?token=invalido").status_code == 403
@@ -0,0 +1,108 @@
+"""
+Validación de correos y matrículas disponibles: filtro de Bloom en memoria,
+sincronizado con los commits. Los valores libres se responden sin consultas;
+los positivos del filtro se confirman con una consulta puntual.
+"""
+from sqlalchemy import update
+
+from app.models.persona import Persona
+from app.services.disponibilidad import disponibilidad
+from app.utils.bloom import FiltroBloom
+
+from conftest import crear_persona
+
+
+def test_filtro_bloom_sin_falsos_negativos():
+    filtro = FiltroBloom.desde((f"alumno{i}@uabc.edu.mx" for i in range(5000)), capacidad=5000)
+    assert all(f"alumno{i}@uabc.edu.mx" in filtro for i in range(5000))
+
+    falsos_positivos = sum(f"otro{i}@uabc.edu.mx" in filtro for i in range(20000))
+    assert falsos_positivos / 20000 < 0.03
+    assert not filtro.saturado
+
+
+def _disponible(client, ruta) -> bool:
+    response = client.get(f"/api/v1/personas/{ruta}")
+    assert response.status_code == 200, response.text
+    return response.json()["available"]
+
+
+def _consultas_personas(sentencias) -> int:
+    return len([s for s in sentencias if "FROM personas" in s])
+
+
+def test_validaciones_sincronizadas_y_libres_sin_consultas(client, db, contador_consultas):
+    persona = crear_persona(db, "ocupado@uabc.edu.mx", matricula="A00001")
+    # Primera validación: construye los filtros
+    assert _disponible(client, "validate-email/ocupado@uabc.edu.mx") is False
+
+    contador_consultas.clear()
+    assert _disponible(client, "validate-email/libre@uabc.edu.mx") is True
+    assert _disponible(client, "validate-matricula/A00002") is True
+    assert _consultas_personas(contador_consultas) == 0
+    # Un valor registrado se confirma con una consulta puntual
+    assert _disponible(client, "validate-matricula/ A00001 ") is False
+    assert _consultas_personas(contador_consultas) == 1
+
+    # Cambios confirmados se reflejan; un rollback no
+    persona.correo_institucional = "nuevo@uabc.edu.mx"
+    db.commit()
+    assert _disponible(client, "validate-email/ocupado@uabc.edu.mx") is True
+    assert _disponible(client, "validate-email/nuevo@uabc.edu.mx") is False
+
+    crear_persona(db, "otro@uabc.edu.mx", matricula="A00002")
+    assert _disponible(client, "validate-matricula/A00002") is False
+
+    persona.matricula = "A00099"
+    db.flush()
+    db.rollback()
+    assert _disponible(client, "validate-matricula/A00099") is True
+    assert _disponible(client, "validate-matricula/A00001") is False
+
+    db.delete(db.get(Persona, persona.id))
+    db.commit()
+    assert _disponible(client, "validate-email/nuevo@uabc.edu.mx") is True
+    assert _disponible(client, "validate-matricula/A00001") is True
+
+    # UPDATE masivo: el índice se reconstruye en la siguiente validación
+    db.execute(update(Persona).values(matricula="B00002"))
+    db.commit()
+    assert _disponible(client, "validate-matricula/A00002") is True
+    assert _disponible(client, "validate-matricula/B00002") is False
+
+
+def test_reconstruccion_no_pierde_altas_concurrentes(db, monkeypatch):
+    crear_persona(db, "antes@uabc.edu.mx")
+    construir = disponibilidad._construir
+
+    def construir_con_alta_concurrente(sesion):
+        filtros = construir(sesion)
+        # Otro hilo confirma un alta mientras se lee la tabla
+        disponibilidad.aplicar_cambios([("agregar", "correo", "durante@uabc.edu.mx")])
+        return filtros
+
+    monkeypatch.setattr(disponibilidad, "_construir", construir_con_alta_concurrente)
+    assert disponibilidad.precargar(db) == 2
+    assert "durante@uabc.edu.mx" in disponibilidad._obtener_filtros(db)["correo"]
+
+
+def test_validacion_por_lote(client, db, contador_consultas):
+    crear_persona(db, "ocupado@uabc.edu.mx", matricula="A00001")
+
+    response = client.post("/api/v1/personas/validate-batch", json={
+        "emails": ["ocupado@uabc.edu.mx", "libre@uabc.edu.mx"],
+        "matriculas": ["A00001 ", "A00002", " "],
+    })
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "emails": {"ocupado@uabc.edu.mx": False, "libre@uabc.edu.mx": True},
+        "matriculas": {"A00001 ": False, "A00002": True, " ": False},
+    }
+
+    contador_consultas.clear()
+    response = client.post("/api/v1/personas/validate-batch", json={"emails": ["x@uabc.edu.mx"]})
+    assert response.json() == {"emails": {"x@uabc.edu.mx": True}, "matriculas": {}}
+    assert _consultas_personas(contador_consultas) == 0
+
+    demasiados = client.post("/api/v1/personas/validate-batch", json={"emails": ["a"] * 101})
+    assert demasiados.status_code == 422
@@ -0,0 +1,111 @@
+"""
+Hash de contraseñas en el executor dedicado: login async, límite de
+concurrencia con timeout de cola (503), workers en procesos, calibración
+del costo de bcrypt y recálculo del hash al iniciar sesión.
+"""
+import asyncio
+
+import pytest
+
+from app.core import hashing
+from app.core.config import settings
+from app.core.security import bcrypt_rounds, calibrar_bcrypt_rounds, get_password_hash
+
+from conftest import crear_persona
+
+
+def _login(client, usuario: str, password: str):
+    return client.post("/api/v1/auth/login", data={"username": usuario, "password": password})
+
+
+def test_login_y_cambio_de_password(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    alumno.hashed_password = get_password_hash("secreta123")
+    db.commit()
+
+    assert _login(client, "alumno@uabc.edu.mx", "otra").status_code == 401
+    response = _login(client, "A00001", "secreta123")
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    # Handler síncrono: hash_password_sync pasa por el mismo executor
+    response = client.put("/api/v1/personas/mi-perfil/", json={"password": "nueva12345"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert _login(client, "alumno@uabc.edu.mx", "secreta123").status_code == 401
+    assert _login(client, "alumno@uabc.edu.mx", "nueva12345").status_code == 200
+
+
+def test_login_recalcula_hash_con_otro_costo(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    alumno.hashed_password = get_password_hash("secreta123", rounds=5)
+    db.commit()
+
+    assert _login(client, "alumno@uabc.edu.mx", "secreta123").status_code == 200
+    db.refresh(alumno)
+    assert bcrypt_rounds(alumno.hashed_password) == settings.BCRYPT_ROUNDS == 4
+    assert _login(client, "alumno@uabc.edu.mx", "secreta123").status_code == 200
+
+
+def test_calibracion_elige_el_mayor_costo_dentro_del_objetivo(monkeypatch):
+    # Cada punto de costo duplica el tiempo: 4 -> 10 ms, 7 -> 80 ms, 8 -> 160 ms
+    medidos = []
+
+    def medir(rounds, repeticiones):
+        medidos.append(rounds)
+        return 10 * 2 ** (rounds - 4)
+
+    monkeypatch.setattr("app.core.security.medir_verificacion_ms", medir)
+    assert calibrar_bcrypt_rounds(100, minimo=4, maximo=16) == 7
+    assert medidos == [4, 5, 6, 7, 8]
+    assert calibrar_bcrypt_rounds(1, minimo=4, maximo=16) == 4
+    assert calibrar_bcrypt_rounds(10 ** 6, minimo=4, maximo=10) == 10
+
+
+def test_cola_llena_lanza_hashing_saturado(monkeypatch):
+    monkeypatch.setattr(settings, "HASH_EXECUTOR", "hilo")
+    monkeypatch.setattr(settings, "HASH_MAX_CONCURRENCIA", 1)
+    monkeypatch.setattr(settings, "HASH_TIMEOUT_COLA", 0.05)
+
+    async def con_lugar_ocupado():
+        semaforo = hashing._semaforo()
+        await semaforo.acquire()
+        try:
+            with pytest.raises(hashing.HashingSaturado):
+                await hashing.hash_password("secreta123")
+        finally:
+            semaforo.release()
+        return await hashing.hash_password("secreta123")
+
+    try:
+        assert asyncio.run(con_lugar_ocupado()).startswith("$2")
+    finally:
+        hashing.cerrar_executor()
+
+
+def test_login_saturado_responde_503(client, db, monkeypatch):
+    crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+
+    async def saturado(*args):
+        raise hashing.HashingSaturado()
+
+    monkeypatch.setattr("app.routes.auth.verificar_password", saturado)
+    response = _login(client, "alumno@uabc.edu.mx", "secreta123")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_executor_de_procesos(monkeypatch):
+    monkeypatch.setattr(settings, "HASH_EXECUTOR", "proceso")
+    monkeypatch.setattr(settings, "HASH_WORKERS", 1)
+    hashed = get_password_hash("secreta123")
+
+    async def verificar():
+        return (
+            await hashing.verificar_password("secreta123", hashed),
+            await hashing.verificar_password("otra", hashed),
+        )
+
+    try:
+        assert asyncio.run(verificar()) == (True, False)
+    finally:
+        hashing.cerrar_executor()
@@ -0,0 +1,162 @@
+"""
+Importación masiva de personas en segundo plano: validación por fila,
+unicidad contra la base y dentro del archivo, inserción por lotes y
+consulta de progreso.
+"""
+import threading
+import time
+
+from app.core.config import settings
+from app.core.security import verify_password
+from app.models.importacion import ImportacionPersonas
+from app.models.persona import Persona
+from app.models.programa_educativo import ProgramaEducativo
+from app.services import importacion
+
+from conftest import auth_headers, crear_persona
+
+
+def _fila(i: int, **campos) -> dict:
+    fila = dict(
+        sexo="otro", genero="otro", edad=19, estado_civil="soltero",
+        lugar_origen="Mexicali", colonia_residencia_actual="Centro",
+        celular="6860000000", correo_institucional=f"nuevo{i}@uabc.edu.mx",
+        matricula=f"N{i:05d}", password="secreto123", semestre=1,
+    )
+    fila.update(campos)
+    return fila
+
+
+def _esperar(client, headers, trabajo_id: str) -> dict:
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        estado = client.get(f"/api/v1/personas/bulk-import/{trabajo_id}", headers=headers).json()
+        if estado["estado"] in ("completada", "fallida"):
+            return estado
+        time.sleep(0.05)
+    raise AssertionError(f"La importación no terminó: {estado}")
+
+
+def test_importacion_con_errores_por_fila(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORTACION_LOTE", 4)
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    crear_persona(db, "existente@uabc.edu.mx", matricula="E00001")
+    programa = ProgramaEducativo(nombre_programa="Psicología", clave_programa="PSI")
+    db.add(programa)
+    db.commit()
+    headers = auth_headers(admin)
+
+    filas = [_fila(i, programas_ids=[programa.id]) for i in range(10)] + [
+        _fila(10, correo_institucional="existente@uabc.edu.mx"),
+        _fila(11, matricula="N00003"),               # repetida en el archivo
+        _fila(12, correo_institucional="no-es-correo"),
+        _fila(13, rol="admin"),
+        _fila(14, programas_ids=[999]),
+        # Válida para el esquema pero viola NOT NULL: su lote se reintenta fila por fila
+        _fila(15, colonia_residencia_actual=None),
+    ]
+    response = client.post("/api/v1/personas/bulk-import", json={"items": filas}, headers=headers)
+    assert response.status_code == 202, response.text
+    assert response.json()["total"] == 16
+
+    estado = _esperar(client, headers, response.json()["id"])
+    assert estado["estado"] == "completada", estado
+    assert (estado["procesadas"], estado["exitosas"], estado["fallidas"]) == (16, 10, 6)
+    errores = {e["indice"]: e["error"] for e in estado["errores"]}
+    assert set(errores) == {10, 11, 12, 13, 14, 15}
+    assert "correo" in errores[10] and "matrícula" in errores[11]
+    assert errores[12].startswith("correo_institucional")
+    assert "999" in errores[14]
+    assert "NOT NULL" in errores[15]
+
+    db.expire_all()
+    importada = db.query(Persona).filter(Persona.correo_institucional == "nuevo7@uabc.edu.mx").one()
+    assert importada.is_active and importada.rol == "alumno"
+    assert [p.clave_programa for p in importada.programas] == ["PSI"]
+    assert verify_password("secreto123", importada.hashed_password)
+    # El índice de disponibilidad del registro ya conoce las filas importadas
+    assert client.get("/api/v1/personas/validate-email/nuevo7@uabc.edu.mx").json() == {"available": False}
+
+    # El estado vive en la base de datos: cualquier worker lo puede consultar
+    guardado = db.get(ImportacionPersonas, response.json()["id"])
+    assert (guardado.estado, guardado.procesadas, guardado.fallidas) == ("completada", 16, 6)
+    assert guardado.errores == estado["errores"]
+
+
+def test_importacion_requiere_admin_y_estado_inexistente(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+
+    response = client.post(
+        "/api/v1/personas/bulk-import", json={"items": [_fila(1)]}, headers=auth_headers(alumno)
+    )
+    assert response.status_code == 403
+    assert client.get("/api/v1/personas/bulk-import/no-existe", headers=auth_headers(admin)).status_code == 404
+
+
+def test_importacion_asocia_ids_en_el_orden_de_las_filas(client, db, monkeypatch, contador_consultas):
+    monkeypatch.setattr(settings, "IMPORTACION_LOTE", 50)
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    programas = [
+        ProgramaEducativo(nombre_programa=nombre, clave_programa=clave)
+        for nombre, clave in [("Psicología", "PSI"), ("Pedagogía", "PED")]
+    ]
+    db.add_all(programas)
+    db.commit()
+    headers = auth_headers(admin)
+
+    filas = [_fila(i, programas_ids=[programas[i % 2].id]) for i in range(20)]
+    contador_consultas.clear()
+    response = client.post("/api/v1/personas/bulk-import", json={"items": filas}, headers=headers)
+    estado = _esperar(client, headers, response.json()["id"])
+    assert (estado["estado"], estado["exitosas"]) == ("completada", 20), estado
+    # Un solo INSERT multi-fila con RETURNING en el orden de los parámetros
+    assert len([s for s in contador_consultas if s.startswith("INSERT INTO personas")]) == 1
+
+    db.expire_all()
+    for i in range(20):
+        persona = db.query(Persona).filter(Persona.correo_institucional == f"nuevo{i}@uabc.edu.mx").one()
+        assert [p.clave_programa for p in persona.programas] == [("PSI", "PED")[i % 2]]
+
+
+def test_estado_vencido_y_depuracion(client, db, monkeypatch):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    headers = auth_headers(admin)
+
+    primera = client.post("/api/v1/personas/bulk-import", json={"items": [_fila(1)]}, headers=headers)
+    _esperar(client, headers, primera.json()["id"])
+
+    # Pasado IMPORTACION_ESTADO_TTL la importación ya no se reporta y la
+    # siguiente la elimina de la tabla
+    monkeypatch.setattr(settings, "IMPORTACION_ESTADO_TTL", -1)
+    assert client.get(f"/api/v1/personas/bulk-import/{primera.json()['id']}", headers=headers).status_code == 404
+    client.post("/api/v1/personas/bulk-import", json={"items": [_fila(2)]}, headers=headers)
+    db.expire_all()
+    assert db.get(ImportacionPersonas, primera.json()["id"]) is None
+
+
+def test_apagado_marca_fallidas_las_importaciones_encoladas(db, session_factory, monkeypatch):
+    liberar = threading.Event()
+    ejecutar = importacion._ejecutar
+
+    def ejecutar_bloqueado(*args):
+        liberar.wait(5)
+        ejecutar(*args)
+
+    monkeypatch.setattr(importacion, "_ejecutar", ejecutar_bloqueado)
+    en_curso = importacion.iniciar_importacion([_fila(1)], session_factory)
+    encolada = importacion.iniciar_importacion([_fila(2)], session_factory)
+    try:
+        importacion.cerrar_importaciones()
+    finally:
+        liberar.set()
+
+    db.expire_all()
+    estado = importacion.obtener_trabajo(db, encolada.id)
+    assert estado.estado == "fallida" and "se detuvo" in estado.error
+    # La que ya había empezado termina normalmente
+    limite = time.monotonic() + 30
+    while importacion.obtener_trabajo(db, en_curso.id).estado != "completada":
+        assert time.monotonic() < limite
+        time.sleep(0.05)
+        db.expire_all()
@@ -0,0 +1,72 @@
+"""
+Endpoints de lectura servidos con AsyncSession (get_async_db): deben
+devolver lo mismo que la versión síncrona, incluidas las relaciones que
+antes se cargaban de forma perezosa.
+"""
+import uuid
+
+from app.models.cuestionario_admin import (
+    AsignacionCuestionario, CuestionarioAdmin, EstadoCuestionario, Pregunta,
+    RespuestaCuestionario, TipoPregunta, TipoUsuario
+)
+from app.models.programa_educativo import ProgramaEducativo
+from app.models.religion import Religion
+
+from conftest import auth_headers, crear_persona
+
+
+def test_test_token_incluye_programas(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    alumno.programas.append(ProgramaEducativo(nombre_programa="Psicología", clave_programa="PSI"))
+    db.commit()
+
+    response = client.get("/api/v1/auth/test-token", headers=auth_headers(alumno))
+    assert response.status_code == 200, response.text
+    assert response.json()["programas"][0]["clave_programa"] == "PSI"
+
+    assert client.get("/api/v1/auth/test-token").status_code == 401
+    assert client.get(
+        "/api/v1/auth/test-token", headers={"Authorization": "Bearer invalido"}
+    ).status_code == 403
+
+
+def test_personas_y_catalogos(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    db.add_all([Religion(titulo="Ninguna"), Religion(titulo="Otra", activo=False)])
+    db.commit()
+    headers = auth_headers(admin)
+
+    personas = client.get("/api/v1/personas/?rol=alumno", headers=headers).json()
+    assert [p["correo_institucional"] for p in personas] == ["alumno@uabc.edu.mx"]
+
+    assert len(client.get("/api/v1/catalogos/religiones/", headers=headers).json()) == 2
+    activas = client.get("/api/v1/catalogos/religiones/activas/").json()
+    assert [r["titulo"] for r in activas] == ["Ninguna"]
+
+
+def test_cuestionarios_asignados_con_conteos(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    cuestionario = CuestionarioAdmin(
+        id=str(uuid.uuid4()), titulo="Cuestionario", descripcion="Descripción",
+        estado=EstadoCuestionario.ACTIVO, creado_por=admin.id
+    )
+    db.add_all([
+        cuestionario,
+        Pregunta(id=str(uuid.uuid4()), cuestionario_id=cuestionario.id,
+                 tipo=TipoPregunta.ABIERTA, texto="¿Pregunta?", orden=1, configuracion={}),
+        AsignacionCuestionario(cuestionario_id=cuestionario.id, tipo_usuario=TipoUsuario.ALUMNO),
+        RespuestaCuestionario(id=str(uuid.uuid4()), cuestionario_id=cuestionario.id,
+                              usuario_id=alumno.id, estado="completado", progreso=100),
+    ])
+    db.commit()
+
+    response = client.get("/api/v1/cuestionarios-usuario/asignados", headers=auth_headers(alumno))
+    assert response.status_code == 200, response.text
+    asignado = response.json()["cuestionarios_asignados"][0]
+    assert asignado["cuestionario"]["total_preguntas"] == 1
+    assert asignado["cuestionario"]["total_respuestas"] == 1
+    assert asignado["cuestionario"]["tipos_usuario_asignados"] == ["alumno"]
+    assert asignado["estado"] == "completado"
+    assert asignado["puede_responder"] is False
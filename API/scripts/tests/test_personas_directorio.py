@@ -0,0 +1,134 @@
+"""
+Directorio de personas (GET /personas/): programas y grupos cargados en
+bloque, consultas constantes por página, filtros y paginación por cursor.
+Búsqueda (GET /personas/search/): FTS5 por prefijo y celular/matrícula
+normalizados.
+"""
+from app.models.grupo import Grupo
+from app.models.persona import Persona
+from app.models.programa_educativo import ProgramaEducativo
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+from conftest import auth_headers, crear_persona
+
+
+def _poblar_directorio(db, total: int):
+    """`total` alumnos alternando entre dos programas, todos en un grupo."""
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    programas = [
+        ProgramaEducativo(nombre_programa="Psicología", clave_programa="PSI"),
+        ProgramaEducativo(nombre_programa="Derecho", clave_programa="DER"),
+    ]
+    grupo = Grupo(nombre_grupo="Grupo A", tipo_grupo="academico")
+    db.add_all(programas + [grupo])
+    db.commit()
+    for i in range(total):
+        alumno = crear_persona(
+            db, f"alumno{i}@uabc.edu.mx", matricula=f"A{i:05d}",
+            semestre=i % 4 + 1, cohorte_ano=2024, cohorte_periodo=i % 2 + 1
+        )
+        alumno.programas.append(programas[i % 2])
+        alumno.grupos.append(grupo)
+    db.commit()
+    return admin, programas
+
+
+def _consultas_por_peticion(client, contador, url, headers) -> int:
+    contador.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(contador)
+
+
+def test_relaciones_cargadas_con_consultas_constantes(client, db, contador_consultas):
+    admin, programas = _poblar_directorio(db, 20)
+    headers = auth_headers(admin)
+    # Primera petición: carga el principal del token en su caché
+    client.get("/api/v1/personas/?limit=1", headers=headers)
+
+    pequena = _consultas_por_peticion(client, contador_consultas, "/api/v1/personas/?limit=2", headers)
+    grande = _consultas_por_peticion(client, contador_consultas, "/api/v1/personas/?limit=21", headers)
+    # Personas + programas + grupos
+    assert pequena == grande == 3
+
+    personas = client.get("/api/v1/personas/?rol=alumno", headers=headers).json()
+    assert len(personas) == 20
+    assert personas[0]["programas"] == [
+        {"id": programas[0].id, "nombre_programa": "Psicología", "clave_programa": "PSI"}
+    ]
+    assert personas[0]["grupos"][0]["nombre_grupo"] == "Grupo A"
+
+
+def test_filtros_del_directorio(client, db):
+    admin, programas = _poblar_directorio(db, 12)
+    headers = auth_headers(admin)
+
+    def correos(url):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        return {p["correo_institucional"] for p in response.json()}
+
+    assert correos("/api/v1/personas/?semestre=2") == {
+        f"alumno{i}@uabc.edu.mx" for i in (1, 5, 9)
+    }
+    assert correos("/api/v1/personas/?cohorte_ano=2024&cohorte_periodo=1") == {
+        f"alumno{i}@uabc.edu.mx" for i in range(0, 12, 2)
+    }
+    assert correos(f"/api/v1/personas/?programa_id={programas[1].id}&semestre=4") == {
+        f"alumno{i}@uabc.edu.mx" for i in (3, 7, 11)
+    }
+
+
+def test_paginacion_por_cursor(client, db):
+    admin, _ = _poblar_directorio(db, 7)
+    headers = auth_headers(admin)
+
+    vistos, url = [], "/api/v1/personas/?rol=alumno&limit=3"
+    while True:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        vistos.extend(p["id"] for p in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        url = f"/api/v1/personas/?rol=alumno&limit=3&cursor={cursor}"
+
+    assert len(vistos) == 7
+    assert vistos == sorted(set(vistos))
+
+    response = client.get("/api/v1/personas/?cursor=no-es-un-cursor", headers=headers)
+    assert response.status_code == 400
+
+
+def test_busqueda_por_texto_e_identificadores(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    crear_persona(db, "maria.lopez@uabc.edu.mx", matricula="A12345", celular="686-123-4567",
+                  colonia_residencia_actual="Pueblo Nuevo")
+    crear_persona(db, "jose.garcia@uabc.edu.mx", matricula="B99887", celular="(664) 555 0101",
+                  lugar_origen="Tijuana")
+    headers = auth_headers(admin)
+
+    def buscar(q, **params):
+        response = client.get("/api/v1/personas/search/", params={"q": q, **params}, headers=headers)
+        assert response.status_code == 200, response.text
+        return [p["correo_institucional"] for p in response.json()]
+
+    # Prefijo de palabra, sin acentos ni mayúsculas
+    assert buscar("mari") == ["maria.lopez@uabc.edu.mx"]
+    assert buscar("tijuána") == ["jose.garcia@uabc.edu.mx"]
+    assert buscar("pueblo nue") == ["maria.lopez@uabc.edu.mx"]
+    # Celular y matrícula sin importar separadores
+    assert buscar("6861234") == ["maria.lopez@uabc.edu.mx"]
+    assert buscar("664 555-01") == ["jose.garcia@uabc.edu.mx"]
+    assert buscar("b998") == ["jose.garcia@uabc.edu.mx"]
+    # Resultados limitados
+    assert len(buscar("uabc")) == 2
+    assert len(buscar("uabc", limit=1)) == 1
+    assert buscar("xyz") == []
+
+    # El índice sigue a los cambios de la tabla
+    persona = db.query(Persona).filter(Persona.matricula == "A12345").one()
+    persona.colonia_residencia_actual = "Centro Cívico"
+    db.commit()
+    assert buscar("pueblo") == []
+    assert buscar("civico") == ["maria.lopez@uabc.edu.mx"]
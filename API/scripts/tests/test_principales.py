@@ -0,0 +1,78 @@
+"""
+Caché de principales autenticados: get_current_user no consulta `personas`
+en cada petición y la caché se invalida al modificar o eliminar la persona.
+"""
+from sqlalchemy import update
+
+from app.models.persona import Persona
+from app.services.principales import cache_principales, invalidar_principal
+
+from conftest import auth_headers, crear_persona
+
+RUTA = "/api/v1/catalogos/religiones/"
+
+
+def _consultas_a_personas(contador) -> list:
+    return [sql for sql in contador if "FROM personas" in sql]
+
+
+def test_segunda_peticion_no_consulta_personas(client, db, contador_consultas):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    headers = auth_headers(admin)
+
+    contador_consultas.clear()
+    assert client.get(RUTA, headers=headers).status_code == 200
+    assert len(_consultas_a_personas(contador_consultas)) == 1
+
+    contador_consultas.clear()
+    assert client.get(RUTA, headers=headers).status_code == 200
+    assert _consultas_a_personas(contador_consultas) == []
+
+
+def test_desactivar_o_eliminar_invalida(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    headers_admin, headers_alumno = auth_headers(admin), auth_headers(alumno)
+    assert client.get(RUTA, headers=headers_alumno).status_code == 200
+    assert client.get(RUTA, headers=headers_admin).status_code == 200
+
+    alumno.is_active = False
+    db.commit()
+    assert client.get(RUTA, headers=headers_alumno).status_code == 400
+
+    db.delete(admin)
+    db.commit()
+    assert client.get(RUTA, headers=headers_admin).status_code == 404
+
+
+def test_update_masivo_vacia_la_cache(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    headers = auth_headers(alumno)
+    assert client.get(RUTA, headers=headers).status_code == 200
+
+    db.execute(update(Persona).where(Persona.id == alumno.id).values(is_active=False))
+    db.commit()
+    assert client.get(RUTA, headers=headers).status_code == 400
+
+
+def test_rollback_no_invalida(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    assert client.get(RUTA, headers=auth_headers(alumno)).status_code == 200
+
+    alumno.rol = "admin"
+    db.flush()
+    db.rollback()
+    assert cache_principales.get(alumno.id).rol == "alumno"
+
+    invalidar_principal(alumno.id)
+    assert cache_principales.get(alumno.id) is None
+
+
+def test_mi_perfil_carga_la_persona_completa(client, db):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    headers = auth_headers(alumno)
+
+    response = client.put("/api/v1/personas/mi-perfil/", json={"celular": "6861234567"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert client.get("/api/v1/personas/mi-perfil/", headers=headers).json()["celular"] == "6861234567"
+    assert client.get("/api/v1/auth/test-token", headers=headers).status_code == 200
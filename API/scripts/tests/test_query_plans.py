@@ -0,0 +1,165 @@
+"""
+Snapshot de planes de consulta (EXPLAIN QUERY PLAN) de las rutas principales.
+
+Cada caso ejecuta una petición, captura las sentencias SELECT/UPDATE/DELETE
+que emite y guarda el plan de SQLite en snapshots/query_plans.json. La prueba
+falla si aparece un recorrido completo de tabla (SCAN <tabla>) que no estaba
+en el snapshot: un índice eliminado o una consulta nueva sin índice.
+
+Para regenerar el snapshot después de un cambio intencional:
+    ACTUALIZAR_SNAPSHOTS=1 python -m pytest -q scripts/tests/test_query_plans.py
+"""
+import json
+import os
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.cita import Cita, EstadoCita, TipoCita
+from app.models.cuestionario_admin import (
+    AsignacionCuestionario, CuestionarioAdmin, EstadoCuestionario, Pregunta,
+    RespuestaCuestionario, RespuestaPregunta, TipoPregunta, TipoUsuario
+)
+
+from conftest import auth_headers, crear_persona
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), "snapshots", "query_plans.json")
+ACTUALIZAR = os.environ.get("ACTUALIZAR_SNAPSHOTS") == "1"
+
+# Recorrido completo de una tabla (no de un índice ni de una tabla virtual FTS)
+_SCAN_COMPLETO = re.compile(r"^SCAN (?!CONSTANT ROW)(\S+)$")
+
+# (nombre, usuario, url) — el usuario es una llave del diccionario de datos
+CASOS = [
+    ("citas_listado", "admin", "/api/v1/citas/?limit=20"),
+    ("citas_listado_filtros", "admin", "/api/v1/citas/?estado=pendiente&id_personal={personal}"),
+    ("citas_listado_alumno", "admin", "/api/v1/citas/?id_alumno={alumno}"),
+    ("citas_por_id", "admin", "/api/v1/citas/{cita}"),
+    ("citas_mis_citas", "alumno", "/api/v1/citas/mis-citas"),
+    ("citas_solicitudes", "admin", "/api/v1/citas/solicitudes?estado=pendiente"),
+    ("citas_notificaciones", "alumno", "/api/v1/citas/notificaciones"),
+    ("citas_estadisticas", "admin", "/api/v1/citas/estadisticas?id_personal={personal}"),
+    ("citas_calendario", "admin", "/api/v1/citas/calendario?id_personal={personal}"),
+    ("citas_busqueda", "admin", "/api/v1/citas/search/?q=motivo"),
+    ("citas_export", "admin", "/api/v1/citas/export?format=ndjson&id_alumno={alumno}"),
+    ("personas_por_rol", "admin", "/api/v1/personas/?rol=alumno"),
+    ("personas_por_semestre", "admin", "/api/v1/personas/?semestre=3"),
+    ("personas_por_cohorte", "admin", "/api/v1/personas/?cohorte_ano=2024&cohorte_periodo=1"),
+    ("personas_por_programa", "admin", "/api/v1/personas/?programa_id=1"),
+    ("personas_cursor", "admin", "/api/v1/personas/?rol=alumno&limit=1&cursor=eyJpZCI6IDF9"),
+    ("personas_estudiantes", "admin", "/api/v1/personas/list/estudiantes"),
+    ("personas_por_id", "admin", "/api/v1/personas/{alumno}"),
+    ("personas_busqueda", "admin", "/api/v1/personas/search/?q=alumno"),
+    ("personas_busqueda_celular", "admin", "/api/v1/personas/search/?q=686-000"),
+    ("cuestionarios_admin_listado", "admin", "/api/v1/cuestionarios-admin/?tipo_usuario=alumno"),
+    ("cuestionarios_admin_detalle", "admin", "/api/v1/cuestionarios-admin/{cuestionario}"),
+    ("cuestionarios_admin_respuestas", "admin",
+     "/api/v1/cuestionarios-admin/respuestas/todas?cuestionario_id={cuestionario}"),
+    ("cuestionarios_usuario_asignados", "alumno", "/api/v1/cuestionarios-usuario/asignados"),
+    ("cuestionarios_usuario_responder", "alumno",
+     "/api/v1/cuestionarios-usuario/{cuestionario}/responder"),
+]
+
+
+def _poblar(db) -> dict:
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    personal = crear_persona(db, "personal@uabc.edu.mx", rol="personal")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+
+    cita = None
+    for i, estado in enumerate([EstadoCita.PENDIENTE, EstadoCita.CONFIRMADA, EstadoCita.CANCELADA]):
+        cita = Cita(
+            id_alumno=alumno.id, id_personal=personal.id, tipo_cita=TipoCita.GENERAL,
+            motivo=f"Motivo de la cita {i}", estado=estado,
+            fecha_confirmada=datetime.now() + timedelta(hours=i)
+        )
+        db.add(cita)
+
+    cuestionario = CuestionarioAdmin(
+        id=str(uuid.uuid4()), titulo="Cuestionario", descripcion="Descripción",
+        estado=EstadoCuestionario.ACTIVO, creado_por=admin.id
+    )
+    pregunta = Pregunta(
+        id=str(uuid.uuid4()), cuestionario_id=cuestionario.id, tipo=TipoPregunta.ABIERTA,
+        texto="¿Pregunta?", orden=1, configuracion={}
+    )
+    respuesta = RespuestaCuestionario(
+        id=str(uuid.uuid4()), cuestionario_id=cuestionario.id, usuario_id=alumno.id
+    )
+    db.add_all([
+        cuestionario, pregunta, respuesta,
+        AsignacionCuestionario(cuestionario_id=cuestionario.id, tipo_usuario=TipoUsuario.ALUMNO),
+        RespuestaPregunta(respuesta_cuestionario_id=respuesta.id, pregunta_id=pregunta.id, valor="Sí"),
+    ])
+    db.commit()
+
+    return {
+        "admin": admin, "alumno": alumno, "personal": personal,
+        "ids": {"alumno": alumno.id, "personal": personal.id, "cita": cita.id_cita,
+                "cuestionario": cuestionario.id},
+    }
+
+
+def _planes(engine, sentencias) -> list:
+    """Líneas únicas de EXPLAIN QUERY PLAN de las sentencias capturadas."""
+    lineas = set()
+    with engine.connect() as conn:
+        for sentencia, parametros in sentencias:
+            inicio = sentencia.lstrip().split(None, 1)[0].upper()
+            if inicio not in ("SELECT", "UPDATE", "DELETE", "WITH") or "sqlite_master" in sentencia:
+                continue
+            for fila in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sentencia}", parametros):
+                lineas.add(fila[3])
+    return sorted(lineas)
+
+
+def _leer_snapshot() -> dict:
+    if not os.path.exists(SNAPSHOT):
+        return {}
+    with open(SNAPSHOT, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("nombre,usuario,url", CASOS, ids=[c[0] for c in CASOS])
+def test_planes_de_consulta(nombre, usuario, url, client, db, engine, motores):
+    datos = _poblar(db)
+
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            sentencias.append((statement, parameters))
+
+    for motor in motores:
+        event.listen(motor, "before_cursor_execute", registrar)
+    try:
+        response = client.get(url.format(**datos["ids"]), headers=auth_headers(datos[usuario]))
+    finally:
+        for motor in motores:
+            event.remove(motor, "before_cursor_execute", registrar)
+    assert response.status_code == 200, response.text
+
+    planes = _planes(engine, sentencias)
+    snapshot = _leer_snapshot()
+
+    if ACTUALIZAR:
+        snapshot[nombre] = planes
+        os.makedirs(os.path.dirname(SNAPSHOT), exist_ok=True)
+        with open(SNAPSHOT, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(snapshot.items())), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        return
+
+    assert nombre in snapshot, (
+        f"Sin snapshot para '{nombre}'; regenerar con ACTUALIZAR_SNAPSHOTS=1"
+    )
+    escaneos_nuevos = [
+        linea for linea in planes
+        if _SCAN_COMPLETO.match(linea) and linea not in snapshot[nombre]
+    ]
+    assert not escaneos_nuevos, (
+        f"Recorridos completos nuevos en '{nombre}': {escaneos_nuevos}\nPlan actual: {planes}"
+    )
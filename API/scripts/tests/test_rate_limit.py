@@ -0,0 +1,123 @@
+"""
+Rate limiter de ventana deslizante: límite exacto por clave, Retry-After,
+barrido amortizado de claves inactivas y atomicidad bajo concurrencia en
+los backends en memoria, SQLite (entre procesos) y Redis (fakeredis).
+"""
+import multiprocessing
+import threading
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+
+from app.middleware.rate_limit import RateLimiter
+from app.middleware.rate_limit_backends import BackendMemoria, BackendRedis, BackendSqlite
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def _request(ip: str):
+    return SimpleNamespace(client=SimpleNamespace(host=ip))
+
+
+@pytest.fixture(params=["memoria", "sqlite", "redis"])
+def crear_backend(request, tmp_path):
+    """Fábrica de backends del tipo del parámetro, todos sobre el mismo almacén."""
+    if request.param == "memoria":
+        backends = []
+
+        def fabrica(reloj=time.time):
+            if not backends:
+                backends.append(BackendMemoria(reloj))
+            return backends[0]
+        return fabrica
+    if request.param == "sqlite":
+        ruta = str(tmp_path / "rate_limit.db")
+        return lambda reloj=time.time: BackendSqlite(ruta, reloj=reloj)
+    servidor = fakeredis.FakeServer()
+    return lambda reloj=time.time: BackendRedis(fakeredis.FakeRedis(server=servidor), reloj=reloj)
+
+
+def test_ventana_deslizante_y_retry_after(crear_backend):
+    reloj = Reloj()
+    limiter = RateLimiter(max_requests=3, window_minutes=1, backend=crear_backend(reloj))
+
+    for segundo in (0, 10, 20):
+        reloj.ahora = 1000 + segundo
+        assert limiter.check_rate_limit(_request("10.0.0.1"), "registro")
+
+    reloj.ahora = 1030
+    with pytest.raises(HTTPException) as error:
+        limiter.check_rate_limit(_request("10.0.0.1"), "registro")
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == "30"
+
+    # Otra IP u otro endpoint tienen su propio límite
+    assert limiter.check_rate_limit(_request("10.0.0.2"), "registro")
+    assert limiter.check_rate_limit(_request("10.0.0.1"), "otro")
+
+    # Al salir de la ventana la solicitud más antigua libera un lugar
+    reloj.ahora = 1061
+    assert limiter.check_rate_limit(_request("10.0.0.1"), "registro")
+    with pytest.raises(HTTPException):
+        limiter.check_rate_limit(_request("10.0.0.1"), "registro")
+
+
+def test_limite_exacto_entre_hilos(crear_backend):
+    # Cada hilo con su propio backend (conexión o cliente) sobre el mismo almacén
+    aceptadas = []
+
+    def enviar():
+        limiter = RateLimiter(max_requests=50, window_minutes=1, backend=crear_backend())
+        aceptadas.extend(1 for _ in range(40) if limiter.registrar("10.0.0.1:registro") == 0)
+
+    hilos = [threading.Thread(target=enviar) for _ in range(6)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(aceptadas) == 50
+
+
+def test_barrido_retira_claves_inactivas():
+    reloj = Reloj()
+    backend = BackendMemoria(reloj)
+    limiter = RateLimiter(max_requests=2, window_minutes=1, backend=backend)
+    for i in range(100):
+        limiter.registrar(f"10.0.{i}.1:registro")
+    assert len(backend) == 100
+
+    # Cada llamada retira a lo más un lote de claves vencidas
+    reloj.ahora += 61
+    limiter.registrar("10.1.0.1:registro")
+    assert 1 < len(backend) < 100
+    while len(backend) > 1:
+        limiter.registrar("10.1.0.1:registro")
+        reloj.ahora += 0.001
+    assert len(backend) == 1
+
+
+def _enviar_desde_proceso(ruta: str, cola) -> None:
+    limiter = RateLimiter(max_requests=30, window_minutes=1, backend=BackendSqlite(ruta))
+    cola.put(sum(1 for _ in range(20) if limiter.registrar("10.0.0.1:registro") == 0))
+
+
+def test_sqlite_limite_compartido_entre_procesos(tmp_path):
+    ruta = str(tmp_path / "rate_limit.db")
+    contexto = multiprocessing.get_context("fork")
+    cola = contexto.Queue()
+    procesos = [contexto.Process(target=_enviar_desde_proceso, args=(ruta, cola)) for _ in range(4)]
+    for proceso in procesos:
+        proceso.start()
+    aceptadas = sum(cola.get(timeout=30) for _ in procesos)
+    for proceso in procesos:
+        proceso.join()
+    assert aceptadas == 30
@@ -0,0 +1,50 @@
+"""
+Sesiones de solo lectura (get_read_db): las rutas de listado, búsqueda y
+estadísticas usan un pool propio cuyas conexiones rechazan escrituras.
+"""
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.database import create_read_db_engine
+from app.models.cita import Cita
+
+from conftest import auth_headers, crear_persona
+
+
+def test_motor_de_lectura_rechaza_escrituras(db, read_engine):
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM personas")).scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(insert(Cita).values(id_alumno=alumno.id, motivo="No debe guardarse"))
+
+
+def test_lecturas_ven_escrituras_confirmadas(client, db):
+    admin = crear_persona(db, "admin@sistema.edu", rol="admin")
+    alumno = crear_persona(db, "alumno@uabc.edu.mx", matricula="A00001")
+    headers = auth_headers(admin)
+
+    assert client.get("/api/v1/citas/solicitudes", headers=headers).json() == []
+    response = client.post(
+        "/api/v1/citas/solicitar",
+        json={"tipo_cita": "general", "motivo": "Motivo de la cita de prueba"},
+        headers=auth_headers(alumno),
+    )
+    assert response.status_code == 200, response.text
+
+    solicitudes = client.get("/api/v1/citas/solicitudes", headers=headers).json()
+    assert [s["id_cita"] for s in solicitudes] == [response.json()["id_cita"]]
+
+
+def test_replica_configurada(monkeypatch, tmp_path):
+    replica = tmp_path / "replica.db"
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", f"sqlite:///{replica}")
+
+    engine = create_read_db_engine()
+    try:
+        assert engine.url.database == str(replica)
+    finally:
+        engine.dispose()
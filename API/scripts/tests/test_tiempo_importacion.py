@@ -0,0 +1,45 @@
+"""
+Presupuesto de tiempo de importación de app.main (python -X importtime).
+
+Cada worker de uvicorn y cada sesión de pruebas importa app.main; la
+prueba falla si la importación supera PRESUPUESTO_IMPORTACION_MS (variable
+de entorno, 1500 ms por defecto) o si carga un módulo pesado que solo se
+usa bajo demanda (SDK de OpenAI).
+"""
+import os
+import subprocess
+import sys
+
+DIRECTORIO_API = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PRESUPUESTO_MS = float(os.environ.get("PRESUPUESTO_IMPORTACION_MS", "1500"))
+MODULOS_DIFERIDOS = ("openai",)
+REPETICIONES = 3
+
+
+def _importtime(tmp_path) -> dict:
+    """Tiempo acumulado (µs) por módulo al importar app.main en un intérprete limpio."""
+    entorno = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'importacion.db'}")
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=DIRECTORIO_API, env=entorno, capture_output=True, text=True, check=True,
+    )
+    tiempos = {}
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, modulo = linea.split("|")
+        tiempos[modulo.strip()] = int(acumulado)
+    return tiempos
+
+
+def test_importacion_de_app_main_dentro_del_presupuesto(tmp_path):
+    # El mejor de varios intentos: descarta el ruido de la máquina
+    mediciones = [_importtime(tmp_path) for _ in range(REPETICIONES)]
+
+    for modulo in MODULOS_DIFERIDOS:
+        assert modulo not in mediciones[0], f"app.main importa '{modulo}' al cargar"
+
+    mejor_ms = min(m["app.main"] for m in mediciones) / 1000
+    assert mejor_ms <= PRESUPUESTO_MS, (
+        f"Importar app.main tomó {mejor_ms:.0f} ms (presupuesto {PRESUPUESTO_MS:.0f} ms)"
+    )
@@ -13,27 +13,13 @@ def main():
 
     try:
         import uvicorn
-        from app.db.database import Base, engine
+        from app.db.database import engine
+        from app.db.migraciones import preparar_esquema
 
-        # Importar todos los modelos para asegurarse de que se creen todas las tablas
-        logger.info("Creando tablas en la base de datos...")
-        # Importamos los modelos explícitamente para asegurar que SQLAlchemy los registre
-        import app.models.persona
-        import app.models.programa_educativo
-        import app.models.grupo
-        import app.models.personal
-        import app.models.contacto_emergencia
-        import app.models.cita
-        import app.models.cuestionario
-        import app.models.cuestionario_admin
-        import app.models.notificacion
-
-        # Crear todas las tablas
-        Base.metadata.create_all(bind=engine)
-        logger.info("Tablas creadas correctamente")
-
-        # Crear usuario administrador
-        create_admin()
+        # Verificar la revisión de Alembic; una base vacía se crea en la
+        # última revisión y solo entonces se crea el administrador
+        if preparar_esquema(engine):
+            create_admin()
 
         # Iniciar API
         logger.info("Iniciando servidor API...")